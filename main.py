@@ -1,69 +1,223 @@
 import argparse
 from models.operating_system import OperatingSystemModel
+from models.multicore import MultiCoreOperatingSystemModel
+from models.device import Device, DEFAULT_IO_SERVICE_TIMES
 from models.process_table_entry import ProcessTableEntry
-from models.process import Process
-from models.scheduler import fcfs_scheduler, round_robin_scheduler
-from utils.parameter_sweep import perform_parameter_sweep
+from models.process import Process, CompactProcess, StreamingProcess, RunLengthProcess
+from models.scheduler import fcfs_scheduler, round_robin_scheduler, sjf_scheduler, srtf_scheduler, mlfq_scheduler, cfs_scheduler, multicore_scheduler
+from utils.parameter_sweep import (perform_parameter_sweep, generate_charts_from_file, DEFAULT_CHART_DPI,
+                                   DEFAULT_CHART_FORMAT, DEFAULT_MAX_REPLICATES)
+from utils.result_cache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_BYTES
+from utils.sweep_results import DEFAULT_RESULTS_FILE
+from utils.quantum_search import perform_quantum_search, OBJECTIVES, SEARCH_METHODS
+from utils.process_generator import generate_arrival_times
+from utils.trace_file import load_trace, TRACE_EXTENSION
 
-def load_process(file_path, process_id):
+# Process files simulated by default (only 4 processes)
+PROCESS_FILES = [
+    "data/process_a.txt",
+    "data/process_b.txt",
+    "data/process_c.txt",
+    "data/process_d.txt"
+]
+
+def load_process(file_path, process_id, compact=False, stream=False, run_length=False):
     """
     Load the instructions from a process file and create a Process instance.
+    If compact is True, the instructions are encoded into a CompactProcess.
+    If run_length is True, they are stored as runs in a RunLengthProcess.
+    If stream is True, a text file is read in chunks on demand by a
+    StreamingProcess instead of being loaded into memory.
+    Binary trace files (ending in TRACE_EXTENSION) are memory-mapped as a
+    MappedProcess regardless of compact and stream.
     """
+    if file_path.endswith(TRACE_EXTENSION):
+        return load_trace(file_path, process_id)
+    if stream:
+        return StreamingProcess(process_id, file_path)
     with open(file_path, "r") as f:
         lines = f.readlines()
     # Filter out any blank lines
     instructions = [line.strip() for line in lines if line.strip()]
+    if run_length:
+        return RunLengthProcess.from_instructions(process_id, instructions)
+    if compact:
+        return CompactProcess.from_instructions(process_id, instructions)
     return Process(process_id, instructions)
 
 def main():
     parser = argparse.ArgumentParser(description="OS Scheduling Simulator")
-    parser.add_argument('--scheduler', choices=['fcfs', 'rr'], default='fcfs',
-                        help="Choose the scheduler: 'fcfs' for First-Come-First-Served, 'rr' for Round Robin")
+    parser.add_argument('--scheduler', choices=['fcfs', 'rr', 'sjf', 'srtf', 'mlfq', 'cfs'], default='fcfs',
+                        help="Choose the scheduler: 'fcfs' for First-Come-First-Served, 'rr' for Round Robin, "
+                             "'sjf' for Shortest-Job-First, 'srtf' for Shortest-Remaining-Time-First, "
+                             "'mlfq' for Multi-Level Feedback Queue, 'cfs' for Completely Fair Scheduler")
     parser.add_argument('--sweep', action='store_true',
                         help="Run parameter sweep simulations")
     parser.add_argument('--quantum', type=int, default=500,
-                        help="Time quantum for Round Robin scheduler in nanoseconds (default: 500)")
+                        help="Time quantum for Round Robin (and base quantum for MLFQ) in nanoseconds (default: 500)")
+    parser.add_argument('--engine', choices=['step', 'fast'], default='step',
+                        help="Simulation engine: 'step' executes one instruction at a time, "
+                             "'fast' uses compact processes and slice-level fast-forwarding (default: step)")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="Number of worker processes for the parameter sweep (default: 1)")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Base seed for the parameter sweep workloads and arrival times (default: 0)")
+    parser.add_argument('--cores', type=int, default=1,
+                        help="Number of CPU cores to simulate, each with its own run queue (default: 1)")
+    parser.add_argument('--work-stealing', action='store_true',
+                        help="Let idle cores steal processes from other cores' run queues")
+    parser.add_argument('--arrival-interval', type=float, default=None,
+                        help="Mean time between process arrivals in nanoseconds; processes arrive "
+                             "as a seeded Poisson process instead of all at time 0 (single core only)")
+    parser.add_argument('--process-files', nargs='+', default=PROCESS_FILES,
+                        help="Instruction files to simulate, as text or binary traces "
+                             f"(*{TRACE_EXTENSION}, see utils/trace_file.py) (default: data/process_[a-d].txt)")
+    parser.add_argument('--stream', action='store_true',
+                        help="Stream text process files in fixed-size chunks instead of loading them into memory")
+    parser.add_argument('--run-length', action='store_true',
+                        help="Store process instructions run-length encoded, so slices consume whole runs at once")
+    parser.add_argument('--blocking-io', action='store_true',
+                        help="Serve LOAD and STORE on a simulated I/O device (service times from "
+                             "DEFAULT_IO_SERVICE_TIMES) while the CPU runs other processes (single core only)")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help="Directory of the persistent sweep result cache, keyed by the simulation "
+                             f"parameters and simulator code version (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_BYTES // (1024 * 1024),
+                        help="Size bound of the sweep result cache in MiB; least recently used results "
+                             f"are evicted (default: {DEFAULT_CACHE_BYTES // (1024 * 1024)})")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Rerun every sweep point instead of using the result cache")
+    parser.add_argument('--results-file', default=DEFAULT_RESULTS_FILE,
+                        help="JSON Lines file each finished sweep point is appended to "
+                             f"(default: {DEFAULT_RESULTS_FILE})")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue an interrupted sweep, skipping the points already in --results-file")
+    parser.add_argument('--charts-only', action='store_true',
+                        help="Regenerate the sweep charts from --results-file without simulating")
+    parser.add_argument('--replicates', type=int, default=1,
+                        help="Seeded replicates per sweep point; with more than one, charts show "
+                             "95%% confidence bands (default: 1)")
+    parser.add_argument('--max-replicates', type=int, default=None,
+                        help="Upper bound on replicates per sweep point when --precision is set "
+                             f"(default: {DEFAULT_MAX_REPLICATES})")
+    parser.add_argument('--precision', type=float, default=None,
+                        help="Add replicates to a sweep point until the confidence interval of its mean "
+                             "turnaround time is within this fraction of the mean, e.g. 0.02; every point "
+                             "gets at least 2 replicates and at most --max-replicates")
+    parser.add_argument('--chart-dpi', type=int, default=DEFAULT_CHART_DPI,
+                        help=f"Resolution of the sweep and quantum search charts (default: {DEFAULT_CHART_DPI})")
+    parser.add_argument('--chart-format', choices=['png', 'svg', 'pdf'], default=DEFAULT_CHART_FORMAT,
+                        help=f"File format of the sweep and quantum search charts (default: {DEFAULT_CHART_FORMAT})")
+    parser.add_argument('--optimize-quantum', action='store_true',
+                        help="Search for the Round Robin quantum minimizing --objective for each CPU probability "
+                             "instead of sweeping a fixed grid")
+    parser.add_argument('--objective', choices=OBJECTIVES, default='turnaround_time',
+                        help="Quantity minimized by --optimize-quantum (mean over processes; default: turnaround_time)")
+    parser.add_argument('--search-method', choices=SEARCH_METHODS, default='golden',
+                        help="'golden' for golden-section search, 'grid' for successive grid refinement "
+                             "(default: golden)")
+    parser.add_argument('--tolerance', type=int, default=10,
+                        help="Resolution of --optimize-quantum in nanoseconds (default: 10)")
     args = parser.parse_args()
+    if args.cores > 1 and args.scheduler not in ('fcfs', 'rr'):
+        parser.error("--cores > 1 is only supported with the 'fcfs' and 'rr' schedulers")
+    if args.cores > 1 and args.arrival_interval is not None:
+        parser.error("--arrival-interval is only supported with a single core")
+    if args.cores > 1 and args.blocking_io:
+        parser.error("--blocking-io is only supported with a single core")
+    
+    if args.optimize_quantum:
+        print("Searching for the best Round Robin quantum...")
+        perform_quantum_search(objective=args.objective, method=args.search_method, tolerance=args.tolerance,
+                               seed=args.seed, engine=args.engine, chart_dpi=args.chart_dpi,
+                               chart_format=args.chart_format)
+        return
+    
+    if args.charts_only:
+        print(f"Generating charts from {args.results_file}...")
+        generate_charts_from_file(args.results_file, dpi=args.chart_dpi, fmt=args.chart_format, jobs=args.jobs)
+        return
     
     if args.sweep:
         print("Running parameter sweep simulations...")
-        perform_parameter_sweep()
+        perform_parameter_sweep(engine=args.engine, jobs=args.jobs, seed=args.seed,
+                                cache_dir=None if args.no_cache else args.cache_dir,
+                                cache_bytes=args.cache_size * 1024 * 1024,
+                                results_file=args.results_file, resume=args.resume,
+                                replicates=args.replicates, max_replicates=args.max_replicates,
+                                precision=args.precision, chart_dpi=args.chart_dpi,
+                                chart_format=args.chart_format)
         return
     
     # Regular simulation with fixed process files
-    os_model = OperatingSystemModel(quantum=args.quantum)
+    if args.cores > 1:
+        os_model = MultiCoreOperatingSystemModel(num_cores=args.cores, quantum=args.quantum,
+                                                 work_stealing=args.work_stealing)
+    else:
+        os_model = OperatingSystemModel(quantum=args.quantum)
+        if args.blocking_io:
+            os_model.add_device(Device('io', DEFAULT_IO_SERVICE_TIMES))
+
+    # List of process files to load
+    process_files = args.process_files
+
+    if args.arrival_interval is None:
+        start_times = [os_model.current_time] * len(process_files)
+    else:
+        start_times = (os_model.current_time
+                       + generate_arrival_times(len(process_files), args.arrival_interval, rng=args.seed)).tolist()
 
-    # List of process files to load (only 4 processes)
-    process_files = [
-        "data/process_a.txt",
-        "data/process_b.txt",
-        "data/process_c.txt",
-        "data/process_d.txt"
-    ]
-    
     processes = {}
     # Create a Process instance for each file and add a ProcessTableEntry to the OS model.
-    for i, file_path in enumerate(process_files, start=1):
-        proc = load_process(file_path, i)
+    for i, (file_path, start_time) in enumerate(zip(process_files, start_times), start=1):
+        proc = load_process(file_path, i, compact=(args.engine == 'fast'), stream=args.stream,
+                            run_length=args.run_length)
         processes[i] = proc
-        os_model.add_process(i, "PR_READY", os_model.current_time)
+        os_model.add_process(i, "PR_READY", start_time)
 
     # Run the appropriate scheduler
-    if args.scheduler == "fcfs":
+    if args.cores > 1:
+        print(f"Running multi-core {args.scheduler.upper()} scheduler on {args.cores} cores...")
+        multicore_scheduler(os_model, processes, policy=args.scheduler, engine=args.engine)
+    elif args.scheduler == "fcfs":
         print("Running FCFS scheduler...")
-        fcfs_scheduler(os_model, processes)
+        fcfs_scheduler(os_model, processes, engine=args.engine)
+    elif args.scheduler == "sjf":
+        print("Running SJF scheduler...")
+        sjf_scheduler(os_model, processes, engine=args.engine)
+    elif args.scheduler == "srtf":
+        print("Running SRTF scheduler...")
+        srtf_scheduler(os_model, processes, engine=args.engine)
+    elif args.scheduler == "mlfq":
+        print(f"Running MLFQ scheduler with base quantum = {args.quantum} ns...")
+        mlfq_scheduler(os_model, processes, engine=args.engine)
+    elif args.scheduler == "cfs":
+        print("Running CFS scheduler...")
+        cfs_scheduler(os_model, processes, engine=args.engine)
     else:
         print(f"Running Round Robin scheduler with quantum = {args.quantum} ns...")
-        round_robin_scheduler(os_model, processes)
+        round_robin_scheduler(os_model, processes, engine=args.engine)
 
     # Display performance metrics for each process
     print("\nProcess Metrics:")
     for entry in os_model.process_table:
         turnaround_time = entry.end_time - entry.start_time if entry.end_time is not None else 0
-        waiting_time = turnaround_time - entry.cpu_time
+        waiting_time = turnaround_time - entry.cpu_time - entry.io_time
+        io_info = f"I/O Time = {entry.io_time} ns, " if args.blocking_io else ""
         print(f"Process {entry.process_id}: Turnaround Time = {turnaround_time} ns, "
-              f"CPU Time = {entry.cpu_time} ns, Waiting Time = {waiting_time} ns")
+              f"CPU Time = {entry.cpu_time} ns, {io_info}Waiting Time = {waiting_time} ns")
     print(f"Total simulation time: {os_model.current_time} ns")
+    if args.blocking_io:
+        metrics = os_model.metrics()
+        print(f"Throughput: {metrics['throughput']:.3f} processes/us, "
+              f"CPU Utilization = {metrics['cpu_utilization']:.1%}")
+        for name, utilization in metrics['device_utilization'].items():
+            print(f"Device {name}: Utilization = {utilization:.1%}")
+    if args.cores > 1:
+        metrics = os_model.metrics()
+        print(f"Makespan: {metrics['makespan']} ns, Throughput: {metrics['throughput']:.3f} processes/us")
+        for core, utilization in zip(os_model.cores, metrics['core_utilization']):
+            print(f"Core {core.core_id}: Utilization = {utilization:.1%}, Migrations = {core.migrations}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
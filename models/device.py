@@ -0,0 +1,28 @@
+from collections import deque
+
+# Service times in ns used when LOAD and STORE block on a device
+DEFAULT_IO_SERVICE_TIMES = {
+    'LOAD': 100,
+    'STORE': 200
+}
+
+class Device:
+    def __init__(self, name, service_times):
+        """Initialize a simulated I/O device with a FIFO request queue.
+
+        Args:
+            name: Name of the device, used in metrics
+            service_times: Dictionary mapping each instruction served by the
+                           device (e.g. 'LOAD') to its service time in nanoseconds
+
+        Note:
+            The device serves one request at a time. busy_time accumulates
+            the time spent serving requests, so busy_time / total time is the
+            device's utilization.
+        """
+        self.name = name
+        self.service_times = dict(service_times)
+        self.queue = deque()  # Waiting (entry, service_time) requests
+        self.current = None  # Entry whose request is being served
+        self.busy_time = 0
+        self.completed = 0
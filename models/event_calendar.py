@@ -0,0 +1,62 @@
+import heapq
+import itertools
+from collections import namedtuple
+
+# Event kinds
+ARRIVAL = 'arrival'            # A process enters the ready queue
+COMPLETION = 'completion'      # The running process finished
+SLICE_EXPIRY = 'slice_expiry'  # The running process was preempted
+IO_REQUEST = 'io_request'      # The running process blocks on an I/O instruction
+IO_COMPLETION = 'io_completion'  # A device finished serving a request
+CORE_FREE = 'core_free'        # A core finished its slice (multi-core model)
+CORE_IDLE = 'core_idle'        # An idle core looks for work again (multi-core model)
+
+# Order of simultaneous events: lower values are handled first, so a process
+# arriving (or returning from I/O) at the same time as a preemption is queued
+# ahead of the preempted one.
+EVENT_PRIORITIES = {
+    ARRIVAL: 0,
+    IO_COMPLETION: 1,
+    COMPLETION: 2,
+    IO_REQUEST: 3,
+    SLICE_EXPIRY: 4,
+    CORE_FREE: 5,
+    CORE_IDLE: 6,
+}
+
+Event = namedtuple('Event', ['time', 'kind', 'payload'])
+
+class EventCalendar:
+    """
+    Future event list for the discrete-event simulation, kept in a binary
+    heap ordered by (time, kind priority, insertion order). Scheduling and
+    popping an event are O(log n).
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+
+    def schedule(self, time, kind, payload=None):
+        """
+        Schedule an event.
+        :param time: Simulation time of the event in nanoseconds.
+        :param kind: One of the event kinds in EVENT_PRIORITIES.
+        :param payload: Object the event refers to (e.g. a ProcessTableEntry).
+        """
+        heapq.heappush(self._heap, (time, EVENT_PRIORITIES[kind], next(self._counter),
+                                    Event(time, kind, payload)))
+
+    def pop(self):
+        """Remove and return the earliest Event."""
+        return heapq.heappop(self._heap)[-1]
+
+    def peek_time(self):
+        """Return the time of the earliest event, or None if there is none."""
+        return self._heap[0][0] if self._heap else None
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
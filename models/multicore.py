@@ -0,0 +1,92 @@
+from models.operating_system import OperatingSystemModel
+from models.process_table_entry import DEFAULT_WEIGHT
+from models.ready_queue import FIFOReadyQueue
+
+# Default cost of moving a process to another core, in context switch penalties
+MIGRATION_PENALTY_FACTOR = 2
+
+class Core:
+    def __init__(self, core_id):
+        """Initialize a CPU core with its own clock and run queue.
+
+        Args:
+            core_id: Index of the core
+
+        Note:
+            busy_time accumulates the time spent executing instructions, so
+            busy_time / makespan is the core's utilization.
+        """
+        self.core_id = core_id
+        self.ready_queue = FIFOReadyQueue()
+        self.current_process = None
+        self.current_time = 0
+        self.busy_time = 0
+        self.migrations = 0
+
+class MultiCoreOperatingSystemModel(OperatingSystemModel):
+    def __init__(self, num_cores=2, quantum=500, context_switch_penalty=20,
+                 migration_penalty=None, work_stealing=False, columnar=False,
+                 accumulator=None):
+        """Initialize an operating system model with several CPU cores.
+
+        Args:
+            num_cores: Number of cores, each with its own clock and run queue (default: 2)
+            quantum: Time slice allocated to each process in nanoseconds (default: 500)
+            context_switch_penalty: Time overhead for context switches in nanoseconds (default: 20)
+            migration_penalty: Extra overhead when a process moves to another core
+                               (default: MIGRATION_PENALTY_FACTOR * context_switch_penalty)
+            work_stealing: If True, an idle core takes work from the longest run queue
+            columnar: If True, use a columnar ProcessTable (see OperatingSystemModel)
+            accumulator: Optional accumulator given every finished process
+                         (see OperatingSystemModel)
+
+        Note:
+            New processes are placed on the cores' run queues in round-robin
+            order. current_time is the makespan (the latest core clock) once a
+            scheduler has run.
+        """
+        super().__init__(quantum=quantum, context_switch_penalty=context_switch_penalty, columnar=columnar,
+                         accumulator=accumulator)
+        self.cores = [Core(core_id) for core_id in range(num_cores)]
+        if migration_penalty is None:
+            migration_penalty = MIGRATION_PENALTY_FACTOR * context_switch_penalty
+        self.migration_penalty = migration_penalty
+        self.work_stealing = work_stealing
+        self._next_core = 0
+
+    @property
+    def ready_list(self):
+        """Snapshot list of the entries in all per-core run queues."""
+        return [entry for core in self.cores for entry in core.ready_queue]
+
+    def add_process(self, process_id, process_state, start_time, weight=DEFAULT_WEIGHT):
+        """Add a new process, placing it on the next core's run queue.
+
+        Args:
+            process_id: Unique identifier for the process
+            process_state: Initial state of the process (e.g., PR_READY)
+            start_time: Time when process is created; arrivals in the future
+                        are not supported by the multi-core model
+            weight: Scheduling weight used by the fair scheduler (default: DEFAULT_WEIGHT)
+        """
+        if process_state == "PR_READY" and start_time > self.current_time:
+            raise ValueError("The multi-core model does not support future arrival times")
+        entry = self._new_entry(process_id, process_state, start_time, weight)
+        if process_state == "PR_READY":
+            self.cores[self._next_core].ready_queue.enqueue(entry)
+            self._next_core = (self._next_core + 1) % len(self.cores)
+
+    def metrics(self):
+        """Return throughput, makespan and per-core utilization.
+
+        Returns:
+            Dictionary with 'makespan' (ns), 'throughput' (completed processes
+            per microsecond) and 'core_utilization' (busy fraction per core)
+        """
+        makespan = max((core.current_time for core in self.cores), default=0)
+        completed = self._completed_count()
+        return {
+            'makespan': makespan,
+            'throughput': completed * 1000 / makespan if makespan else 0.0,
+            'core_utilization': [core.busy_time / makespan if makespan else 0.0 for core in self.cores],
+        }
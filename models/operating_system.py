@@ -1,37 +1,179 @@
-from models.process_table_entry import ProcessTableEntry
+from models.event_calendar import EventCalendar, ARRIVAL, IO_COMPLETION
+from models.process_table import ProcessTable
+from models.process_table_entry import ProcessTableEntry, DEFAULT_WEIGHT
+from models.ready_queue import FIFOReadyQueue
 
 class OperatingSystemModel:
-    def __init__(self, quantum=500, context_switch_penalty=20):  # Added context_switch_penalty parameter
+    def __init__(self, quantum=500, context_switch_penalty=20, ready_queue=None, columnar=False, accumulator=None):  # Added context_switch_penalty parameter
         """Initialize an operating system model.
 
         Args:
             quantum: Time slice allocated to each process in nanoseconds (default: 500)
             context_switch_penalty: Time overhead for context switches in nanoseconds (default: 20)
+            ready_queue: ReadyQueue implementation holding ready processes
+                         (default: a new FIFOReadyQueue)
+            columnar: If True, the process table is a columnar ProcessTable
+                      (NumPy arrays with row views) instead of a list of
+                      ProcessTableEntry objects
+            accumulator: Optional object with an add_process(entry) method
+                         (e.g. utils.metrics.MetricsAccumulator) that is given
+                         every process as it finishes
 
         Note:
-            The model maintains a process table for all processes and a ready list
+            The model maintains a process table for all processes and a ready queue
             for processes that are ready to execute. The current_time tracks the
-            system time in nanoseconds.
+            system time in nanoseconds. Future events (process arrivals, slice
+            expiries and completions) are kept in an event calendar; the
+            schedulers advance current_time from one event to the next.
+            busy_time accumulates the time the CPU spent executing instructions.
         """
-        self.process_table = []
-        self.ready_list = []
+        self.process_table = ProcessTable() if columnar else []
+        self.ready_queue = ready_queue if ready_queue is not None else FIFOReadyQueue()
+        self.calendar = EventCalendar()
         self.current_process = None
         self.current_time = 0
         self.quantum = quantum
         self.context_switch_penalty = context_switch_penalty  # Store context switch penalty
+        self.busy_time = 0
+        self.devices = []
+        self.io_devices = {}  # Blocking instruction name -> Device serving it
+        self.accumulator = accumulator
 
-    def add_process(self, process_id, process_state, start_time):
+    @property
+    def ready_list(self):
+        """Snapshot list of the entries currently in the ready queue."""
+        return list(self.ready_queue)
+
+    def use_ready_queue(self, ready_queue):
+        """Replace the ready queue, moving any pending entries into the new one.
+
+        Args:
+            ready_queue: ReadyQueue implementation to dispatch from
+        """
+        while self.ready_queue:
+            ready_queue.enqueue(self.ready_queue.dequeue())
+        self.ready_queue = ready_queue
+
+    def add_process(self, process_id, process_state, start_time, weight=DEFAULT_WEIGHT):
         """Add a new process to the operating system.
 
         Args:
             process_id: Unique identifier for the process
             process_state: Initial state of the process (e.g., PR_READY)
-            start_time: Time when process is created
+            start_time: Time when process is created (see schedule_arrivals)
+            weight: Scheduling weight used by the fair scheduler (default: DEFAULT_WEIGHT)
         """
-        entry = ProcessTableEntry(process_id, process_state, start_time)
-        self.process_table.append(entry)
+        entry = self._new_entry(process_id, process_state, start_time, weight)
         if process_state == "PR_READY":
-            self.ready_list.append(entry)
+            self.ready_queue.enqueue(entry)
+
+    def _new_entry(self, process_id, process_state, start_time, weight):
+        # Record a process in the process table and return its entry
+        if isinstance(self.process_table, ProcessTable):
+            return self.process_table.add(process_id, process_state, start_time, weight=weight)
+        entry = ProcessTableEntry(process_id, process_state, start_time, weight=weight)
+        self.process_table.append(entry)
+        return entry
+
+    def schedule_arrivals(self):
+        """Turn ready processes that start in the future into arrival events.
+
+        Entries whose start_time is later than current_time leave the ready
+        queue and rejoin it through an ARRIVAL event in the calendar when the
+        simulation clock reaches their start_time.
+        """
+        if not any(entry.start_time > self.current_time for entry in self.ready_queue):
+            return
+        pending = []
+        while self.ready_queue:
+            pending.append(self.ready_queue.dequeue())
+        for entry in pending:
+            if entry.start_time > self.current_time:
+                self.calendar.schedule(entry.start_time, ARRIVAL, entry)
+            else:
+                self.ready_queue.enqueue(entry)
+
+    def complete_process(self, entry, end_time=None):
+        """Mark a process as finished and pass it to the accumulator, if any.
+
+        Args:
+            entry: ProcessTableEntry of the finished process
+            end_time: Completion time (default: current_time)
+        """
+        entry.end_time = self.current_time if end_time is None else end_time
+        entry.process_state = "PR_DONE"
+        if self.accumulator is not None:
+            self.accumulator.add_process(entry)
+
+    def add_device(self, device):
+        """Attach an I/O device. The instructions it serves become blocking.
+
+        Args:
+            device: Device instance; each instruction in device.service_times
+                    is served by it instead of being charged as CPU time
+        """
+        self.devices.append(device)
+        for instruction in device.service_times:
+            self.io_devices[instruction] = device
+
+    def request_io(self, entry, instruction):
+        """Block a process on the device serving instruction.
+
+        Args:
+            entry: ProcessTableEntry of the process issuing the request
+            instruction: Name of the blocking instruction (e.g. 'LOAD')
+        """
+        entry.process_state = "PR_WAIT"
+        device = self.io_devices[instruction]
+        device.queue.append((entry, device.service_times[instruction]))
+        self._start_io(device)
+
+    def _start_io(self, device):
+        # Serve the next queued request if the device is free
+        if device.current is None and device.queue:
+            entry, service_time = device.queue.popleft()
+            device.current = entry
+            device.busy_time += service_time
+            entry.io_time += service_time
+            self.calendar.schedule(self.current_time + service_time, IO_COMPLETION, device)
+
+    def complete_io(self, device):
+        """Finish the request in service on device and start the next one.
+
+        Args:
+            device: Device whose IO_COMPLETION event fired
+
+        Returns:
+            ProcessTableEntry of the process whose request completed
+        """
+        entry = device.current
+        device.current = None
+        device.completed += 1
+        self._start_io(device)
+        return entry
+
+    def metrics(self):
+        """Return throughput and CPU and device utilization.
+
+        Returns:
+            Dictionary with 'makespan' (ns), 'throughput' (completed processes
+            per microsecond), 'cpu_utilization' (busy fraction) and
+            'device_utilization' (busy fraction per device name)
+        """
+        makespan = self.current_time
+        completed = self._completed_count()
+        return {
+            'makespan': makespan,
+            'throughput': completed * 1000 / makespan if makespan else 0.0,
+            'cpu_utilization': self.busy_time / makespan if makespan else 0.0,
+            'device_utilization': {device.name: device.busy_time / makespan if makespan else 0.0
+                                   for device in self.devices},
+        }
+
+    def _completed_count(self):
+        if isinstance(self.process_table, ProcessTable):
+            return int(self.process_table.finished().sum())
+        return sum(1 for entry in self.process_table if entry.process_state == "PR_DONE")
 
     def switch_context(self, from_process_id, to_process_id):
         """Apply a context switch penalty when switching between processes.
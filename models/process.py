@@ -1,3 +1,9 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from collections import namedtuple, OrderedDict
+from itertools import islice
+import numpy as np
+
 # Define instruction execution times in ns
 INSTRUCTION_COSTS = {
     'LOAD': 10,
@@ -8,6 +14,40 @@ INSTRUCTION_COSTS = {
     'DIV': 5
 }
 
+# Compact opcode encoding: one byte per instruction.
+# Unrecognized instructions map to UNKNOWN_OPCODE, which (like the string
+# representation) costs 0 ns.
+OPCODE_NAMES = tuple(INSTRUCTION_COSTS) + ('UNKNOWN',)
+UNKNOWN_OPCODE = len(INSTRUCTION_COSTS)
+OPCODES = {name: opcode for opcode, name in enumerate(INSTRUCTION_COSTS)}
+OPCODE_COSTS = np.array([INSTRUCTION_COSTS[name] for name in INSTRUCTION_COSTS] + [0], dtype=np.int64)
+_OPCODE_COST_LIST = OPCODE_COSTS.tolist()
+
+def encode_instructions(instructions):
+    """
+    Encode a list of instruction strings as a uint8 opcode array.
+    :param instructions: List of instructions (strings).
+    :return: NumPy uint8 array with one opcode per instruction.
+    """
+    return np.fromiter((OPCODES.get(instr.strip(), UNKNOWN_OPCODE) for instr in instructions),
+                       dtype=np.uint8, count=len(instructions))
+
+# Already-encoded instructions, as accepted by CompactProcess.instructions
+_Encoded = namedtuple('_Encoded', ['opcodes', 'unknown_instructions'])
+
+def _encode_keeping_unknown(instructions):
+    opcodes = encode_instructions(instructions)
+    unknown = {int(i): instructions[i] for i in np.flatnonzero(opcodes == UNKNOWN_OPCODE)}
+    return _Encoded(opcodes, unknown)
+
+def decode_opcodes(opcodes):
+    """
+    Decode a uint8 opcode array back into a list of instruction strings.
+    :param opcodes: Sequence of opcodes.
+    :return: List of instructions (strings).
+    """
+    return [OPCODE_NAMES[opcode] for opcode in np.asarray(opcodes).tolist()]
+
 class Process:
     def __init__(self, process_id, instructions):
         """
@@ -33,6 +73,12 @@ class Process:
         instr = self.instructions[self.pc].strip()
         return INSTRUCTION_COSTS.get(instr, 0)
 
+    def peek_next_instruction(self):
+        """Return the next instruction (string), or None if finished."""
+        if self.is_finished():
+            return None
+        return self.instructions[self.pc].strip()
+
     def execute_next_instruction(self):
         """
         Execute the next instruction and return its cost.
@@ -42,4 +88,675 @@ class Process:
             return 0
         cost = self.peek_next_instruction_cost()
         self.pc += 1
-        return cost 
\ No newline at end of file
+        return cost
+
+    def skip_instruction(self):
+        """
+        Advance past the next instruction without charging its cost, e.g. an
+        I/O request whose time is spent on a device instead of the CPU.
+        """
+        self.execute_next_instruction()
+
+    def execute_slice(self, budget):
+        """
+        Execute instructions while the next one fits in the remaining budget.
+        Stops once the budget is exhausted or the process finishes.
+        :param budget: Time available in nanoseconds.
+        :return: Total cost of the executed instructions.
+        """
+        used = 0
+        while budget - used > 0 and not self.is_finished():
+            next_cost = self.peek_next_instruction_cost()
+            if next_cost > budget - used:
+                break
+            used += self.execute_next_instruction()
+        return used
+
+    def range_cost(self, start, stop):
+        """Return the total cost of instructions [start, stop)."""
+        return sum(INSTRUCTION_COSTS.get(instr.strip(), 0) for instr in self.instructions[start:stop])
+
+    def remaining_cost(self):
+        """Return the total cost of the instructions not yet executed."""
+        return sum(INSTRUCTION_COSTS.get(instr.strip(), 0) for instr in self.instructions[self.pc:])
+
+    def instruction_positions(self, names):
+        """
+        Return the sorted indices of the instructions whose name is in names.
+        :param names: Collection of instruction names (e.g. {'LOAD', 'STORE'}).
+        """
+        return [index for index, instr in enumerate(self.instructions) if instr.strip() in names]
+
+    def execute_remaining(self):
+        """
+        Execute all remaining instructions.
+        :return: Total cost of the executed instructions.
+        """
+        used = 0
+        while not self.is_finished():
+            used += self.execute_next_instruction()
+        return used
+
+class CompactProcess(Process):
+    def __init__(self, process_id, opcodes, unknown_instructions=None):
+        """
+        Initialize a process backed by a uint8 opcode array.
+        The cumulative cost of the instructions is precomputed so that the
+        cost of any instruction range is an O(1) lookup.
+        :param process_id: Unique identifier for the process.
+        :param opcodes: Sequence of opcodes (see OPCODES) to execute.
+        :param unknown_instructions: Optional dict mapping the index of each
+                                     UNKNOWN_OPCODE to its original string.
+        """
+        super().__init__(process_id, _Encoded(opcodes, unknown_instructions))
+
+    @classmethod
+    def from_instructions(cls, process_id, instructions):
+        """
+        Create a compact process from a list of instructions (strings).
+        Unrecognized instructions are kept so that .instructions round-trips.
+        """
+        return cls(process_id, *_encode_keeping_unknown(instructions))
+
+    def _set_opcodes(self, opcodes, unknown_instructions=None):
+        opcodes = np.asarray(opcodes)
+        if opcodes.size and ((opcodes.dtype != np.uint8 and opcodes.min() < 0)
+                             or opcodes.max() > UNKNOWN_OPCODE):
+            raise ValueError(f"Opcodes must be in the range 0..{UNKNOWN_OPCODE}")
+        self.opcodes = opcodes.astype(np.uint8, copy=False)
+        self.unknown_instructions = dict(unknown_instructions or {})
+        # cumulative_costs[i] is the cost of instructions [0, i)
+        self.cumulative_costs = np.zeros(len(self.opcodes) + 1, dtype=np.int64)
+        np.cumsum(OPCODE_COSTS[self.opcodes], out=self.cumulative_costs[1:])
+        # Plain Python views for the per-instruction API, which would
+        # otherwise pay for NumPy scalar indexing on every call.
+        self._opcode_view = memoryview(self.opcodes)
+        self._decoded = None
+
+    @property
+    def instructions(self):
+        """
+        Decoded list of instructions (strings), for compatibility.
+        Built on first access and cached. Unrecognized instructions decode to
+        their original string when the process was created with
+        from_instructions, and to 'UNKNOWN' otherwise.
+        """
+        if self._decoded is None:
+            decoded = decode_opcodes(self.opcodes)
+            for index, instr in self.unknown_instructions.items():
+                decoded[index] = instr
+            self._decoded = decoded
+        return self._decoded
+
+    @instructions.setter
+    def instructions(self, instructions):
+        if not isinstance(instructions, _Encoded):
+            instructions = _encode_keeping_unknown(instructions)
+        self._set_opcodes(*instructions)
+
+    def is_finished(self):
+        """Return True if all instructions have been executed."""
+        return self.pc >= len(self._opcode_view)
+
+    def peek_next_instruction_cost(self):
+        """
+        Peek at the cost of the next instruction.
+        Returns 0 if finished or instruction not recognized.
+        """
+        if self.pc >= len(self._opcode_view):
+            return 0
+        return _OPCODE_COST_LIST[self._opcode_view[self.pc]]
+
+    def peek_next_instruction(self):
+        """Return the next instruction (string), or None if finished."""
+        if self.pc >= len(self._opcode_view):
+            return None
+        opcode = self._opcode_view[self.pc]
+        if opcode == UNKNOWN_OPCODE:
+            return self.instructions[self.pc].strip()
+        return OPCODE_NAMES[opcode]
+
+    def execute_next_instruction(self):
+        """
+        Execute the next instruction and return its cost.
+        Advances the program counter.
+        """
+        if self.pc >= len(self._opcode_view):
+            return 0
+        cost = _OPCODE_COST_LIST[self._opcode_view[self.pc]]
+        self.pc += 1
+        return cost
+
+    def execute_slice(self, budget):
+        """
+        Execute instructions while the next one fits in the remaining budget.
+        Finds the last instruction that fits with a single binary search over
+        the cumulative cost array instead of stepping one instruction at a time.
+        :param budget: Time available in nanoseconds.
+        :return: Total cost of the executed instructions.
+        """
+        if budget <= 0 or self.is_finished():
+            return 0
+        costs = self.cumulative_costs[self.pc:]
+        limit = costs[0] + budget
+        stop = int(np.searchsorted(costs, limit, side='right')) - 1
+        if costs[stop] == limit:
+            # The budget is used up exactly; stepping would stop at the first
+            # instruction reaching it, before any trailing zero-cost ones.
+            stop = int(np.searchsorted(costs, limit, side='left'))
+        used = int(costs[stop] - costs[0])
+        self.pc += stop
+        return used
+
+    def execute_remaining(self):
+        """
+        Execute all remaining instructions in one O(1) jump.
+        :return: Total cost of the executed instructions.
+        """
+        used = self.remaining_cost()
+        self.pc = max(self.pc, len(self.opcodes))
+        return used
+
+    def instruction_positions(self, names):
+        """
+        Return the sorted indices of the instructions whose name is in names.
+        :param names: Collection of instruction names (e.g. {'LOAD', 'STORE'}).
+        """
+        codes = [OPCODES[name] for name in names if name in OPCODES]
+        return np.flatnonzero(np.isin(self.opcodes, codes)).tolist()
+
+    def range_cost(self, start, stop):
+        """Return the total cost of instructions [start, stop)."""
+        return int(self.cumulative_costs[stop] - self.cumulative_costs[start])
+
+    def remaining_cost(self):
+        """Return the total cost of the instructions not yet executed."""
+        return self.range_cost(min(self.pc, len(self.opcodes)), len(self.opcodes))
+
+# Instructions per block of a block cost index (see block_prefix_costs)
+BLOCK_SIZE = 4096
+# Blocks whose prefix costs a MappedProcess keeps cached
+PREFIX_CACHE_BLOCKS = 2
+
+def block_prefix_costs(opcodes, block_size=BLOCK_SIZE):
+    """
+    Build a sparse cost index: entry k is the cost of the first k*block_size
+    instructions, and the last entry is the total cost. Blocks are summed a
+    batch at a time, so no full-length cost array is materialized.
+    :param opcodes: Sequence of opcodes.
+    :param block_size: Number of instructions per block.
+    :return: NumPy int64 array of length ceil(len(opcodes) / block_size) + 1.
+    """
+    num_blocks = -(-len(opcodes) // block_size)
+    index = np.zeros(num_blocks + 1, dtype=np.int64)
+    batch = block_size * 256
+    for start in range(0, len(opcodes), batch):
+        costs = OPCODE_COSTS[np.asarray(opcodes[start:start + batch])]
+        first = start // block_size + 1
+        sums = np.add.reduceat(costs, np.arange(0, len(costs), block_size))
+        index[first:first + len(sums)] = sums
+    np.cumsum(index, out=index)
+    return index
+
+class MappedProcess(CompactProcess):
+    def __init__(self, process_id, opcodes, block_costs=None, block_size=BLOCK_SIZE):
+        """
+        Initialize a compact process that keeps only a sparse cost index, so
+        the opcode array can be a zero-copy view of a memory-mapped trace file
+        (see utils.trace_file.load_trace). Costs inside a block are summed on
+        demand, so execute_slice touches one or two blocks of opcodes.
+        :param process_id: Unique identifier for the process.
+        :param opcodes: Sequence of opcodes (see OPCODES) to execute. The
+                        opcodes are not range-checked; trace files are
+                        validated when they are written.
+        :param block_costs: Precomputed block_prefix_costs(opcodes, block_size),
+                            or None to compute it.
+        :param block_size: Number of instructions per block of the cost index.
+        """
+        self.block_size = block_size
+        self._given_block_costs = block_costs
+        super().__init__(process_id, opcodes)
+
+    def _set_opcodes(self, opcodes, unknown_instructions=None):
+        self.opcodes = np.asarray(opcodes, dtype=np.uint8)
+        self.unknown_instructions = dict(unknown_instructions or {})
+        block_costs, self._given_block_costs = self._given_block_costs, None
+        if block_costs is None:
+            block_costs = block_prefix_costs(self.opcodes, self.block_size)
+        self.block_costs = np.asarray(block_costs, dtype=np.int64)
+        self._prefix_cache = {}  # block -> prefix costs (see _block_prefix)
+        self._opcode_view = memoryview(self.opcodes)
+        self._decoded = None
+
+    def _block_opcodes(self, block):
+        start = block * self.block_size
+        return self.opcodes[start:start + self.block_size]
+
+    def _block_prefix(self, block):
+        # Return the first index of the block and the prefix costs of
+        # indices [start, stop] within it. The most recent blocks are cached,
+        # since consecutive slices usually fall in the same block.
+        start = block * self.block_size
+        prefix = self._prefix_cache.get(block)
+        if prefix is None:
+            opcodes = self._block_opcodes(block)
+            prefix = np.empty(len(opcodes) + 1, dtype=np.int64)
+            prefix[0] = 0
+            np.cumsum(OPCODE_COSTS[opcodes], out=prefix[1:])
+            prefix += self.block_costs[block]
+            if len(self._prefix_cache) >= PREFIX_CACHE_BLOCKS:
+                del self._prefix_cache[next(iter(self._prefix_cache))]
+            self._prefix_cache[block] = prefix
+        return start, prefix
+
+    def _prefix_cost(self, index):
+        block, offset = divmod(index, self.block_size)
+        if offset == 0:
+            return int(self.block_costs[block])
+        start, prefix = self._block_prefix(block)
+        return int(prefix[offset])
+
+    def execute_slice(self, budget):
+        """
+        Execute instructions while the next one fits in the remaining budget.
+        A binary search over the block cost index finds the block holding the
+        last instruction that fits, and a second search within that block
+        finds the instruction.
+        :param budget: Time available in nanoseconds.
+        :return: Total cost of the executed instructions.
+        """
+        if budget <= 0 or self.is_finished():
+            return 0
+        base = self._prefix_cost(self.pc)
+        limit = base + budget
+        last_block = len(self.block_costs) - 2
+        block = min(int(np.searchsorted(self.block_costs, limit, side='right')) - 1, last_block)
+        start, prefix = self._block_prefix(block)
+        stop = start + int(np.searchsorted(prefix, limit, side='right')) - 1
+        if prefix[stop - start] == limit:
+            # The budget is used up exactly; stepping would stop at the first
+            # instruction reaching it, which may lie in an earlier block.
+            block = max(int(np.searchsorted(self.block_costs, limit, side='left')) - 1, 0)
+            start, prefix = self._block_prefix(block)
+            stop = start + int(np.searchsorted(prefix, limit, side='left'))
+        used = int(prefix[stop - start]) - base
+        self.pc = stop
+        return used
+
+    def range_cost(self, start, stop):
+        """Return the total cost of instructions [start, stop)."""
+        return self._prefix_cost(stop) - self._prefix_cost(start)
+
+# Instructions per chunk of a ChunkedProcess
+CHUNK_SIZE = 65536
+# Chunks a ChunkedProcess keeps in memory at once
+STREAM_CACHE_CHUNKS = 2
+
+def _scan_chunks(file_path, chunk_size):
+    # Yield (byte offset, opcodes) for each chunk of chunk_size non-blank lines
+    with open(file_path, 'rb') as f:
+        offset = 0
+        while True:
+            start = offset
+            lines = []
+            for line in f:
+                offset += len(line)
+                line = line.strip()
+                if line:
+                    lines.append(line.decode())
+                    if len(lines) == chunk_size:
+                        break
+            if not lines:
+                return
+            yield start, encode_instructions(lines)
+
+class ChunkedProcess(MappedProcess, ABC):
+    def __init__(self, process_id, num_instructions, block_costs, chunk_size=CHUNK_SIZE):
+        """
+        Base class for processes whose opcodes are produced one chunk at a
+        time by _read_chunk, on demand as the program counter advances.
+        Chunks the program counter has passed are released and at most
+        STREAM_CACHE_CHUNKS chunks are kept, so memory use is bounded by a
+        few chunks regardless of the process length. Process.__init__ is not
+        called: the instructions are never held in memory at once.
+        :param process_id: Unique identifier for the process.
+        :param num_instructions: Total number of instructions.
+        :param block_costs: Cost index as returned by block_prefix_costs,
+                            with one block per chunk.
+        :param chunk_size: Number of instructions per chunk.
+        """
+        self.process_id = process_id
+        self.num_instructions = num_instructions
+        self.block_size = chunk_size
+        self.block_costs = block_costs
+        self.pc = 0
+        self._prefix_cache = {}  # chunk index -> prefix costs (see _block_prefix)
+        self._chunks = OrderedDict()  # chunk index -> (opcodes, memoryview)
+
+    @abstractmethod
+    def _read_chunk(self, block):
+        """Return the opcodes of chunk block as a uint8 array."""
+
+    def _load_chunk(self, block):
+        # Return the cached chunk, producing it if needed
+        if block in self._chunks:
+            self._chunks.move_to_end(block)
+            return self._chunks[block]
+        current = self.pc // self.block_size
+        for passed in [index for index in self._chunks if index < current]:
+            del self._chunks[passed]
+        while len(self._chunks) >= STREAM_CACHE_CHUNKS:
+            self._chunks.popitem(last=False)
+        opcodes = self._read_chunk(block)
+        self._chunks[block] = (opcodes, memoryview(opcodes))
+        return self._chunks[block]
+
+    def _block_opcodes(self, block):
+        return self._load_chunk(block)[0]
+
+    def _opcode_at(self, index):
+        block, offset = divmod(index, self.block_size)
+        return self._load_chunk(block)[1][offset]
+
+    @property
+    def resident_chunks(self):
+        """Number of chunks currently held in memory."""
+        return len(self._chunks)
+
+    def _all_chunks(self):
+        # Produce every chunk in order without caching it
+        for block in range(-(-self.num_instructions // self.block_size)):
+            yield block, self._read_chunk(block)
+
+    @property
+    def instructions(self):
+        """
+        Decoded list of all instructions (strings), for compatibility.
+        Produces every chunk; unrecognized instructions decode to 'UNKNOWN'.
+        """
+        return [name for _, opcodes in self._all_chunks() for name in decode_opcodes(opcodes)]
+
+    def is_finished(self):
+        """Return True if all instructions have been executed."""
+        return self.pc >= self.num_instructions
+
+    def peek_next_instruction_cost(self):
+        """
+        Peek at the cost of the next instruction.
+        Returns 0 if finished or instruction not recognized.
+        """
+        if self.pc >= self.num_instructions:
+            return 0
+        return _OPCODE_COST_LIST[self._opcode_at(self.pc)]
+
+    def peek_next_instruction(self):
+        """Return the next instruction (string), or None if finished."""
+        if self.pc >= self.num_instructions:
+            return None
+        return OPCODE_NAMES[self._opcode_at(self.pc)]
+
+    def execute_next_instruction(self):
+        """
+        Execute the next instruction and return its cost.
+        Advances the program counter.
+        """
+        if self.pc >= self.num_instructions:
+            return 0
+        cost = _OPCODE_COST_LIST[self._opcode_at(self.pc)]
+        self.pc += 1
+        return cost
+
+    def execute_remaining(self):
+        """
+        Execute all remaining instructions in one jump and release all chunks.
+        :return: Total cost of the executed instructions.
+        """
+        used = self.remaining_cost()
+        self.pc = max(self.pc, self.num_instructions)
+        self._chunks.clear()
+        self._prefix_cache.clear()
+        return used
+
+    def remaining_cost(self):
+        """Return the total cost of the instructions not yet executed."""
+        return self.range_cost(min(self.pc, self.num_instructions), self.num_instructions)
+
+    def instruction_positions(self, names):
+        """
+        Return the sorted indices of the instructions whose name is in names.
+        Scans the process chunk by chunk.
+        :param names: Collection of instruction names (e.g. {'LOAD', 'STORE'}).
+        """
+        codes = [OPCODES[name] for name in names if name in OPCODES]
+        positions = []
+        for block, opcodes in self._all_chunks():
+            positions.extend((np.flatnonzero(np.isin(opcodes, codes)) + block * self.block_size).tolist())
+        return positions
+
+class StreamingProcess(ChunkedProcess):
+    def __init__(self, process_id, file_path, chunk_size=CHUNK_SIZE):
+        """
+        Initialize a process that streams its instructions from a text file
+        (one instruction per line, blank lines ignored). A first pass over
+        the file records the byte offset and cost of each chunk of
+        chunk_size instructions; afterwards chunks are read and encoded on
+        demand (see ChunkedProcess).
+        :param process_id: Unique identifier for the process.
+        :param file_path: Path of the text instruction file.
+        :param chunk_size: Number of instructions per chunk.
+        """
+        offsets = []
+        costs = [0]
+        num_instructions = 0
+        for offset, opcodes in _scan_chunks(file_path, chunk_size):
+            offsets.append(offset)
+            costs.append(int(OPCODE_COSTS[opcodes].sum()))
+            num_instructions += len(opcodes)
+        super().__init__(process_id, num_instructions, np.cumsum(costs, dtype=np.int64), chunk_size)
+        self.file_path = file_path
+        self.chunk_offsets = offsets
+
+    def _read_chunk(self, block):
+        with open(self.file_path, 'rb') as f:
+            f.seek(self.chunk_offsets[block])
+            stripped = (line.strip() for line in f)
+            lines = [line.decode() for line in islice((line for line in stripped if line), self.block_size)]
+        return encode_instructions(lines)
+
+class RunLengthProcess(Process):
+    def __init__(self, process_id, run_opcodes, run_lengths, unknown_instructions=None):
+        """
+        Initialize a process stored as runs of identical instructions.
+        Slices consume whole runs, or the part of a run that fits in the
+        budget, arithmetically, so the work per slice depends on the number
+        of runs crossed rather than the number of instructions.
+        :param process_id: Unique identifier for the process.
+        :param run_opcodes: Sequence with the opcode (see OPCODES) of each run.
+        :param run_lengths: Sequence with the number of instructions in each run.
+        :param unknown_instructions: Optional dict mapping the index of each
+                                     UNKNOWN_OPCODE instruction to its original string.
+        """
+        super().__init__(process_id, _Encoded(run_length_encode_pairs(run_opcodes, run_lengths),
+                                              unknown_instructions))
+
+    @classmethod
+    def from_opcodes(cls, process_id, opcodes):
+        """Create a run-length encoded process from an opcode array."""
+        return cls(process_id, *run_length_encode(opcodes))
+
+    @classmethod
+    def from_instructions(cls, process_id, instructions):
+        """
+        Create a run-length encoded process from a list of instructions (strings).
+        Unrecognized instructions are kept so that .instructions round-trips.
+        """
+        opcodes, unknown = _encode_keeping_unknown(instructions)
+        return cls(process_id, *run_length_encode(opcodes), unknown_instructions=unknown)
+
+    @property
+    def instructions(self):
+        """
+        Decoded list of instructions (strings), for compatibility.
+        Built on first access and cached.
+        """
+        if self._decoded is None:
+            decoded = decode_opcodes(np.repeat(self.run_opcodes, self.run_lengths))
+            for index, instr in self.unknown_instructions.items():
+                decoded[index] = instr
+            self._decoded = decoded
+        return self._decoded
+
+    @instructions.setter
+    def instructions(self, instructions):
+        if not isinstance(instructions, _Encoded):
+            opcodes, unknown = _encode_keeping_unknown(instructions)
+            instructions = _Encoded(run_length_encode_pairs(*run_length_encode(opcodes)), unknown)
+        (run_opcodes, run_lengths), unknown = instructions
+        if run_opcodes.size and run_opcodes.max() > UNKNOWN_OPCODE:
+            raise ValueError(f"Opcodes must be in the range 0..{UNKNOWN_OPCODE}")
+        self.run_opcodes = run_opcodes
+        self.run_lengths = run_lengths
+        self.unknown_instructions = dict(unknown or {})
+        # run_starts[j] is the index of the first instruction of run j, and
+        # run_costs[j] the cost of all instructions before it
+        self.run_starts = np.zeros(len(run_lengths) + 1, dtype=np.int64)
+        np.cumsum(run_lengths, out=self.run_starts[1:])
+        self.run_costs = np.zeros(len(run_lengths) + 1, dtype=np.int64)
+        np.cumsum(OPCODE_COSTS[run_opcodes] * run_lengths, out=self.run_costs[1:])
+        self.num_instructions = int(self.run_starts[-1])
+        # Plain Python copies and a cursor for the per-instruction API
+        self._run_opcode_list = run_opcodes.tolist()
+        self._run_start_list = self.run_starts.tolist()
+        self._run_cost_list = self.run_costs.tolist()
+        self._run = 0
+        self._decoded = None
+
+    def _seek(self):
+        # Move the run cursor to the run containing the program counter
+        self._run = bisect_right(self._run_start_list, self.pc) - 1
+
+    def _prefix_cost(self, index):
+        run = bisect_right(self._run_start_list, index) - 1
+        if run >= len(self._run_opcode_list):
+            return self._run_cost_list[-1]
+        return (self._run_cost_list[run]
+                + (index - self._run_start_list[run]) * _OPCODE_COST_LIST[self._run_opcode_list[run]])
+
+    def is_finished(self):
+        """Return True if all instructions have been executed."""
+        return self.pc >= self.num_instructions
+
+    def peek_next_instruction_cost(self):
+        """
+        Peek at the cost of the next instruction.
+        Returns 0 if finished or instruction not recognized.
+        """
+        if self.pc >= self.num_instructions:
+            return 0
+        return _OPCODE_COST_LIST[self._run_opcode_list[self._run]]
+
+    def peek_next_instruction(self):
+        """Return the next instruction (string), or None if finished."""
+        if self.pc >= self.num_instructions:
+            return None
+        opcode = self._run_opcode_list[self._run]
+        if opcode == UNKNOWN_OPCODE:
+            return self.unknown_instructions.get(self.pc, OPCODE_NAMES[opcode]).strip()
+        return OPCODE_NAMES[opcode]
+
+    def execute_next_instruction(self):
+        """
+        Execute the next instruction and return its cost.
+        Advances the program counter.
+        """
+        if self.pc >= self.num_instructions:
+            return 0
+        cost = _OPCODE_COST_LIST[self._run_opcode_list[self._run]]
+        self.pc += 1
+        if self.pc == self._run_start_list[self._run + 1] and self.pc < self.num_instructions:
+            self._run += 1
+        return cost
+
+    def execute_slice(self, budget):
+        """
+        Execute instructions while the next one fits in the remaining budget.
+        Binary searches over the run boundary costs find the run holding the
+        last instruction that fits; how much of that run fits is a division.
+        :param budget: Time available in nanoseconds.
+        :return: Total cost of the executed instructions.
+        """
+        if budget <= 0 or self.is_finished():
+            return 0
+        starts, costs, opcodes = self._run_start_list, self._run_cost_list, self._run_opcode_list
+        base = costs[self._run] + (self.pc - starts[self._run]) * _OPCODE_COST_LIST[opcodes[self._run]]
+        limit = base + budget
+        run = bisect_right(costs, limit) - 1
+        if run >= len(opcodes):
+            stop = self.num_instructions
+        else:
+            # costs[run] <= limit < costs[run + 1], so the run has a nonzero cost
+            stop = starts[run] + (limit - costs[run]) // _OPCODE_COST_LIST[opcodes[run]]
+        stop = max(stop, self.pc)
+        end_cost = self._prefix_cost(stop)
+        if end_cost == limit:
+            # The budget is used up exactly; stepping would stop at the first
+            # instruction reaching it, before any zero-cost instructions.
+            run = bisect_left(costs, limit) - 1
+            stop = starts[run] - (-(limit - costs[run]) // _OPCODE_COST_LIST[opcodes[run]])
+        used = end_cost - base
+        self.pc = stop
+        self._seek()
+        return used
+
+    def execute_remaining(self):
+        """
+        Execute all remaining instructions in one O(1) jump.
+        :return: Total cost of the executed instructions.
+        """
+        used = self.remaining_cost()
+        self.pc = max(self.pc, self.num_instructions)
+        self._seek()
+        return used
+
+    def range_cost(self, start, stop):
+        """Return the total cost of instructions [start, stop)."""
+        return self._prefix_cost(stop) - self._prefix_cost(start)
+
+    def remaining_cost(self):
+        """Return the total cost of the instructions not yet executed."""
+        return self.range_cost(min(self.pc, self.num_instructions), self.num_instructions)
+
+    def instruction_positions(self, names):
+        """
+        Return the sorted indices of the instructions whose name is in names.
+        :param names: Collection of instruction names (e.g. {'LOAD', 'STORE'}).
+        """
+        codes = [OPCODES[name] for name in names if name in OPCODES]
+        runs = np.flatnonzero(np.isin(self.run_opcodes, codes))
+        return [index for run in runs.tolist()
+                for index in range(self._run_start_list[run], self._run_start_list[run + 1])]
+
+def run_length_encode(opcodes):
+    """
+    Split an opcode array into runs of identical opcodes.
+    :param opcodes: Sequence of opcodes.
+    :return: Tuple of (run opcodes as uint8 array, run lengths as int64 array).
+    """
+    opcodes = np.asarray(opcodes, dtype=np.uint8)
+    if not opcodes.size:
+        return opcodes, np.zeros(0, dtype=np.int64)
+    starts = np.concatenate(([0], np.flatnonzero(opcodes[1:] != opcodes[:-1]) + 1))
+    return opcodes[starts], np.diff(np.append(starts, len(opcodes))).astype(np.int64)
+
+def run_length_encode_pairs(run_opcodes, run_lengths):
+    # Validate (run opcodes, run lengths) and drop empty runs
+    run_opcodes = np.asarray(run_opcodes)
+    run_lengths = np.asarray(run_lengths, dtype=np.int64)
+    if run_opcodes.shape != run_lengths.shape:
+        raise ValueError("run_opcodes and run_lengths must have the same length")
+    if run_lengths.size and run_lengths.min() < 0:
+        raise ValueError("Run lengths must not be negative")
+    if run_opcodes.size and run_opcodes.min() < 0:
+        raise ValueError(f"Opcodes must be in the range 0..{UNKNOWN_OPCODE}")
+    keep = run_lengths > 0
+    return run_opcodes[keep].astype(np.uint8), run_lengths[keep]
@@ -0,0 +1,205 @@
+import numpy as np
+from models.process_table_entry import DEFAULT_WEIGHT
+
+# Process states, stored as their index in the state column
+PROCESS_STATES = ('PR_READY', 'PR_CURR', 'PR_WAIT', 'PR_DONE')
+_STATE_CODES = {state: code for code, state in enumerate(PROCESS_STATES)}
+
+# end_time of a process that has not finished
+_NO_END_TIME = -1
+
+# Column name -> dtype
+_COLUMNS = {
+    'process_id': np.int64,
+    'state': np.uint8,
+    'start_time': np.int64,
+    'end_time': np.int64,
+    'cpu_time': np.int64,
+    'io_time': np.int64,
+    'weight': np.int64,
+    'vruntime': np.float64,
+}
+
+class ProcessTableRow:
+    """
+    View of one row of a ProcessTable with the attributes of a
+    ProcessTableEntry. Reads and writes go straight to the table's columns.
+    """
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    @property
+    def process_id(self):
+        return int(self._table.process_id[self._index])
+
+    @property
+    def process_state(self):
+        return PROCESS_STATES[self._table.state[self._index]]
+
+    @process_state.setter
+    def process_state(self, state):
+        self._table.state[self._index] = _STATE_CODES[state]
+
+    @property
+    def start_time(self):
+        return int(self._table.start_time[self._index])
+
+    @start_time.setter
+    def start_time(self, start_time):
+        self._table.start_time[self._index] = start_time
+
+    @property
+    def end_time(self):
+        end_time = int(self._table.end_time[self._index])
+        return None if end_time == _NO_END_TIME else end_time
+
+    @end_time.setter
+    def end_time(self, end_time):
+        self._table.end_time[self._index] = _NO_END_TIME if end_time is None else end_time
+
+    @property
+    def cpu_time(self):
+        return int(self._table.cpu_time[self._index])
+
+    @cpu_time.setter
+    def cpu_time(self, cpu_time):
+        self._table.cpu_time[self._index] = cpu_time
+
+    @property
+    def io_time(self):
+        return int(self._table.io_time[self._index])
+
+    @io_time.setter
+    def io_time(self, io_time):
+        self._table.io_time[self._index] = io_time
+
+    @property
+    def weight(self):
+        return int(self._table.weight[self._index])
+
+    @weight.setter
+    def weight(self, weight):
+        self._table.weight[self._index] = weight
+
+    @property
+    def vruntime(self):
+        return float(self._table.vruntime[self._index])
+
+    @vruntime.setter
+    def vruntime(self, vruntime):
+        self._table.vruntime[self._index] = vruntime
+
+class ProcessTable:
+    def __init__(self, capacity=16):
+        """Initialize an empty columnar (struct-of-arrays) process table.
+
+        Args:
+            capacity: Initial number of rows allocated; the columns double
+                      in size when full
+
+        Note:
+            Each column (process_id, state, start_time, end_time, cpu_time,
+            io_time, weight, vruntime) is a NumPy array holding the first
+            len(table) rows. Indexing or iterating the table yields one
+            ProcessTableRow per process, so it can stand in for a list of
+            ProcessTableEntry objects.
+        """
+        self._size = 0
+        self._rows = []
+        self._columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in _COLUMNS.items()}
+
+    def __getattr__(self, name):
+        # Columns are exposed as attributes, trimmed to the rows in use
+        columns = self.__dict__.get('_columns')
+        if columns is None or name not in columns:
+            raise AttributeError(name)
+        return columns[name][:self._size]
+
+    def add(self, process_id, process_state, start_time, weight=DEFAULT_WEIGHT):
+        """Append a process and return its row view.
+
+        Args:
+            process_id: Unique identifier for the process
+            process_state: Initial state, one of PROCESS_STATES
+            start_time: Time when process is created
+            weight: Scheduling weight used by the fair scheduler (default: DEFAULT_WEIGHT)
+
+        Returns:
+            ProcessTableRow of the new process
+        """
+        if process_state not in _STATE_CODES:
+            raise ValueError(f"Unknown process state {process_state!r}; expected one of {PROCESS_STATES}")
+        if self._size == len(self._columns['process_id']):
+            for name, column in self._columns.items():
+                grown = np.zeros(max(2 * len(column), 16), dtype=column.dtype)
+                grown[:self._size] = column
+                self._columns[name] = grown
+        index = self._size
+        self._size += 1
+        row = ProcessTableRow(self, index)
+        self._rows.append(row)
+        self.process_id[index] = process_id
+        self.state[index] = _STATE_CODES[process_state]
+        self.start_time[index] = start_time
+        self.end_time[index] = _NO_END_TIME
+        self.cpu_time[index] = 0
+        self.io_time[index] = 0
+        self.weight[index] = weight
+        self.vruntime[index] = 0
+        return row
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        return self._rows[index]
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def turnaround_times(self):
+        """Return end_time - start_time for every process (finished or not) as an array."""
+        return self.end_time - self.start_time
+
+    def waiting_times(self):
+        """Return turnaround time - cpu_time - io_time for every process as an array."""
+        return self.end_time - self.start_time - self.cpu_time - self.io_time
+
+    def finished(self):
+        """Return a boolean mask of the processes in state PR_DONE."""
+        return self.state == _STATE_CODES['PR_DONE']
+
+def process_time_columns(process_table):
+    """Return the per-process metrics of a process table as NumPy arrays.
+
+    Args:
+        process_table: A ProcessTable, or a list of ProcessTableEntry objects
+                       whose processes have all finished
+
+    Returns:
+        Dictionary mapping 'process_id', 'turnaround_time', 'cpu_time',
+        'io_time' and 'waiting_time' to int64 arrays in table order. For a
+        ProcessTable each is a single vectorized expression over its columns.
+    """
+    if isinstance(process_table, ProcessTable):
+        return {
+            'process_id': process_table.process_id,
+            'turnaround_time': process_table.turnaround_times(),
+            'cpu_time': process_table.cpu_time,
+            'io_time': process_table.io_time,
+            'waiting_time': process_table.waiting_times(),
+        }
+    count = len(process_table)
+    columns = {name: np.fromiter((getattr(entry, name) for entry in process_table), dtype=np.int64, count=count)
+               for name in ('process_id', 'start_time', 'end_time', 'cpu_time', 'io_time')}
+    turnaround_times = columns['end_time'] - columns['start_time']
+    return {
+        'process_id': columns['process_id'],
+        'turnaround_time': turnaround_times,
+        'cpu_time': columns['cpu_time'],
+        'io_time': columns['io_time'],
+        'waiting_time': turnaround_times - columns['cpu_time'] - columns['io_time'],
+    }
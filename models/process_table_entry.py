@@ -1,20 +1,27 @@
+# Load weight of a nice-0 process, as in the Linux CFS weight table
+DEFAULT_WEIGHT = 1024
+
 class ProcessTableEntry:
-    def __init__(self, process_id, process_state, start_time, end_time=None, cpu_time=0):
+    def __init__(self, process_id, process_state, start_time, end_time=None, cpu_time=0, weight=DEFAULT_WEIGHT):
         """Initialize a process table entry.
 
         Args:
             process_id: Unique identifier for the process
-            process_state: Current state of the process (PR_CURR, PR_READY)
+            process_state: Current state of the process (PR_CURR, PR_READY, PR_WAIT, PR_DONE)
             start_time: Time when process was created
             end_time: Time when process completed (default: None)
             cpu_time: Total CPU time used by process (default: 0)
+            weight: Scheduling weight used by the fair scheduler (default: DEFAULT_WEIGHT)
 
         Note:
             The turnaround time can be calculated as (end_time - start_time).
-            The waiting time can be calculated as (turnaround time - cpu_time).
+            The waiting time can be calculated as (turnaround time - cpu_time - io_time).
         """
         self.process_id = process_id
         self.process_state = process_state
         self.start_time = start_time
         self.end_time = end_time
-        self.cpu_time = cpu_time
\ No newline at end of file
+        self.cpu_time = cpu_time
+        self.weight = weight
+        self.vruntime = 0  # Weighted CPU time used by the fair scheduler
+        self.io_time = 0  # Time spent being served by I/O devices
@@ -0,0 +1,228 @@
+import heapq
+import itertools
+from collections import deque
+
+class ReadyQueue:
+    """
+    Interface for the ready queue owned by OperatingSystemModel.
+
+    Schedulers dispatch only through enqueue() and dequeue(), so the queueing
+    policy is pluggable: FIFO queues, binary heaps keyed on a priority or
+    bucketed multi-level queues can all implement this interface.
+    """
+
+    def enqueue(self, entry):
+        """Add a ProcessTableEntry to the queue."""
+        raise NotImplementedError
+
+    def dequeue(self):
+        """Remove and return the next ProcessTableEntry to dispatch."""
+        raise NotImplementedError
+
+    def peek(self):
+        """Return the next ProcessTableEntry to dispatch without removing it."""
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def __iter__(self):
+        """Iterate over the queued entries without removing them."""
+        raise NotImplementedError
+
+    def __bool__(self):
+        return len(self) > 0
+
+class FIFOReadyQueue(ReadyQueue):
+    """First-in, first-out ready queue with O(1) enqueue and dequeue."""
+
+    def __init__(self, entries=()):
+        self._entries = deque(entries)
+
+    def enqueue(self, entry):
+        self._entries.append(entry)
+
+    def dequeue(self):
+        return self._entries.popleft()
+
+    def peek(self):
+        return self._entries[0]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+class HeapReadyQueue(ReadyQueue):
+    """
+    Priority ready queue backed by a binary heap, dispatching the entry with
+    the smallest key first (ties in enqueue order).
+
+    Keys are invalidated lazily: update() pushes a fresh heap item and marks
+    the old one stale instead of searching the heap for it, and stale items
+    are discarded when they reach the top. Enqueue, update and dequeue are all
+    O(log n).
+    """
+
+    def __init__(self, key):
+        """
+        :param key: Function mapping a ProcessTableEntry to its priority key.
+        """
+        self._key = key
+        self._heap = []
+        self._live = {}  # process_id -> sequence number of its current heap item
+        self._counter = itertools.count()
+
+    def enqueue(self, entry):
+        seq = next(self._counter)
+        self._live[entry.process_id] = seq
+        heapq.heappush(self._heap, (self._key(entry), seq, entry))
+        # Rebuild once stale items dominate, so the heap stays O(live entries)
+        if len(self._heap) > 2 * len(self._live) + 64:
+            self._heap = [item for item in self._heap if self._is_live(item)]
+            heapq.heapify(self._heap)
+
+    def update(self, entry):
+        """Recompute the key of a queued entry, invalidating its old heap item."""
+        if entry.process_id in self._live:
+            self.enqueue(entry)
+
+    def remove(self, entry):
+        """Remove an entry from the queue (its heap item becomes stale)."""
+        self._live.pop(entry.process_id, None)
+
+    def _is_live(self, item):
+        return self._live.get(item[2].process_id) == item[1]
+
+    def _discard_stale(self):
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+
+    def dequeue(self):
+        self._discard_stale()
+        _, _, entry = heapq.heappop(self._heap)
+        del self._live[entry.process_id]
+        return entry
+
+    def peek(self):
+        self._discard_stale()
+        return self._heap[0][2]
+
+    def __len__(self):
+        return len(self._live)
+
+    def __iter__(self):
+        return (item[2] for item in self._heap if self._is_live(item))
+
+class MultiLevelReadyQueue(ReadyQueue):
+    """
+    Bucketed ready queue with one FIFO per priority level (0 is highest).
+
+    A bitmap records which levels are non-empty, and the next level to serve
+    is found with a find-first-set on it, in the style of the Linux O(1)
+    scheduler. Enqueue and dequeue cost does not grow with the number of
+    levels or processes.
+    """
+
+    def __init__(self, num_levels):
+        """
+        :param num_levels: Number of priority levels.
+        """
+        self.num_levels = num_levels
+        self._queues = [deque() for _ in range(num_levels)]
+        self._bitmap = 0
+        self._levels = {}  # process_id -> level, for entries not at level 0
+
+    def level_of(self, entry):
+        """Return the priority level of an entry (queued or not)."""
+        return self._levels.get(entry.process_id, 0)
+
+    def set_level(self, entry, level):
+        """Set the level an entry is queued at by its next enqueue()."""
+        level = min(max(level, 0), self.num_levels - 1)
+        if level:
+            self._levels[entry.process_id] = level
+        else:
+            self._levels.pop(entry.process_id, None)
+
+    def enqueue(self, entry):
+        level = self.level_of(entry)
+        self._queues[level].append(entry)
+        self._bitmap |= 1 << level
+
+    def _first_level(self):
+        # Find-first-set: isolate the lowest set bit
+        return (self._bitmap & -self._bitmap).bit_length() - 1
+
+    def dequeue(self):
+        level = self._first_level()
+        if level < 0:
+            raise IndexError("dequeue from an empty ready queue")
+        queue = self._queues[level]
+        entry = queue.popleft()
+        if not queue:
+            self._bitmap &= ~(1 << level)
+        return entry
+
+    def peek(self):
+        level = self._first_level()
+        if level < 0:
+            raise IndexError("peek at an empty ready queue")
+        return self._queues[level][0]
+
+    def boost(self):
+        """Move every entry back to level 0 (periodic priority boost)."""
+        top = self._queues[0]
+        for queue in self._queues[1:]:
+            top.extend(queue)
+            queue.clear()
+        self._levels.clear()
+        self._bitmap = 1 if top else 0
+
+    def __len__(self):
+        return sum(len(queue) for queue in self._queues)
+
+    def __bool__(self):
+        return self._bitmap != 0
+
+    def __iter__(self):
+        for queue in self._queues:
+            yield from queue
+
+class FairReadyQueue(ReadyQueue):
+    """
+    Ready queue ordered by virtual runtime, for the fair scheduler.
+
+    Entries are kept in a binary heap keyed on (vruntime, arrival order):
+    a balanced tree giving O(log n) insert and O(1) access to the leftmost
+    (smallest vruntime) entry. The queue also tracks the total weight of
+    the queued entries and a monotonic min_vruntime; newly queued entries
+    start no earlier than min_vruntime so they cannot monopolize the CPU.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+        self.total_weight = 0
+        self.min_vruntime = 0
+
+    def enqueue(self, entry):
+        entry.vruntime = max(entry.vruntime, self.min_vruntime)
+        heapq.heappush(self._heap, (entry.vruntime, next(self._counter), entry))
+        self.total_weight += entry.weight
+
+    def dequeue(self):
+        _, _, entry = heapq.heappop(self._heap)
+        self.total_weight -= entry.weight
+        self.min_vruntime = max(self.min_vruntime, entry.vruntime)
+        return entry
+
+    def peek(self):
+        return self._heap[0][2]
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        return (item[2] for item in self._heap)
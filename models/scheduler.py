@@ -1,80 +1,611 @@
-def fcfs_scheduler(os_model, processes):
+from bisect import bisect_left
+import numpy as np
+from models.event_calendar import (EventCalendar, ARRIVAL, COMPLETION, SLICE_EXPIRY, IO_REQUEST, IO_COMPLETION,
+                                   CORE_FREE, CORE_IDLE)
+from models.process import Process, OPCODE_COSTS
+from models.process_table_entry import DEFAULT_WEIGHT
+from models.ready_queue import HeapReadyQueue, MultiLevelReadyQueue, FairReadyQueue
+
+# Simulation engines accepted by the schedulers
+ENGINES = ('step', 'fast')
+
+# Multi-level feedback queue defaults
+MLFQ_LEVELS = 4
+MLFQ_BOOST_QUANTA = 100  # Priority boost period, in multiples of os_model.quantum
+
+# Fair scheduler defaults (ns)
+CFS_TARGET_LATENCY = 6000  # Period in which every runnable process should run once
+CFS_MIN_GRANULARITY = 750  # Smallest time slice handed out
+
+def _check_engine(engine):
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; expected one of {ENGINES}")
+
+def _execute(proc, budget, engine):
+    """Run proc for up to budget ns with the chosen engine; return the cost."""
+    if engine == 'fast':
+        return proc.execute_slice(budget)
+    return Process.execute_slice(proc, budget)
+
+def _execute_remaining(proc, engine):
+    """Run proc to completion with the chosen engine; return the cost."""
+    if engine == 'fast':
+        return proc.execute_remaining()
+    return Process.execute_remaining(proc)
+
+class SchedulingPolicy:
+    """
+    Scheduling decisions plugged into run_event_loop. The base class is
+    FCFS: processes are dispatched from os_model.ready_queue in order and run
+    to completion. Subclasses override the hooks below.
+    """
+    # Charge the context switch penalty even when the same process is dispatched again
+    penalize_same_process = True
+    # A preempted process is charged its whole time slice, as in Round Robin
+    charge_full_slice = False
+    # Run at least one instruction per dispatch, even if it exceeds the slice
+    min_one_instruction = False
+
+    def __init__(self, os_model, processes):
+        """
+        :param os_model: The operating system model.
+        :param processes: A dict mapping process_id to a Process instance.
+        """
+        self.os_model = os_model
+        self.processes = processes
+
+    def pick(self):
+        """Choose the next entry to run (the ready queue is not empty)."""
+        return self.os_model.ready_queue.dequeue()
+
+    def time_slice(self, entry):
+        """Return the budget for entry in ns, or None to run it to completion."""
+        return None
+
+    def charged(self, entry, cost):
+        """Account cost ns of CPU time used by entry."""
+
+    def preempted(self, entry):
+        """Return a preempted entry to the ready queue."""
+        self.os_model.ready_queue.enqueue(entry)
+
+    def finished(self, entry):
+        """Forget a finished entry."""
+
+    def blocked(self, entry):
+        """Forget an entry that left the CPU to wait for I/O."""
+
+def run_event_loop(os_model, policy, engine='step'):
+    """
+    Discrete-event simulation core shared by the single-core schedulers.
+    Ready processes whose start_time lies in the future are first turned into
+    arrival events. Whenever the CPU is free and a process is ready, the
+    policy picks one and it runs for its time slice; the resulting completion
+    or slice expiry is scheduled in os_model.calendar. Otherwise the earliest event is handled
+    and the clock jumps to its time, so idle gaps cost nothing to simulate.
+    :param os_model: The operating system model.
+    :param policy: A SchedulingPolicy instance.
+    :param engine: 'step' advances one instruction at a time; 'fast' uses
+                   Process.execute_slice / execute_remaining.
+    """
+    _check_engine(engine)
+    os_model.schedule_arrivals()
+    calendar = os_model.calendar
+    processes = policy.processes
+    # Indices of each process's blocking instructions, computed on first dispatch
+    io_positions = {}
+
+    # Track the previous process for context switch
+    prev_entry = None
+
+    while True:
+        if os_model.current_process is None and os_model.ready_queue:
+            entry = policy.pick()
+            proc = processes[entry.process_id]
+
+            # Apply context switch penalty if this isn't the first process
+            if prev_entry is not None and (policy.penalize_same_process or prev_entry is not entry):
+                os_model.current_time += os_model.context_switch_penalty
+
+            budget = policy.time_slice(entry)
+            stop = None
+            if os_model.io_devices:
+                if entry.process_id not in io_positions:
+                    io_positions[entry.process_id] = proc.instruction_positions(os_model.io_devices)
+                positions = io_positions[entry.process_id]
+                index = bisect_left(positions, proc.pc)
+                if index < len(positions):
+                    stop = positions[index]
+            if stop is not None:
+                cost = _execute_until(proc, budget, stop, engine)
+                if cost == 0 and policy.min_one_instruction and proc.pc < stop:
+                    cost = proc.execute_next_instruction()
+            elif budget is None:
+                cost = _execute_remaining(proc, engine)
+            else:
+                cost = _execute(proc, budget, engine)
+                if cost == 0 and policy.min_one_instruction and not proc.is_finished():
+                    # The next instruction is longer than the slice; let it complete
+                    cost = proc.execute_next_instruction()
+            entry.cpu_time += cost
+            os_model.busy_time += cost
+            policy.charged(entry, cost)
+
+            entry.process_state = "PR_CURR"
+            os_model.current_process = entry
+            if proc.is_finished():
+                calendar.schedule(os_model.current_time + cost, COMPLETION, entry)
+            elif proc.pc == stop:
+                # Blocks on the I/O instruction once the CPU work before it is done
+                calendar.schedule(os_model.current_time + cost, IO_REQUEST, entry)
+            else:
+                elapsed = max(budget, cost) if policy.charge_full_slice else cost
+                calendar.schedule(os_model.current_time + elapsed, SLICE_EXPIRY, entry)
+
+            # Remember this process for the next dispatch
+            prev_entry = entry
+            continue
+
+        if not calendar:
+            break
+        event = calendar.pop()
+        os_model.current_time = max(os_model.current_time, event.time)
+        entry = event.payload
+        if event.kind == ARRIVAL:
+            os_model.ready_queue.enqueue(entry)
+        elif event.kind == COMPLETION:
+            os_model.current_process = None
+            policy.finished(entry)
+            os_model.complete_process(entry)
+        elif event.kind == SLICE_EXPIRY:
+            os_model.current_process = None
+            entry.process_state = "PR_READY"
+            policy.preempted(entry)
+        elif event.kind == IO_REQUEST:
+            os_model.current_process = None
+            policy.blocked(entry)
+            proc = processes[entry.process_id]
+            instruction = proc.peek_next_instruction()
+            proc.skip_instruction()
+            os_model.request_io(entry, instruction)
+        elif event.kind == IO_COMPLETION:
+            entry = os_model.complete_io(event.payload)
+            if processes[entry.process_id].is_finished():
+                os_model.complete_process(entry)
+            else:
+                entry.process_state = "PR_READY"
+                os_model.ready_queue.enqueue(entry)
+
+def _execute_until(proc, budget, stop, engine):
+    """
+    Run proc for up to budget ns (None: no limit), stopping before the
+    instruction at index stop; return the cost.
+    """
+    if engine == 'fast':
+        cap = proc.range_cost(proc.pc, stop)
+        if budget is not None and cap >= budget:
+            return proc.execute_slice(budget)
+        used = proc.execute_slice(cap)
+        # Zero-cost instructions right before the stop fit in any budget
+        while proc.pc < stop and proc.peek_next_instruction_cost() == 0:
+            proc.execute_next_instruction()
+        return used
+    used = 0
+    while proc.pc < stop and (budget is None or budget - used > 0):
+        if budget is not None and proc.peek_next_instruction_cost() > budget - used:
+            break
+        used += proc.execute_next_instruction()
+    return used
+
+def fcfs_scheduler(os_model, processes, engine='step'):
     """
     Execute processes in FCFS order.  Each process runs to completion.
     Updates os_model.current_time and each process's ProcessTableEntry.
     :param os_model: The operating system model.
     :param processes: A dict mapping process_id to a Process instance.
+    :param engine: 'step' advances one instruction at a time; 'fast' computes
+                   all end times in closed form (see _fcfs_vectorized) when
+                   no arrivals are pending.
     """
-    # Track the previous process to apply context switch
-    prev_process_id = None
-    
-    # ready_list order is assumed to be in arrival order.
-    for entry in os_model.ready_list:
-        proc = processes[entry.process_id]
-        
-        # Apply context switch penalty if this isn't the first process
-        if prev_process_id is not None:
-            os_model.current_time += os_model.context_switch_penalty
-        
-        # Run process to completion
-        while not proc.is_finished():
-            cost = proc.execute_next_instruction()
-            entry.cpu_time += cost
-            os_model.current_time += cost
-        entry.end_time = os_model.current_time
-        entry.process_state = "PR_DONE"
-        
-        # Remember this process ID for the next iteration
-        prev_process_id = entry.process_id
+    _check_engine(engine)
+    os_model.schedule_arrivals()
+    if (engine == 'fast' and not os_model.calendar and not os_model.io_devices
+            and os_model.current_process is None):
+        _fcfs_vectorized(os_model, processes)
+        return
+    run_event_loop(os_model, SchedulingPolicy(os_model, processes), engine)
+
+def _fcfs_vectorized(os_model, processes):
+    """
+    Closed-form FCFS. Since every process runs to completion in ready queue
+    order, the i-th end time is the running sum of the total process costs
+    plus i context switch penalties. Per-process totals come from
+    Process.execute_remaining, an O(1) lookup for CompactProcess instances,
+    so no individual instruction is executed.
+    :param os_model: The operating system model.
+    :param processes: A dict mapping process_id to a Process instance.
+    """
+    entries = []
+    while os_model.ready_queue:
+        entries.append(os_model.ready_queue.dequeue())
+    if not entries:
+        return
+    costs = np.fromiter((processes[entry.process_id].execute_remaining() for entry in entries),
+                        dtype=np.int64, count=len(entries))
+    end_times = (os_model.current_time + np.cumsum(costs)
+                 + os_model.context_switch_penalty * np.arange(len(entries), dtype=np.int64))
+    os_model.busy_time += int(costs.sum())
+    for entry, cost, end_time in zip(entries, costs.tolist(), end_times.tolist()):
+        entry.cpu_time += cost
+        os_model.complete_process(entry, end_time)
+    os_model.current_time = end_times[-1].item()
+
+class RoundRobinPolicy(SchedulingPolicy):
+    """Every dispatch gets os_model.quantum ns; a preempted process uses the full slice."""
+    charge_full_slice = True
 
-def round_robin_scheduler(os_model, processes):
+    def time_slice(self, entry):
+        return self.os_model.quantum
+
+def round_robin_scheduler(os_model, processes, engine='step'):
     """
     Execute processes using Round Robin scheduling.
     Each process gets a time slice equal to os_model.quantum.
-    If a process does not finish in its slice, it is preempted.
+    If a process does not finish in its slice, it is preempted and uses the
+    full time slice.
     :param os_model: The operating system model.
     :param processes: A dict mapping process_id to a Process instance.
+    :param engine: 'step' advances one instruction at a time; 'fast' jumps
+                   to the end of each slice with Process.execute_slice, which
+                   is a binary search for CompactProcess instances.
     """
-    # Create an initial queue of process table entries (shallow copy)
-    queue = os_model.ready_list.copy()
-    
-    # Track the previous process for context switch
-    prev_process_id = None
+    run_event_loop(os_model, RoundRobinPolicy(os_model, processes), engine)
 
-    while queue:
-        entry = queue.pop(0)
-        proc = processes[entry.process_id]
-        
-        # Apply context switch penalty if this isn't the first process
-        if prev_process_id is not None:
-            os_model.current_time += os_model.context_switch_penalty
-        
-        # Mark the start of the slice
-        slice_start = os_model.current_time
-        quantum_remaining = os_model.quantum
-        
-        # Execute instructions within the allotted quantum
-        while quantum_remaining > 0 and not proc.is_finished():
-            next_cost = proc.peek_next_instruction_cost()
-            if next_cost <= quantum_remaining:
-                cost = proc.execute_next_instruction()
-                entry.cpu_time += cost
-                os_model.current_time += cost
-                quantum_remaining -= cost
+def round_robin_batch(os_models, processes):
+    """
+    Run Round Robin on several OS models at once, typically one per quantum,
+    with the same results as calling round_robin_scheduler on each model
+    with its own copy of the processes.
+    Without arrivals or I/O, RR dispatches the unfinished processes in
+    rounds, and where each slice ends depends only on the process and the
+    quantum. All the processes' costs are laid out in one global prefix sum,
+    so every (quantum, process) pair advances by one slice per iteration in
+    a single vectorized binary search. Completion times then follow from the
+    slice counts and the final slice costs in each model's dispatch order.
+    The processes are only read, so their program counters do not advance.
+    :param os_models: OperatingSystemModel instances whose processes are all
+                      in the ready queue with start_time <= current_time, and
+                      which have no I/O devices and no running process.
+    :param processes: A dict mapping process_id to a CompactProcess (any
+                      process with an opcodes array), shared by all models.
+    """
+    for os_model in os_models:
+        if os_model.io_devices or os_model.current_process is not None or os_model.calendar:
+            raise ValueError("round_robin_batch requires idle models without I/O devices or pending events")
+        if any(entry.start_time > os_model.current_time for entry in os_model.ready_queue):
+            raise ValueError("round_robin_batch does not support future arrival times")
+    process_ids = list(processes)
+    index_of = {process_id: i for i, process_id in enumerate(process_ids)}
+    lengths = np.array([len(processes[pid].opcodes) for pid in process_ids], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    ends = offsets[1:]
+    # Each process resumes from its program counter
+    starts = offsets[:-1] + np.minimum([processes[pid].pc for pid in process_ids], lengths)
+    # global_costs[g] is the cost of the first g instructions of all processes laid end to end
+    all_opcodes = np.concatenate([np.asarray(processes[pid].opcodes, dtype=np.uint8) for pid in process_ids]
+                                 or [np.zeros(0, dtype=np.uint8)])
+    global_costs = np.zeros(len(all_opcodes) + 1, dtype=np.int64)
+    np.cumsum(OPCODE_COSTS[all_opcodes], out=global_costs[1:])
+    total_costs = global_costs[ends] - global_costs[starts]
+
+    quanta = sorted({os_model.quantum for os_model in os_models})
+    budgets = np.array(quanta, dtype=np.int64)[:, None]
+    position = np.broadcast_to(starts, (len(quanta), len(process_ids))).copy()
+    end = np.broadcast_to(ends, position.shape)
+    slices = np.zeros(position.shape, dtype=np.int64)
+    final_cost = np.zeros(position.shape, dtype=np.int64)
+    alive = np.ones(position.shape, dtype=bool)
+    while alive.any():
+        pos, limit_end = position[alive], end[alive]
+        limit = global_costs[pos] + np.broadcast_to(budgets, position.shape)[alive]
+        stop = np.minimum(np.searchsorted(global_costs, limit, side='right') - 1, limit_end)
+        # The budget is used up exactly; stepping would stop at the first
+        # instruction reaching it, before any trailing zero-cost ones.
+        exact = global_costs[stop] == limit
+        stop[exact] = np.searchsorted(global_costs, limit[exact], side='left')
+        if np.any((stop == pos) & (pos < limit_end)):
+            raise ValueError("A quantum is shorter than an instruction; Round Robin would make no progress")
+        finished = stop == limit_end
+        cost = global_costs[stop] - global_costs[pos]
+        position[alive] = stop
+        slices[alive] += 1
+        final = final_cost[alive]
+        final[finished] = cost[finished]
+        final_cost[alive] = final
+        still_alive = alive.copy()
+        still_alive[alive] = ~finished
+        alive = still_alive
+
+    for os_model in os_models:
+        row = quanta.index(os_model.quantum)
+        entries = []
+        while os_model.ready_queue:
+            entries.append(os_model.ready_queue.dequeue())
+        if not entries:
+            continue
+        order = np.array([index_of[entry.process_id] for entry in entries], dtype=np.int64)
+        counts = slices[row, order]
+        # One dispatch per (round, process) in round-major, ready-queue order
+        dispatch_entry = np.repeat(np.arange(len(entries)), counts)
+        dispatch_round = np.arange(len(dispatch_entry)) - np.repeat(np.cumsum(counts) - counts, counts)
+        dispatch_order = np.argsort(dispatch_round * len(entries) + dispatch_entry, kind='stable')
+        dispatch_entry = dispatch_entry[dispatch_order]
+        is_final = dispatch_round[dispatch_order] == counts[dispatch_entry] - 1
+        durations = np.where(is_final, final_cost[row, order][dispatch_entry], os_model.quantum)
+        finish_times = (os_model.current_time + np.cumsum(durations + os_model.context_switch_penalty)
+                        - os_model.context_switch_penalty)
+        busy = total_costs[order]
+        os_model.busy_time += int(busy.sum())
+        final_dispatches = np.flatnonzero(is_final)
+        for dispatch in final_dispatches.tolist():
+            i = int(dispatch_entry[dispatch])
+            entry = entries[i]
+            entry.cpu_time += int(busy[i])
+            os_model.complete_process(entry, int(finish_times[dispatch]))
+        os_model.current_time = int(finish_times[-1])
+
+
+class ShortestJobPolicy(SchedulingPolicy):
+    """
+    Smallest remaining cost first. Remaining-time keys live in a heap; the
+    running process stays queued and its key is refreshed lazily after each
+    run (HeapReadyQueue.update). When preemptive, a process runs only until
+    the next event, at which point the choice is re-evaluated.
+    """
+    penalize_same_process = False
+    min_one_instruction = True
+
+    def __init__(self, os_model, processes, preemptive):
+        super().__init__(os_model, processes)
+        self.preemptive = preemptive
+        os_model.use_ready_queue(HeapReadyQueue(key=lambda entry: processes[entry.process_id].remaining_cost()))
+
+    def pick(self):
+        return self.os_model.ready_queue.peek()
+
+    def time_slice(self, entry):
+        next_event = self.os_model.calendar.peek_time()
+        if not self.preemptive or next_event is None:
+            return None
+        return max(next_event - self.os_model.current_time, 0)
+
+    def preempted(self, entry):
+        self.os_model.ready_queue.update(entry)
+
+    def finished(self, entry):
+        self.os_model.ready_queue.remove(entry)
+
+    def blocked(self, entry):
+        self.os_model.ready_queue.remove(entry)
+
+def sjf_scheduler(os_model, processes, engine='step'):
+    """
+    Execute processes using non-preemptive Shortest-Job-First scheduling.
+    Whenever the CPU is free, the ready process with the smallest total
+    cost runs to completion. Processes whose start_time lies in the future
+    are admitted when they arrive.
+    :param os_model: The operating system model.
+    :param processes: A dict mapping process_id to a Process instance.
+    :param engine: 'step' advances one instruction at a time; 'fast' uses
+                   Process.execute_slice / execute_remaining.
+    """
+    run_event_loop(os_model, ShortestJobPolicy(os_model, processes, preemptive=False), engine)
+
+def srtf_scheduler(os_model, processes, engine='step'):
+    """
+    Execute processes using Shortest-Remaining-Time-First scheduling.
+    The ready process with the smallest remaining cost runs until it
+    finishes or another process arrives, at which point the choice is
+    re-evaluated. Instructions are not interruptible, so a preemption takes
+    effect at the first instruction boundary at or after the arrival.
+    :param os_model: The operating system model.
+    :param processes: A dict mapping process_id to a Process instance.
+    :param engine: 'step' advances one instruction at a time; 'fast' uses
+                   Process.execute_slice / execute_remaining.
+    """
+    run_event_loop(os_model, ShortestJobPolicy(os_model, processes, preemptive=True), engine)
+
+class MLFQPolicy(SchedulingPolicy):
+    """
+    Level k has a quantum of os_model.quantum * 2**k. A process that uses its
+    whole quantum without finishing is demoted one level, and every
+    boost_interval ns all processes are moved back to the top level.
+    """
+    charge_full_slice = True
+
+    def __init__(self, os_model, processes, num_levels, boost_interval):
+        super().__init__(os_model, processes)
+        self.quanta = [os_model.quantum * 2 ** level for level in range(num_levels)]
+        self.boost_interval = boost_interval
+        self.next_boost = os_model.current_time + boost_interval
+        os_model.use_ready_queue(MultiLevelReadyQueue(num_levels))
+
+    def pick(self):
+        queue = self.os_model.ready_queue
+        if self.os_model.current_time >= self.next_boost:
+            queue.boost()
+            self.next_boost = self.os_model.current_time + self.boost_interval
+        return queue.dequeue()
+
+    def time_slice(self, entry):
+        return self.quanta[self.os_model.ready_queue.level_of(entry)]
+
+    def preempted(self, entry):
+        # Quantum expired: demote one level
+        queue = self.os_model.ready_queue
+        queue.set_level(entry, queue.level_of(entry) + 1)
+        queue.enqueue(entry)
+
+def mlfq_scheduler(os_model, processes, engine='step', num_levels=MLFQ_LEVELS, boost_interval=None):
+    """
+    Execute processes using a multi-level feedback queue.
+    Level k has a quantum of os_model.quantum * 2**k. A process that uses its
+    whole quantum without finishing is demoted one level, and every
+    boost_interval ns all processes are moved back to the top level. As in
+    Round Robin, a preempted process uses its full time slice.
+    :param os_model: The operating system model.
+    :param processes: A dict mapping process_id to a Process instance.
+    :param engine: 'step' advances one instruction at a time; 'fast' jumps
+                   to the end of each slice with Process.execute_slice.
+    :param num_levels: Number of priority levels.
+    :param boost_interval: Priority boost period in ns
+                           (default: MLFQ_BOOST_QUANTA * os_model.quantum).
+    """
+    if boost_interval is None:
+        boost_interval = MLFQ_BOOST_QUANTA * os_model.quantum
+    run_event_loop(os_model, MLFQPolicy(os_model, processes, num_levels, boost_interval), engine)
+
+class CFSPolicy(SchedulingPolicy):
+    """
+    Smallest virtual runtime first, with a time slice equal to the process's
+    weighted share of the scheduling period.
+    """
+    penalize_same_process = False
+    min_one_instruction = True
+
+    def __init__(self, os_model, processes, target_latency, min_granularity):
+        super().__init__(os_model, processes)
+        self.target_latency = target_latency
+        self.min_granularity = min_granularity
+        self._slice = None
+        os_model.use_ready_queue(FairReadyQueue())
+
+    def pick(self):
+        queue = self.os_model.ready_queue
+        nr_running = len(queue)
+        total_weight = queue.total_weight
+        entry = queue.dequeue()
+        period = max(self.target_latency, nr_running * self.min_granularity)
+        self._slice = period * entry.weight // total_weight
+        return entry
+
+    def time_slice(self, entry):
+        return self._slice
+
+    def charged(self, entry, cost):
+        entry.vruntime += cost * DEFAULT_WEIGHT / entry.weight
+
+def cfs_scheduler(os_model, processes, engine='step', target_latency=CFS_TARGET_LATENCY,
+                  min_granularity=CFS_MIN_GRANULARITY):
+    """
+    Execute processes using a Completely-Fair-style scheduler.
+    The process with the smallest virtual runtime runs next. Its time slice
+    is its weighted share of the scheduling period, which is target_latency,
+    stretched to nr_running * min_granularity when there are many runnable
+    processes, so no quantum needs to be tuned by hand. Virtual runtime
+    advances by the CPU time used, scaled by DEFAULT_WEIGHT / entry.weight.
+    Only the time actually used is charged; a process whose next instruction
+    is longer than its slice still executes that instruction.
+    :param os_model: The operating system model.
+    :param processes: A dict mapping process_id to a Process instance.
+    :param engine: 'step' advances one instruction at a time; 'fast' jumps
+                   to the end of each slice with Process.execute_slice.
+    :param target_latency: Scheduling period in ns for few runnable processes.
+    :param min_granularity: Minimum time slice in ns.
+    """
+    run_event_loop(os_model, CFSPolicy(os_model, processes, target_latency, min_granularity), engine)
+
+def multicore_scheduler(os_model, processes, policy='fcfs', engine='step'):
+    """
+    Execute processes on a MultiCoreOperatingSystemModel.
+    Each core dispatches from its own run queue with the given policy and
+    advances its own clock. Cores are simulated in clock order, so an idle
+    core only steals processes that are waiting at that time. With work
+    stealing enabled, an idle core takes the next process from the longest
+    other run queue and pays os_model.migration_penalty on top of the
+    context switch penalty; otherwise it stops once its queue is empty.
+    :param os_model: The multi-core operating system model.
+    :param processes: A dict mapping process_id to a Process instance.
+    :param policy: 'fcfs' runs each process to completion; 'rr' uses
+                   os_model.quantum time slices.
+    :param engine: 'step' advances one instruction at a time; 'fast' uses
+                   Process.execute_slice / execute_remaining.
+    """
+    _check_engine(engine)
+    if policy not in ('fcfs', 'rr'):
+        raise ValueError(f"Unknown multi-core policy {policy!r}; expected 'fcfs' or 'rr'")
+
+    # Cores are simulated in clock order; an idle core waiting for work
+    # (CORE_IDLE) sorts after busy cores freed at the same time (CORE_FREE).
+    events = EventCalendar()
+    for core in os_model.cores:
+        events.schedule(core.current_time, CORE_FREE, core)
+    prev_process_ids = {}
+
+    while events:
+        core = events.pop().payload
+        core_id = core.core_id
+
+        # A process preempted at the end of the last slice rejoins the queue now
+        if core.current_process is not None:
+            core.ready_queue.enqueue(core.current_process)
+            core.current_process = None
+
+        migrated = False
+        if core.ready_queue:
+            entry = core.ready_queue.dequeue()
+        elif os_model.work_stealing:
+            victim = max(os_model.cores, key=lambda other: len(other.ready_queue))
+            if victim.ready_queue:
+                entry = victim.ready_queue.dequeue()
+                migrated = True
             else:
-                # Not enough quantum left to execute the next instruction
-                break
+                # Nothing to steal yet; wait for the next core that may free up work
+                busy = [other.current_time for other in os_model.cores if other.current_process is not None]
+                if busy:
+                    core.current_time = max(core.current_time, min(busy))
+                    events.schedule(core.current_time, CORE_IDLE, core)
+                continue
+        else:
+            continue
+
+        proc = processes[entry.process_id]
+
+        # Apply context switch penalty if this isn't the core's first process
+        if core_id in prev_process_ids:
+            core.current_time += os_model.context_switch_penalty
+        if migrated:
+            core.current_time += os_model.migration_penalty
+            core.migrations += 1
+
+        if policy == 'fcfs':
+            cost = _execute_remaining(proc, engine)
+        else:
+            cost = _execute(proc, os_model.quantum, engine)
+        entry.cpu_time += cost
+        core.current_time += cost
+        core.busy_time += cost
 
         if not proc.is_finished():
-            # Process is preempted. In RR, the process uses the full time slice.
-            slice_elapsed = os_model.current_time - slice_start
-            if quantum_remaining > 0:
-                os_model.current_time += quantum_remaining
-            queue.append(entry)
+            # RR preemption: the process uses the full time slice and stays
+            # on this core until the slice ends
+            core.current_time += os_model.quantum - cost
+            core.current_process = entry
         else:
-            # Process finished in its slice.
-            entry.end_time = os_model.current_time
-            entry.process_state = "PR_DONE"
-        
-        # Remember this process ID for the next iteration
-        prev_process_id = entry.process_id
+            os_model.complete_process(entry, core.current_time)
+
+        # Remember this process ID for the next dispatch on this core
+        prev_process_ids[core_id] = entry.process_id
+        events.schedule(core.current_time, CORE_FREE, core)
+
+    os_model.current_time = max(core.current_time for core in os_model.cores)
+
+# Scheduler functions by the name used on the command line
+SCHEDULERS = {
+    'fcfs': fcfs_scheduler,
+    'rr': round_robin_scheduler,
+    'sjf': sjf_scheduler,
+    'srtf': srtf_scheduler,
+    'mlfq': mlfq_scheduler,
+    'cfs': cfs_scheduler,
+}
@@ -0,0 +1,13 @@
+from models.device import Device, DEFAULT_IO_SERVICE_TIMES
+
+def test_device_initialization():
+    device = Device('disk', {'LOAD': 100})
+    assert device.name == 'disk'
+    assert device.service_times == {'LOAD': 100}
+    assert len(device.queue) == 0
+    assert device.current is None
+    assert device.busy_time == 0
+    assert device.completed == 0
+
+def test_default_service_times_cover_memory_instructions():
+    assert set(DEFAULT_IO_SERVICE_TIMES) == {'LOAD', 'STORE'}
@@ -0,0 +1,22 @@
+from models.event_calendar import EventCalendar, ARRIVAL, COMPLETION, SLICE_EXPIRY
+
+def test_events_pop_in_time_order():
+    calendar = EventCalendar()
+    for time in [50, 10, 30, 20]:
+        calendar.schedule(time, ARRIVAL, time)
+    assert len(calendar) == 4
+    assert calendar.peek_time() == 10
+    assert [calendar.pop().payload for _ in range(4)] == [10, 20, 30, 50]
+    assert not calendar
+    assert calendar.peek_time() is None
+
+def test_simultaneous_events_ordered_by_kind_then_insertion():
+    calendar = EventCalendar()
+    calendar.schedule(5, SLICE_EXPIRY, 'expiry')
+    calendar.schedule(5, COMPLETION, 'completion')
+    calendar.schedule(5, ARRIVAL, 'first arrival')
+    calendar.schedule(5, ARRIVAL, 'second arrival')
+    events = [calendar.pop() for _ in range(4)]
+    assert [event.payload for event in events] == ['first arrival', 'second arrival', 'completion', 'expiry']
+    assert events[0].time == 5
+    assert events[0].kind == ARRIVAL
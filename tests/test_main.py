@@ -1,11 +1,16 @@
 import sys
 import pytest
-from models.process import Process
-import main
 from unittest.mock import patch
+from models.process import Process, CompactProcess, RunLengthProcess
+import main
+
+# The real loader, saved before the autouse fixture patches it
+load_process_unpatched = main.load_process
 
-def dummy_load_process(file_path, process_id):
+def dummy_load_process(file_path, process_id, compact=False, stream=False, run_length=False):
     # Always return a process with the same known instructions.
+    if compact:
+        return CompactProcess.from_instructions(process_id, ["LOAD", "ADD", "STORE"])
     return Process(process_id, ["LOAD", "ADD", "STORE"])
 
 # Automatically patch main.load_process to avoid I/O in tests.
@@ -44,10 +49,98 @@ def test_main_rr_custom_quantum(capsys):
     assert "Process Metrics:" in output
     assert "Total simulation time:" in output
 
+def test_main_rr_fast_engine(capsys):
+    # The fast engine must report the same metrics as the step engine.
+    step_output = run_main_with_args(["main.py", "--scheduler", "rr", "--quantum", "20"], capsys)
+    fast_output = run_main_with_args(["main.py", "--scheduler", "rr", "--quantum", "20", "--engine", "fast"], capsys)
+    assert fast_output == step_output
+
+def test_main_fcfs_fast_engine(capsys):
+    step_output = run_main_with_args(["main.py", "--scheduler", "fcfs"], capsys)
+    fast_output = run_main_with_args(["main.py", "--scheduler", "fcfs", "--engine", "fast"], capsys)
+    assert fast_output == step_output
+
 @patch('main.perform_parameter_sweep')
 def test_main_parameter_sweep(mock_perform_parameter_sweep, capsys):
     # Test main with the parameter sweep option.
     output = run_main_with_args(["main.py", "--sweep"], capsys)
     assert "Running parameter sweep simulations..." in output
     # Verify that perform_parameter_sweep was called
-    mock_perform_parameter_sweep.assert_called_once() 
\ No newline at end of file
+    mock_perform_parameter_sweep.assert_called_once() 
+
+def test_main_sjf_and_srtf(capsys):
+    for name in ["sjf", "srtf", "cfs"]:
+        output = run_main_with_args(["main.py", "--scheduler", name], capsys)
+        assert f"Running {name.upper()} scheduler..." in output
+        assert "Total simulation time:" in output
+
+def test_main_mlfq(capsys):
+    output = run_main_with_args(["main.py", "--scheduler", "mlfq", "--quantum", "100"], capsys)
+    assert "Running MLFQ scheduler with base quantum = 100 ns..." in output
+    assert "Total simulation time:" in output
+
+def test_main_multicore(capsys):
+    output = run_main_with_args(["main.py", "--scheduler", "rr", "--cores", "2", "--work-stealing"], capsys)
+    assert "Running multi-core RR scheduler on 2 cores..." in output
+    assert "Makespan:" in output
+    assert "Core 1: Utilization =" in output
+
+def test_main_arrival_interval(capsys):
+    output = run_main_with_args(["main.py", "--scheduler", "srtf", "--arrival-interval", "500"], capsys)
+    assert "Running SRTF scheduler..." in output
+    assert "Total simulation time:" in output
+
+def test_main_blocking_io(capsys):
+    output = run_main_with_args(["main.py", "--scheduler", "rr", "--blocking-io"], capsys)
+    assert "I/O Time =" in output
+    assert "Device io: Utilization =" in output
+
+def test_main_process_files(capsys):
+    output = run_main_with_args(["main.py", "--process-files", "a.trace", "b.txt"], capsys)
+    assert "Process 2:" in output
+    assert "Process 3:" not in output
+
+def test_main_stream(capsys):
+    output = run_main_with_args(["main.py", "--scheduler", "rr", "--stream"], capsys)
+    assert "Total simulation time:" in output
+
+def test_load_process_run_length():
+    proc = load_process_unpatched("data/process_a.txt", 1, run_length=True)
+    assert isinstance(proc, RunLengthProcess)
+    assert proc.instructions == load_process_unpatched("data/process_a.txt", 1).instructions
+
+@patch('main.generate_charts_from_file')
+def test_main_charts_only(mock_generate_charts_from_file, capsys):
+    output = run_main_with_args(["main.py", "--charts-only", "--results-file", "old.jsonl"], capsys)
+    assert "Generating charts from old.jsonl..." in output
+    mock_generate_charts_from_file.assert_called_once_with("old.jsonl", dpi=300, fmt='png', jobs=1)
+
+@patch('main.generate_charts_from_file')
+def test_main_charts_only_format(mock_generate_charts_from_file, capsys):
+    run_main_with_args(["main.py", "--charts-only", "--chart-format", "svg", "--chart-dpi", "100",
+                        "--jobs", "4"], capsys)
+    kwargs = mock_generate_charts_from_file.call_args.kwargs
+    assert (kwargs['fmt'], kwargs['dpi'], kwargs['jobs']) == ('svg', 100, 4)
+
+@patch('main.perform_parameter_sweep')
+def test_main_parameter_sweep_resume(mock_perform_parameter_sweep, capsys):
+    run_main_with_args(["main.py", "--sweep", "--resume", "--no-cache"], capsys)
+    kwargs = mock_perform_parameter_sweep.call_args.kwargs
+    assert kwargs['resume'] is True
+    assert kwargs['cache_dir'] is None
+
+@patch('main.perform_parameter_sweep')
+def test_main_parameter_sweep_replicates(mock_perform_parameter_sweep, capsys):
+    run_main_with_args(["main.py", "--sweep", "--replicates", "3", "--max-replicates", "10",
+                        "--precision", "0.02"], capsys)
+    kwargs = mock_perform_parameter_sweep.call_args.kwargs
+    assert (kwargs['replicates'], kwargs['max_replicates'], kwargs['precision']) == (3, 10, 0.02)
+
+@patch('main.perform_quantum_search')
+def test_main_optimize_quantum(mock_perform_quantum_search, capsys):
+    output = run_main_with_args(["main.py", "--optimize-quantum", "--objective", "waiting_time",
+                                 "--search-method", "grid"], capsys)
+    assert "Searching for the best Round Robin quantum..." in output
+    kwargs = mock_perform_quantum_search.call_args.kwargs
+    assert (kwargs['objective'], kwargs['method'], kwargs['tolerance']) == ('waiting_time', 'grid', 10)
+    assert (kwargs['chart_dpi'], kwargs['chart_format']) == (300, 'png')
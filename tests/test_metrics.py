@@ -0,0 +1,84 @@
+import pytest
+import numpy as np
+from utils.metrics import (RunningStats, QuantileSketch, MetricsAccumulator, PROCESS_METRICS, t_critical_value,
+                           confidence_interval)
+from models.process_table_entry import ProcessTableEntry
+
+def test_running_stats_match_numpy():
+    values = np.random.default_rng(0).exponential(1000, size=1001)
+    stats = RunningStats()
+    for value in values[:500]:
+        stats.add(value)
+    other = RunningStats()
+    other.add_array(values[500:])
+    stats.merge(other)
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.variance == pytest.approx(values.var(ddof=1))
+    assert (stats.min, stats.max) == (values.min(), values.max())
+    assert RunningStats.from_dict(stats.to_dict()) == stats
+
+def test_running_stats_empty():
+    stats = RunningStats()
+    stats.merge(RunningStats())
+    stats.add_array([])
+    assert (stats.count, stats.mean, stats.variance, stats.min) == (0, 0.0, 0.0, None)
+
+def test_quantile_sketch_relative_error_and_merge():
+    values = np.random.default_rng(1).lognormal(8, 1.5, size=20000)
+    values[:100] = 0
+    halves = [QuantileSketch(0.01), QuantileSketch(0.01)]
+    halves[0].add_array(values[:10000])
+    for value in values[10000:]:
+        halves[1].add(value)
+    sketch = halves[0].merge(halves[1])
+    assert sketch.count == len(values)
+    for q in (0.001, 0.5, 0.95, 0.99):
+        exact = np.sort(values)[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.01, abs=1e-9)
+    assert len(sketch.buckets) < 2000
+    assert QuantileSketch.from_dict(sketch.to_dict()) == sketch
+    with pytest.raises(ValueError):
+        sketch.merge(QuantileSketch(0.05))
+    with pytest.raises(ValueError):
+        sketch.add(-1)
+    assert QuantileSketch().quantile(0.5) is None
+
+def test_metrics_accumulator_from_entries_and_columns():
+    entries = [ProcessTableEntry(pid, "PR_DONE", start, end_time=start + 100 * pid, cpu_time=40 * pid)
+               for pid, start in enumerate([0, 10, 20, 30], start=1)]
+    streamed = MetricsAccumulator()
+    for entry in entries:
+        streamed.add_process(entry)
+    batched = MetricsAccumulator()
+    batched.add_columns({
+        'turnaround_time': np.array([100, 200, 300, 400]),
+        'cpu_time': np.array([40, 80, 120, 160]),
+        'io_time': np.zeros(4, dtype=np.int64),
+        'waiting_time': np.array([60, 120, 180, 240]),
+    })
+    summary, batched_summary = streamed.summary(), batched.summary()
+    assert set(summary) == set(PROCESS_METRICS)
+    for name in PROCESS_METRICS:
+        assert summary[name]['mean'] == pytest.approx(batched_summary[name]['mean'])
+        assert summary[name]['p50'] == pytest.approx(batched_summary[name]['p50'])
+    assert summary['turnaround_time']['mean'] == 250
+    assert summary['turnaround_time']['max'] == 400
+    assert summary['turnaround_time']['p50'] == pytest.approx(200, rel=0.01)
+    merged = MetricsAccumulator.merged([streamed, batched])
+    assert merged.count == 8
+    assert MetricsAccumulator.from_dict(merged.to_dict()) == merged
+
+def test_t_critical_value_and_confidence_interval():
+    # Two-sided Student t quantiles from standard tables
+    assert t_critical_value(0.95, 1) == pytest.approx(12.7062, abs=1e-3)
+    assert t_critical_value(0.95, 10) == pytest.approx(2.2281, abs=1e-3)
+    assert t_critical_value(0.99, 5) == pytest.approx(4.0321, abs=1e-3)
+    values = [10.0, 12.0, 11.0, 13.0, 9.0]
+    mean, half_width = confidence_interval(values)
+    assert mean == pytest.approx(11.0)
+    assert half_width == pytest.approx(2.7764 * np.std(values, ddof=1) / np.sqrt(5), rel=1e-3)
+    stats = RunningStats()
+    stats.add_array(np.array(values))
+    assert stats.half_width() == pytest.approx(half_width)
+    assert confidence_interval([5.0]) == (5.0, float('inf'))
@@ -0,0 +1,76 @@
+import random
+import pytest
+from models.multicore import MultiCoreOperatingSystemModel
+from models.operating_system import OperatingSystemModel
+from models.process import Process, CompactProcess
+from models.scheduler import multicore_scheduler, round_robin_scheduler
+
+def _build(instruction_lists, **kwargs):
+    os_model = MultiCoreOperatingSystemModel(**kwargs)
+    processes = {}
+    for pid, instructions in enumerate(instruction_lists, start=1):
+        processes[pid] = CompactProcess.from_instructions(pid, instructions)
+        os_model.add_process(pid, "PR_READY", 0)
+    return os_model, processes
+
+def test_processes_are_placed_round_robin_across_cores():
+    os_model, _ = _build([["ADD"]] * 5, num_cores=2)
+    assert [len(core.ready_queue) for core in os_model.cores] == [3, 2]
+    assert len(os_model.ready_list) == 5
+    assert os_model.migration_penalty == 2 * os_model.context_switch_penalty
+
+def test_single_core_matches_round_robin_scheduler():
+    rng = random.Random(4)
+    names = ["LOAD", "STORE", "ADD", "MUL"]
+    instruction_lists = [[rng.choice(names) for _ in range(rng.randint(1, 300))] for _ in range(5)]
+    os_model, processes = _build(instruction_lists, num_cores=1, quantum=100)
+    multicore_scheduler(os_model, processes, policy='rr', engine='fast')
+
+    expected = OperatingSystemModel(quantum=100)
+    expected_processes = {pid: Process(pid, instrs) for pid, instrs in enumerate(instruction_lists, start=1)}
+    for pid in expected_processes:
+        expected.add_process(pid, "PR_READY", 0)
+    round_robin_scheduler(expected, expected_processes)
+    assert os_model.current_time == expected.current_time
+    assert [e.end_time for e in os_model.process_table] == [e.end_time for e in expected.process_table]
+
+def test_fcfs_on_two_cores_and_metrics():
+    # Costs: 100, 10, 100, 10 -> core 0 runs processes 1 and 3, core 1 runs 2 and 4.
+    instruction_lists = [["LOAD"] * 10, ["LOAD"], ["LOAD"] * 10, ["LOAD"]]
+    os_model, processes = _build(instruction_lists, num_cores=2, context_switch_penalty=0)
+    multicore_scheduler(os_model, processes, policy='fcfs')
+    assert [e.end_time for e in os_model.process_table] == [100, 10, 200, 20]
+    metrics = os_model.metrics()
+    assert metrics['makespan'] == 200
+    assert metrics['core_utilization'] == [1.0, 0.1]
+    assert metrics['throughput'] == pytest.approx(4 * 1000 / 200)
+
+def test_work_stealing_balances_load():
+    instruction_lists = [["LOAD"] * 10, ["LOAD"], ["LOAD"] * 10, ["LOAD"], ["LOAD"] * 10, ["LOAD"]]
+    os_model, processes = _build(instruction_lists, num_cores=2, context_switch_penalty=0,
+                                 migration_penalty=5, work_stealing=True)
+    multicore_scheduler(os_model, processes, policy='fcfs')
+    # Core 1 finishes its short processes by t=30 and steals process 3 from
+    # core 0, so the makespan drops from 300 to 200.
+    assert os_model.cores[1].migrations == 1
+    assert os_model.process_table[2].end_time == 30 + 5 + 100
+    assert os_model.current_time == 200
+    assert all(entry.process_state == "PR_DONE" for entry in os_model.process_table)
+
+def test_work_stealing_round_robin_completes():
+    rng = random.Random(8)
+    instruction_lists = [["LOAD"] * rng.randint(1, 200) for _ in range(9)]
+    os_model, processes = _build(instruction_lists, num_cores=4, quantum=100, work_stealing=True)
+    multicore_scheduler(os_model, processes, policy='rr')
+    assert all(entry.process_state == "PR_DONE" for entry in os_model.process_table)
+    assert sum(core.busy_time for core in os_model.cores) == sum(e.cpu_time for e in os_model.process_table)
+
+def test_multicore_scheduler_rejects_unknown_policy():
+    os_model, processes = _build([["ADD"]], num_cores=2)
+    with pytest.raises(ValueError):
+        multicore_scheduler(os_model, processes, policy='sjf')
+
+def test_multicore_rejects_future_arrivals():
+    os_model = MultiCoreOperatingSystemModel(num_cores=2)
+    with pytest.raises(ValueError):
+        os_model.add_process(1, "PR_READY", 100)
@@ -1,5 +1,7 @@
 import pytest
 from models.operating_system import OperatingSystemModel
+from models.ready_queue import FIFOReadyQueue
+from models.device import Device
 
 def test_operating_system_initial_state():
     os_model = OperatingSystemModel()
@@ -31,4 +33,42 @@ def test_add_process_non_ready():
     assert len(os_model.ready_list) == 0
     entry = os_model.process_table[0]
     assert entry.process_state == "PR_CURR"
-    assert entry.start_time == 200 
\ No newline at end of file
+    assert entry.start_time == 200
+
+def test_use_ready_queue_moves_pending_entries():
+    os_model = OperatingSystemModel()
+    os_model.add_process(1, "PR_READY", 0)
+    os_model.add_process(2, "PR_READY", 0)
+    new_queue = FIFOReadyQueue()
+    os_model.use_ready_queue(new_queue)
+    assert os_model.ready_queue is new_queue
+    assert [entry.process_id for entry in os_model.ready_list] == [1, 2]
+
+def test_schedule_arrivals_moves_future_processes_to_calendar():
+    os_model = OperatingSystemModel()
+    os_model.add_process(1, "PR_READY", 0)
+    os_model.add_process(2, "PR_READY", 300)
+    os_model.schedule_arrivals()
+    assert [entry.process_id for entry in os_model.ready_list] == [1]
+    assert len(os_model.calendar) == 1
+    assert os_model.calendar.peek_time() == 300
+
+def test_io_requests_are_served_in_order():
+    os_model = OperatingSystemModel()
+    device = Device('disk', {'LOAD': 100, 'STORE': 200})
+    os_model.add_device(device)
+    assert os_model.io_devices == {'LOAD': device, 'STORE': device}
+    os_model.add_process(1, "PR_READY", 0)
+    os_model.add_process(2, "PR_READY", 0)
+    first, second = os_model.process_table
+    os_model.request_io(first, 'STORE')
+    os_model.request_io(second, 'LOAD')
+    assert first.process_state == second.process_state == "PR_WAIT"
+    assert device.current is first
+    assert os_model.calendar.peek_time() == 200
+    os_model.current_time = os_model.calendar.pop().time
+    assert os_model.complete_io(device) is first
+    assert device.current is second
+    assert os_model.calendar.peek_time() == 300
+    assert device.busy_time == 300
+    assert (first.io_time, second.io_time) == (200, 100)
@@ -2,7 +2,9 @@ import pytest
 import os
 import numpy as np
 from unittest.mock import patch, MagicMock
-from utils.parameter_sweep import run_simulation, perform_parameter_sweep, generate_charts
+from utils.metrics import MetricsAccumulator, PROCESS_METRICS
+from utils.parameter_sweep import (run_simulation, run_simulations, perform_parameter_sweep, generate_charts,
+                                   run_replicated, replicate_seed, group_results, DEFAULT_MAX_REPLICATES)
 
 def test_run_simulation():
     """Test that run_simulation correctly runs a simulation and returns metrics"""
@@ -117,4 +119,250 @@ def test_generate_charts(mock_figure, mock_savefig):
     
     # Check that each expected file was saved
     for file_path in expected_files:
-        assert any(call.args[0] == file_path for call in mock_savefig.call_args_list) 
\ No newline at end of file
+        assert any(call.args[0] == file_path for call in mock_savefig.call_args_list) 
+
+def test_run_simulation_is_reproducible_with_seed():
+    first = run_simulation(0.5, 100, num_processes=3, num_instructions=50, seed=11)
+    second = run_simulation(0.5, 100, num_processes=3, num_instructions=50, seed=11)
+    assert first == second
+
+def test_run_simulations_results_do_not_depend_on_jobs():
+    points = [
+        dict(cpu_probability=p, quantum=q, scheduler_type=s, num_processes=3, num_instructions=40, seed=i)
+        for i, (p, q, s) in enumerate([(0.2, 500, 'fcfs'), (0.2, 100, 'rr'), (0.8, 300, 'rr')])
+    ]
+    serial = run_simulations(points, jobs=1)
+    parallel = run_simulations(points, jobs=2)
+    assert serial == parallel
+
+def test_run_simulation_sjf_srtf():
+    for scheduler_type in ['sjf', 'srtf']:
+        metrics = run_simulation(0.5, 200, num_processes=3, num_instructions=30, scheduler_type=scheduler_type, seed=2)
+        assert len(metrics['processes']) == 3
+    with pytest.raises(ValueError):
+        run_simulation(0.5, 200, scheduler_type='lottery')
+
+def test_run_simulation_multicore_metrics():
+    metrics = run_simulation(0.5, 200, num_processes=4, num_instructions=30, scheduler_type='fcfs',
+                             seed=1, num_cores=2, work_stealing=True)
+    assert metrics['makespan'] == metrics['total_time']
+    assert len(metrics['core_utilization']) == 2
+    assert metrics['throughput'] > 0
+
+def test_run_simulation_with_arrivals():
+    metrics = run_simulation(0.5, 200, num_processes=5, num_instructions=30, seed=4, mean_interarrival=1000)
+    assert metrics == run_simulation(0.5, 200, num_processes=5, num_instructions=30, seed=4, mean_interarrival=1000)
+    assert all(p['waiting_time'] >= 0 for p in metrics['processes'])
+    with pytest.raises(ValueError):
+        run_simulation(0.5, 200, num_processes=4, num_cores=2, mean_interarrival=1000)
+
+def test_run_simulation_with_blocking_io():
+    metrics = run_simulation(0.5, 200, num_processes=4, num_instructions=40, seed=3,
+                             io_service_times={'LOAD': 100, 'STORE': 200})
+    assert sum(p['io_time'] for p in metrics['processes']) > 0
+    assert 0 < metrics['cpu_utilization'] < 1
+    assert 0 < metrics['device_utilization']['io'] <= 1
+    assert all(p['waiting_time'] >= 0 for p in metrics['processes'])
+
+def test_run_simulation_lazy_workload():
+    metrics = run_simulation(0.5, 200, num_processes=3, num_instructions=50, engine='fast', seed=9, lazy=True)
+    assert metrics == run_simulation(0.5, 200, num_processes=3, num_instructions=50, engine='step', seed=9, lazy=True)
+    assert len(metrics['processes']) == 3
+
+def test_run_simulation_columnar_table_gives_same_metrics():
+    for scheduler_type in ('rr', 'cfs'):
+        kwargs = dict(num_processes=5, num_instructions=40, scheduler_type=scheduler_type, seed=6)
+        assert run_simulation(0.5, 100, columnar=True, **kwargs) == run_simulation(0.5, 100, **kwargs)
+
+def test_run_simulation_streaming_summary():
+    for kwargs in (dict(), dict(scheduler_type='fcfs', engine='fast'), dict(num_cores=2, scheduler_type='rr')):
+        metrics = run_simulation(0.5, 100, num_processes=6, num_instructions=40, seed=5, **kwargs)
+        turnaround = [p['turnaround_time'] for p in metrics['processes']]
+        stats = metrics['accumulator'].stats['turnaround_time']
+        assert stats.count == 6
+        assert stats.mean == pytest.approx(np.mean(turnaround))
+        assert (stats.min, stats.max) == (min(turnaround), max(turnaround))
+    summary_only = run_simulation(0.5, 100, num_processes=6, num_instructions=40, seed=5, per_process=False)
+    assert 'processes' not in summary_only
+    assert summary_only['accumulator'] == run_simulation(0.5, 100, num_processes=6, num_instructions=40,
+                                                         seed=5)['accumulator']
+
+def test_run_simulations_uses_result_cache(tmp_path):
+    from utils.result_cache import ResultCache
+    points = [dict(cpu_probability=p, quantum=200, scheduler_type='rr', num_processes=3, num_instructions=30, seed=i)
+              for i, p in enumerate([0.2, 0.8])]
+    cache = ResultCache(str(tmp_path), version='test')
+    first = run_simulations(points, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+    with patch('utils.parameter_sweep.run_simulation') as mock_run_simulation:
+        second = run_simulations(points, jobs=2, cache=cache)
+    mock_run_simulation.assert_not_called()
+    assert second == first
+    assert cache.hits == 2
+
+def test_simulator_version_covers_batch_and_metrics_code():
+    from utils.parameter_sweep import simulator_version
+    version = simulator_version()
+    assert simulator_version() == version
+    for name in ('run_simulation', 'run_simulation_batch', '_collect_metrics'):
+        with patch(f'utils.parameter_sweep.{name}', test_simulator_version_covers_batch_and_metrics_code):
+            assert simulator_version() != version
+
+def test_run_simulations_resumes_from_results_file(tmp_path):
+    from utils.sweep_results import SweepResultsFile
+    points = [dict(cpu_probability=p, quantum=q, scheduler_type=s, num_processes=3, num_instructions=30, seed=1)
+              for p in (0.2, 0.8) for q, s in ((500, 'fcfs'), (100, 'rr'), (200, 'rr'))]
+    results_file = SweepResultsFile(str(tmp_path / 'sweep.jsonl'))
+    # An interrupted sweep that finished only its first two points
+    first = run_simulations(points[:2], results_file=results_file)
+    with patch('utils.parameter_sweep.run_simulation', side_effect=run_simulation) as mock_run_simulation:
+        results = run_simulations(points, results_file=results_file)
+    assert mock_run_simulation.call_count == len(points) - 2
+    assert results[:2] == first
+    assert results == run_simulations(points)
+    assert len(results_file.entries()) == len(points)
+
+def test_run_simulations_resumes_after_truncated_line(tmp_path):
+    from utils.sweep_results import SweepResultsFile
+    points = [dict(cpu_probability=0.5, quantum=q, scheduler_type='rr', num_processes=2, num_instructions=20, seed=4)
+              for q in (100, 200, 300)]
+    results_file = SweepResultsFile(str(tmp_path / 'sweep.jsonl'))
+    run_simulations(points[:1], results_file=results_file)
+    # The sweep was killed while writing its second point
+    with open(results_file.path, 'a') as f:
+        f.write('{"point": {"cpu_probability": 0.5, "qua')
+    results = run_simulations(points, results_file=results_file)
+    # Every resumed point survives the next reload
+    assert [metrics for _, metrics in results_file.entries()] == results
+
+@patch('utils.parameter_sweep.generate_charts')
+def test_generate_charts_from_file(mock_generate_charts, tmp_path):
+    from utils.parameter_sweep import generate_charts_from_file, group_results
+    from utils.sweep_results import SweepResultsFile
+    points = [dict(cpu_probability=p, quantum=q, scheduler_type=s, num_processes=2, num_instructions=20, seed=2)
+              for q, s in ((500, 'fcfs'), (100, 'rr'), (200, 'rr')) for p in (0.1, 0.7)]
+    results_file = SweepResultsFile(str(tmp_path / 'sweep.jsonl'))
+    results = run_simulations(points, results_file=results_file)
+    generate_charts_from_file(results_file.path)
+    cpu_probabilities, quanta, fcfs_results, rr_results = mock_generate_charts.call_args.args
+    assert cpu_probabilities.tolist() == [0.1, 0.7]
+    assert quanta.tolist() == [100, 200]
+    assert fcfs_results == results[:2]
+    assert rr_results[200] == results[4:]
+    with pytest.raises(ValueError):
+        group_results(points[:-1], results[:-1])
+
+def test_run_simulations_shared_workloads_give_same_results():
+    points = [dict(cpu_probability=p, quantum=q, scheduler_type=s, num_processes=3, num_instructions=60, seed=5,
+                   engine=engine)
+              for p in (0.3, 0.9) for q, s in ((500, 'fcfs'), (100, 'rr'), (300, 'rr')) for engine in ('step', 'fast')]
+    points.append(dict(points[0], seed=None))
+    shared = run_simulations(points, jobs=2, share_workloads=True)
+    assert shared[:-1] == run_simulations(points[:-1])
+
+@patch('utils.parameter_sweep.generate_charts')
+@patch('utils.parameter_sweep.run_simulation_batch')
+@patch('utils.parameter_sweep.run_simulation')
+def test_perform_parameter_sweep_shares_workload_per_probability(mock_run_simulation, mock_run_simulation_batch,
+                                                                 mock_generate_charts):
+    mock_run_simulation.return_value = {'total_time': 1000}
+    mock_run_simulation_batch.side_effect = lambda workload, quanta, **kwargs: [{'total_time': 1000}] * len(quanta)
+    with patch('os.makedirs'):
+        perform_parameter_sweep(seed=3)
+    # FCFS runs one point at a time; RR runs all quanta of a probability in one batch
+    fcfs_calls = [call.kwargs for call in mock_run_simulation.call_args_list]
+    batch_calls = mock_run_simulation_batch.call_args_list
+    assert len(batch_calls) == len(fcfs_calls)
+    workloads = {kwargs['cpu_probability']: kwargs['workload'] for kwargs in fcfs_calls}
+    for call in batch_calls:
+        workload, quanta = call.args
+        assert workloads[workload.cpu_probability].path == workload.path
+        assert list(quanta) == list(range(100, 1000, 100))
+    assert len({kwargs['seed'] for kwargs in fcfs_calls}) == len(fcfs_calls)
+
+def test_run_simulation_batch_matches_per_quantum_runs():
+    from utils.parameter_sweep import run_simulation_batch
+    from utils.process_generator import create_processes
+    quanta = [20, 50, 100, 300]
+    processes = create_processes(4, 80, 0.5, compact=True, rng=8)
+    batch = run_simulation_batch(processes, quanta)
+    assert all(proc.pc == 0 for proc in processes.values())
+    for quantum, metrics in zip(quanta, batch):
+        assert metrics == run_simulation(0.5, quantum, num_processes=4, num_instructions=80, seed=8)
+    assert run_simulation_batch(processes, quanta, columnar=True, per_process=False)[1] == \
+        run_simulation(0.5, 50, num_processes=4, num_instructions=80, seed=8, per_process=False)
+
+def test_run_replicated_stops_precise_points_early():
+    points = [dict(cpu_probability=0.5, quantum=500, num_processes=4, num_instructions=200, scheduler_type='rr',
+                   engine='fast', seed=3, per_process=False)]
+    # A loose target is met by the first replicates, a tight one runs up to the bound
+    loose = run_replicated(points, min_replicates=3, max_replicates=8, precision=0.5)[0]
+    tight = run_replicated(points, min_replicates=3, max_replicates=8, precision=0.001)[0]
+    assert loose['replicates'] == 3
+    assert loose['ci']['turnaround_time']['half_width'] <= 0.5 * loose['ci']['turnaround_time']['mean']
+    assert tight['replicates'] == 8
+    assert tight['accumulator'].count == 4 * 8
+    assert tight['ci']['turnaround_time']['half_width'] < loose['ci']['turnaround_time']['half_width']
+    assert run_replicated(points, min_replicates=2)[0]['replicates'] == 2
+    # A precision target alone allows up to DEFAULT_MAX_REPLICATES, starting from a single replicate
+    assert 2 <= run_replicated(points, min_replicates=1, precision=0.001)[0]['replicates'] == DEFAULT_MAX_REPLICATES
+    assert run_replicated(points, min_replicates=1, max_replicates=5, precision=0.5)[0]['replicates'] == 2
+    # Replicate 0 is the unreplicated run
+    single = run_simulation(**points[0])
+    first = run_replicated(points, min_replicates=1)[0]
+    assert first['total_time'] == single['total_time']
+    assert replicate_seed(3, 0) == 3 and replicate_seed(3, 1) != 3 and replicate_seed(None, 2) is None
+
+def test_group_results_combines_replicates():
+    points, results = [], []
+    for seed, total in ((1, 100), (2, 200)):
+        point = dict(cpu_probability=0.5, quantum=None, scheduler_type='fcfs', seed=seed)
+        accumulator = MetricsAccumulator()
+        accumulator.add_columns({name: np.array([total]) for name in PROCESS_METRICS})
+        points.append(point)
+        results.append({'total_time': total, 'accumulator': accumulator})
+    _, _, fcfs, _ = group_results(points, results)
+    assert fcfs[0]['replicates'] == 2
+    assert fcfs[0]['total_time'] == 150
+    assert fcfs[0]['ci']['turnaround_time']['mean'] == 150
+    assert fcfs[0]['ci']['total_time']['half_width'] > 0
+
+@patch('matplotlib.pyplot.fill_between')
+@patch('matplotlib.pyplot.savefig')
+def test_generate_charts_draws_confidence_bands(mock_savefig, mock_fill_between):
+    ci = {name: {'mean': 10.0, 'half_width': 1.0} for name in ('total_time', 'turnaround_time', 'waiting_time')}
+    result = {'total_time': 10, 'processes': [{'turnaround_time': 10, 'cpu_time': 5, 'waiting_time': 5}],
+              'ci': ci}
+    generate_charts(np.array([0.0, 0.5]), np.array([100, 500]), [result, result],
+                    {100: [result, result], 500: [result, result]})
+    # FCFS and two RR series on charts 1-3, two CPU probabilities on charts 4-6
+    assert mock_fill_between.call_count == 3 * 3 + 3 * 2
+    x, lower, upper = mock_fill_between.call_args.args
+    # The last band is the waiting time chart, centred on the plotted means
+    assert list(lower) == [4.0, 4.0] and list(upper) == [6.0, 6.0]
+
+def _chart_results():
+    def result(total):
+        return {'total_time': total, 'processes': [{'turnaround_time': total, 'cpu_time': 5, 'waiting_time': 5}]}
+    return (np.array([0.0, 0.5]), np.array([100, 500]), [result(10), result(20)],
+            {100: [result(11), result(21)], 500: [result(12), result(22)]})
+
+def test_generate_charts_renders_in_parallel_and_skips_unchanged(tmp_path):
+    import matplotlib.pyplot as plt
+    output_dir = str(tmp_path)
+    rendered = generate_charts(*_chart_results(), output_dir=output_dir, fmt='svg', dpi=50, jobs=2)
+    assert len(rendered) == 7
+    assert all(path.endswith('.svg') and os.path.getsize(path) > 0 for path in rendered)
+    # Rendering releases its figures
+    assert plt.get_fignums() == []
+    # Unchanged data is not rendered again; changed data, settings or missing files are
+    assert generate_charts(*_chart_results(), output_dir=output_dir, fmt='svg', dpi=50) == []
+    cpu_probabilities, quanta, fcfs_results, rr_results = _chart_results()
+    fcfs_results[0]['total_time'] = 15
+    assert generate_charts(cpu_probabilities, quanta, fcfs_results, rr_results, output_dir=output_dir,
+                           fmt='svg', dpi=50) == [os.path.join(output_dir, 'total_time_vs_cpu_prob.svg')]
+    os.remove(rendered[-1])
+    assert generate_charts(cpu_probabilities, quanta, fcfs_results, rr_results, output_dir=output_dir,
+                           fmt='svg', dpi=50) == [rendered[-1]]
+    assert len(generate_charts(cpu_probabilities, quanta, fcfs_results, rr_results, output_dir=output_dir,
+                               fmt='svg', dpi=60)) == 7
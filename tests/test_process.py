@@ -1,5 +1,8 @@
 import pytest
-from models.process import Process, INSTRUCTION_COSTS
+import numpy as np
+from models.process import Process, CompactProcess, MappedProcess, ChunkedProcess, StreamingProcess, RunLengthProcess, OPCODES, INSTRUCTION_COSTS, OPCODE_NAMES, UNKNOWN_OPCODE, STREAM_CACHE_CHUNKS, encode_instructions, decode_opcodes, block_prefix_costs
+from models.operating_system import OperatingSystemModel
+from models.scheduler import round_robin_scheduler
 
 def test_is_finished_empty():
     p = Process(1, [])
@@ -37,4 +40,128 @@ def test_execute_next_instruction():
     assert cost3 == INSTRUCTION_COSTS["STORE"]
     # Now the process should be finished so further execution returns 0.
     cost4 = p.execute_next_instruction()
-    assert cost4 == 0 
\ No newline at end of file
+    assert cost4 == 0
+
+def test_encode_decode_round_trip():
+    instructions = ["LOAD", "STORE", "ADD", "SUB", "MUL", "DIV"]
+    opcodes = encode_instructions(instructions)
+    assert opcodes.dtype == np.uint8
+    assert decode_opcodes(opcodes) == instructions
+
+def test_compact_process_matches_string_process():
+    instructions = ["LOAD", " ADD ", "FOO", "STORE", "MUL"]
+    p = Process(1, instructions)
+    c = CompactProcess.from_instructions(1, instructions)
+    assert len(c.instructions) == len(instructions)
+    while not p.is_finished():
+        assert c.peek_next_instruction_cost() == p.peek_next_instruction_cost()
+        assert c.execute_next_instruction() == p.execute_next_instruction()
+    assert c.is_finished() is True
+    assert c.execute_next_instruction() == 0
+
+def test_compact_process_range_and_remaining_cost():
+    c = CompactProcess.from_instructions(1, ["LOAD", "ADD", "STORE", "DIV"])
+    assert c.remaining_cost() == 36
+    assert c.range_cost(1, 3) == 21
+    c.execute_next_instruction()
+    assert c.remaining_cost() == 26
+
+def test_compact_process_instructions_round_trip_unknown():
+    instructions = ["LOAD", "FOO", "ADD"]
+    c = CompactProcess.from_instructions(1, instructions)
+    assert c.instructions == instructions
+    assert c.instructions is c.instructions  # decoded once and cached
+    # Without the original strings, unknown opcodes decode to 'UNKNOWN'.
+    assert CompactProcess(2, c.opcodes).instructions == ["LOAD", "UNKNOWN", "ADD"]
+
+def test_compact_process_rejects_invalid_opcodes():
+    with pytest.raises(ValueError):
+        CompactProcess(1, [0, UNKNOWN_OPCODE + 1])
+
+def test_mapped_process_matches_compact_process():
+    rng = np.random.default_rng(8)
+    opcodes = rng.integers(0, UNKNOWN_OPCODE + 1, size=500).astype(np.uint8)
+    for block_size in (1, 7, 64, 4096):
+        compact = CompactProcess(1, opcodes)
+        mapped = MappedProcess(1, opcodes, block_size=block_size)
+        assert mapped.block_costs.tolist() == block_prefix_costs(opcodes, block_size).tolist()
+        assert mapped.remaining_cost() == compact.remaining_cost()
+        while not compact.is_finished():
+            budget = int(rng.integers(0, 60))
+            assert mapped.execute_slice(budget) == compact.execute_slice(budget)
+            assert mapped.pc == compact.pc
+            if budget == 0:
+                assert mapped.execute_next_instruction() == compact.execute_next_instruction()
+        assert mapped.is_finished()
+
+def test_block_prefix_costs():
+    opcodes = encode_instructions(["LOAD", "STORE", "ADD", "MUL", "DIV"])
+    assert block_prefix_costs(opcodes, 2).tolist() == [0, 30, 36, 41]
+    assert block_prefix_costs(opcodes[:4], 2).tolist() == [0, 30, 36]
+    assert block_prefix_costs(opcodes[:0], 2).tolist() == [0]
+
+def test_streaming_process_matches_compact_process(tmp_path):
+    rng = np.random.default_rng(4)
+    names = [OPCODE_NAMES[opcode] for opcode in rng.integers(0, UNKNOWN_OPCODE, size=300)]
+    path = tmp_path / "process.txt"
+    path.write_text("\n".join(names[:100]) + "\n\n" + "\n".join(names[100:]) + "\n")
+    compact = CompactProcess.from_instructions(1, names)
+    streaming = StreamingProcess(1, str(path), chunk_size=16)
+    assert streaming.instructions == names
+    assert streaming.remaining_cost() == compact.remaining_cost()
+    while not compact.is_finished():
+        budget = int(rng.integers(0, 60))
+        assert streaming.execute_slice(budget) == compact.execute_slice(budget)
+        assert streaming.pc == compact.pc
+        if budget == 0:
+            assert streaming.execute_next_instruction() == compact.execute_next_instruction()
+        # Only a bounded number of chunks stays in memory
+        assert streaming.resident_chunks <= STREAM_CACHE_CHUNKS
+    assert streaming.is_finished()
+
+def test_streaming_process_runs_in_scheduler(tmp_path):
+    path = tmp_path / "process.txt"
+    path.write_text("LOAD\nADD\n" * 1000)
+    processes = {1: StreamingProcess(1, str(path), chunk_size=64)}
+    os_model = OperatingSystemModel(quantum=100)
+    os_model.add_process(1, "PR_READY", 0)
+    round_robin_scheduler(os_model, processes, engine='fast')
+    assert os_model.process_table[0].cpu_time == 11000
+
+def test_run_length_process_matches_compact_process():
+    rng = np.random.default_rng(6)
+    opcodes = np.repeat(rng.integers(0, UNKNOWN_OPCODE + 1, size=60), rng.integers(1, 15, size=60)).astype(np.uint8)
+    compact = CompactProcess(1, opcodes)
+    rle = RunLengthProcess.from_opcodes(1, opcodes)
+    assert len(rle.run_lengths) < len(opcodes)
+    assert rle.remaining_cost() == compact.remaining_cost()
+    while not compact.is_finished():
+        budget = int(rng.integers(0, 60))
+        assert rle.execute_slice(budget) == compact.execute_slice(budget)
+        assert rle.pc == compact.pc
+        if budget == 0:
+            assert rle.peek_next_instruction_cost() == compact.peek_next_instruction_cost()
+            assert rle.execute_next_instruction() == compact.execute_next_instruction()
+    assert rle.is_finished()
+
+def test_run_length_process_consumes_partial_run():
+    rle = RunLengthProcess(1, [OPCODES['LOAD'], OPCODES['ADD']], [100, 3])
+    assert rle.execute_slice(255) == 250
+    assert rle.pc == 25
+    assert rle.execute_slice(10000) == 750 + 3
+    assert rle.is_finished()
+
+def test_run_length_process_round_trip_and_validation():
+    instructions = ["LOAD", "LOAD", "FOO", "ADD", "ADD", "ADD"]
+    rle = RunLengthProcess.from_instructions(1, instructions)
+    assert rle.run_lengths.tolist() == [2, 1, 3]
+    assert rle.instructions == instructions
+    assert rle.instruction_positions({'ADD'}) == [3, 4, 5]
+    with pytest.raises(ValueError):
+        RunLengthProcess(1, [0, 1], [3])
+    with pytest.raises(ValueError):
+        RunLengthProcess(1, [UNKNOWN_OPCODE + 1], [3])
+
+def test_chunked_process_requires_a_chunk_reader():
+    with pytest.raises(TypeError):
+        ChunkedProcess(1, 10, block_prefix_costs(np.zeros(10, dtype=np.uint8)))
@@ -1,6 +1,7 @@
 import pytest
-from utils.process_generator import generate_instructions, create_process
-from models.process import INSTRUCTION_COSTS
+import numpy as np
+from utils.process_generator import generate_instructions, generate_opcode_batch, generate_arrival_times, create_process, create_processes, LazyProcess, SharedWorkload
+from models.process import INSTRUCTION_COSTS, CompactProcess, decode_opcodes
 
 def test_generate_instructions_all_cpu():
     """Test that generate_instructions produces only CPU instructions when probability is 1.0"""
@@ -62,4 +63,94 @@ def test_create_process():
     
     assert process.process_id == process_id
     assert len(process.instructions) == num_instructions
-    assert process.pc == 0  # Program counter starts at 0 
\ No newline at end of file
+    assert process.pc == 0  # Program counter starts at 0
+
+def test_create_compact_process():
+    process = create_process(7, 50, 0.5, compact=True)
+    assert isinstance(process, CompactProcess)
+    assert len(process.opcodes) == 50
+    assert process.remaining_cost() == sum(INSTRUCTION_COSTS[i] for i in process.instructions)
+
+def test_generate_opcode_batch_shape_and_reproducibility():
+    batch = generate_opcode_batch(4, 200, 0.5, rng=3)
+    assert batch.shape == (4, 200)
+    assert batch.dtype == np.uint8
+    assert np.array_equal(batch, generate_opcode_batch(4, 200, 0.5, rng=3))
+
+def test_generate_opcode_batch_extremes():
+    assert set(decode_opcodes(generate_opcode_batch(2, 500, 1.0, rng=1).ravel())) == {'ADD', 'SUB', 'MUL', 'DIV'}
+    assert set(decode_opcodes(generate_opcode_batch(2, 500, 0.0, rng=1).ravel())) == {'LOAD', 'STORE'}
+
+def test_create_processes_compact_batch():
+    processes = create_processes(3, 20, 0.4, compact=True, rng=5)
+    assert list(processes) == [1, 2, 3]
+    assert all(isinstance(proc, CompactProcess) for proc in processes.values())
+    strings = create_processes(3, 20, 0.4, rng=5)
+    assert [p.instructions for p in strings.values()] == [p.instructions for p in processes.values()]
+
+def test_generate_arrival_times():
+    arrivals = generate_arrival_times(1000, 250, rng=5)
+    assert arrivals[0] == 0
+    assert np.all(np.diff(arrivals) >= 0)
+    assert 200 < arrivals[-1] / 999 < 300
+    assert np.array_equal(arrivals, generate_arrival_times(1000, 250, rng=5))
+
+def test_lazy_process_is_reproducible_from_seed():
+    proc = LazyProcess(1, 12345, 0.5, 1000, block_size=64)
+    assert proc.resident_chunks == 0
+    full = proc.materialize()
+    assert isinstance(full, CompactProcess)
+    assert len(full.opcodes) == 1000
+    assert full.instructions == LazyProcess(1, 12345, 0.5, 1000, block_size=64).instructions
+    assert not np.array_equal(full.opcodes[:64], full.opcodes[64:128])
+    # Blocks can be generated in any order: start in block 3
+    again = LazyProcess(1, 12345, 0.5, 1000, block_size=64)
+    again.pc = 192
+    block = []
+    for _ in range(64):
+        block.append(again.peek_next_instruction())
+        again.execute_next_instruction()
+    assert block == full.instructions[192:256]
+    assert proc.remaining_cost() == full.remaining_cost()
+
+def test_lazy_process_matches_materialized_process():
+    proc = LazyProcess(1, 7, 0.3, 5000, block_size=128)
+    full = proc.materialize()
+    rng = np.random.default_rng(1)
+    while not full.is_finished():
+        budget = int(rng.integers(1, 400))
+        assert proc.execute_slice(budget) == full.execute_slice(budget)
+        assert proc.pc == full.pc
+        assert proc.resident_chunks <= 2
+    assert proc.is_finished()
+
+def test_lazy_process_generates_cost_index_on_demand():
+    proc = LazyProcess(1, 3, 0.5, 10000, block_size=100)
+    proc.execute_slice(500)
+    assert proc.indexed_blocks < 10
+    proc.execute_remaining()
+    assert proc.is_finished()
+
+def test_create_processes_lazy():
+    processes = create_processes(3, 500, 1.0, rng=2, lazy=True)
+    assert [proc.process_id for proc in processes.values()] == [1, 2, 3]
+    assert all(isinstance(proc, LazyProcess) for proc in processes.values())
+    assert len({proc.seed for proc in processes.values()}) == 3
+    assert all(instr in ['ADD', 'SUB', 'MUL', 'DIV'] for instr in processes[1].instructions)
+    again = create_processes(3, 500, 1.0, rng=2, lazy=True)
+    assert [proc.seed for proc in again.values()] == [proc.seed for proc in processes.values()]
+
+def test_shared_workload_matches_create_processes(tmp_path):
+    import pickle
+    workload = SharedWorkload.create(str(tmp_path), 3, 500, 0.4, rng=12)
+    # Workers receive only the small description
+    workload = pickle.loads(pickle.dumps(workload))
+    shared = workload.processes()
+    generated = create_processes(3, 500, 0.4, compact=True, rng=12)
+    assert list(shared) == [1, 2, 3]
+    for process_id, proc in shared.items():
+        assert np.array_equal(proc.opcodes, generated[process_id].opcodes)
+        assert not proc.opcodes.flags.owndata
+        assert proc.execute_slice(1000) == generated[process_id].execute_slice(1000)
+    assert isinstance(workload.opcodes(), np.memmap)
+    assert SharedWorkload.create(str(tmp_path), 1, 10, 0.5).path != workload.path
@@ -0,0 +1,63 @@
+import pytest
+import numpy as np
+from models.process_table import ProcessTable, ProcessTableRow, PROCESS_STATES, process_time_columns
+from models.process_table_entry import ProcessTableEntry, DEFAULT_WEIGHT
+from models.operating_system import OperatingSystemModel
+from models.process import Process
+from models.scheduler import round_robin_scheduler
+
+def test_rows_read_and_write_columns():
+    table = ProcessTable(capacity=1)
+    row = table.add(7, "PR_READY", 100)
+    assert isinstance(row, ProcessTableRow)
+    assert (row.process_id, row.process_state, row.start_time) == (7, "PR_READY", 100)
+    assert row.end_time is None
+    assert row.cpu_time == 0
+    assert row.weight == DEFAULT_WEIGHT
+    row.cpu_time += 25
+    row.end_time = 300
+    row.process_state = "PR_DONE"
+    assert table.cpu_time.tolist() == [25]
+    assert table.end_time.tolist() == [300]
+    assert PROCESS_STATES[table.state[0]] == "PR_DONE"
+    with pytest.raises(AttributeError):
+        row.color = "red"
+
+def test_table_grows_and_behaves_like_a_list():
+    table = ProcessTable(capacity=2)
+    rows = [table.add(pid, "PR_READY", pid * 10) for pid in range(1, 101)]
+    assert len(table) == 100
+    assert table[0] is rows[0]
+    assert table[-1].process_id == 100
+    assert [row.process_id for row in table] == list(range(1, 101))
+    assert table.start_time.tolist() == [pid * 10 for pid in range(1, 101)]
+    with pytest.raises(ValueError):
+        table.add(101, "PR_SLEEPING", 0)
+
+def test_vectorized_times_match_entries():
+    table = ProcessTable()
+    entries = []
+    for pid, (start, end, cpu) in enumerate([(0, 50, 30), (10, 90, 40), (20, 60, 5)], start=1):
+        row = table.add(pid, "PR_READY", start)
+        row.end_time, row.cpu_time = end, cpu
+        entry = ProcessTableEntry(pid, "PR_READY", start, end_time=end, cpu_time=cpu)
+        entries.append(entry)
+    assert table.turnaround_times().tolist() == [50, 80, 40]
+    assert table.waiting_times().tolist() == [20, 40, 35]
+    columnar, listed = process_time_columns(table), process_time_columns(entries)
+    for name in columnar:
+        assert np.array_equal(columnar[name], listed[name])
+
+def test_scheduler_runs_on_columnar_table():
+    instruction_lists = [["LOAD", "STORE"] * 20, ["ADD"] * 30, ["MUL", "LOAD"] * 10]
+    results = []
+    for columnar in (False, True):
+        os_model = OperatingSystemModel(quantum=50, columnar=columnar)
+        processes = {pid: Process(pid, instrs) for pid, instrs in enumerate(instruction_lists, start=1)}
+        for pid in processes:
+            os_model.add_process(pid, "PR_READY", 0)
+        round_robin_scheduler(os_model, processes)
+        results.append([(e.end_time, e.cpu_time, e.process_state) for e in os_model.process_table])
+    assert results[0] == results[1]
+    assert isinstance(os_model.process_table, ProcessTable)
+    assert os_model.metrics()['throughput'] > 0
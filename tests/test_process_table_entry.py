@@ -1,5 +1,5 @@
 import pytest
-from models.process_table_entry import ProcessTableEntry
+from models.process_table_entry import ProcessTableEntry, DEFAULT_WEIGHT
 
 def test_process_table_entry_initialization():
     # Test basic initialization
@@ -56,4 +56,9 @@ def test_process_table_entry_waiting_time():
     
     turnaround_time = process.end_time - process.start_time
     waiting_time = turnaround_time - process.cpu_time
-    assert waiting_time == 150 
\ No newline at end of file
+    assert waiting_time == 150
+
+def test_process_table_entry_default_weight():
+    process = ProcessTableEntry(process_id=5, process_state="PR_READY", start_time=0)
+    assert process.weight == DEFAULT_WEIGHT
+    assert process.vruntime == 0
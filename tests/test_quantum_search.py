@@ -0,0 +1,52 @@
+import pytest
+from unittest.mock import patch
+from utils.parameter_sweep import run_simulation
+from utils.quantum_search import find_best_quantum, objective_value, perform_quantum_search
+
+def dense_best(cpu_probability, quanta, objective, **kwargs):
+    values = {q: objective_value(run_simulation(cpu_probability, q, scheduler_type='rr', engine='fast',
+                                                per_process=False, **kwargs), objective)
+              for q in quanta}
+    return min(values, key=lambda q: (values[q], q)), values
+
+@pytest.mark.parametrize('method', ['golden', 'grid'])
+def test_find_best_quantum_matches_dense_grid(method):
+    kwargs = dict(num_processes=4, num_instructions=400, seed=2)
+    result = find_best_quantum(0.5, lower=20, upper=200, tolerance=1, objective='waiting_time', method=method,
+                               **kwargs)
+    best, values = dense_best(0.5, range(20, 201), 'waiting_time', **kwargs)
+    assert len(result.trace) < len(values) / 4
+    assert len({quantum for quantum, _ in result.trace}) == len(result.trace)
+    for quantum, value in result.trace:
+        assert value == pytest.approx(values[quantum])
+    assert result.best_value == pytest.approx(values[result.best_quantum])
+    assert result.best_value <= values[best] * 1.05
+
+def test_find_best_quantum_validates_arguments():
+    with pytest.raises(ValueError):
+        find_best_quantum(0.5, method='annealing')
+    with pytest.raises(ValueError):
+        find_best_quantum(0.5, lower=500, upper=100)
+    with pytest.raises(ValueError):
+        objective_value({'total_time': 1}, 'latency')
+    # CPU time does not depend on the quantum, so it is no objective
+    with pytest.raises(ValueError):
+        find_best_quantum(0.5, objective='cpu_time')
+
+@patch('utils.quantum_search.plt')
+def test_perform_quantum_search(mock_plt):
+    def small_search(cpu_probability, **kwargs):
+        return find_best_quantum(cpu_probability, num_processes=2, num_instructions=50, **kwargs)
+    with patch('utils.quantum_search.find_best_quantum', side_effect=small_search), \
+            patch('utils.quantum_search.os.makedirs'):
+        results = perform_quantum_search(objective='total_time', method='grid', tolerance=50)
+    assert list(results) == [round(0.1 * i, 1) for i in range(10)]
+    mock_plt.savefig.assert_called_once_with('output/quantum_search.png', dpi=300, bbox_inches='tight')
+
+@patch('utils.quantum_search.plt')
+def test_plot_quantum_search_uses_chart_settings(mock_plt):
+    from utils.quantum_search import plot_quantum_search, QuantumSearchResult
+    mock_plt.plot.return_value = [mock_plt.line]
+    results = {0.5: QuantumSearchResult(200, 10.0, [(100, 12.0), (200, 10.0)])}
+    assert plot_quantum_search(results, dpi=100, fmt='svg') == 'output/quantum_search.svg'
+    mock_plt.savefig.assert_called_once_with('output/quantum_search.svg', dpi=100, bbox_inches='tight')
@@ -0,0 +1,86 @@
+import pytest
+from models.ready_queue import ReadyQueue, FIFOReadyQueue, HeapReadyQueue, MultiLevelReadyQueue, FairReadyQueue
+from models.process_table_entry import ProcessTableEntry
+
+def test_fifo_ready_queue_order():
+    queue = FIFOReadyQueue()
+    entries = [ProcessTableEntry(i, "PR_READY", 0) for i in range(3)]
+    for entry in entries:
+        queue.enqueue(entry)
+    assert len(queue) == 3
+    assert list(queue) == entries
+    assert queue.peek() is entries[0]
+    assert [queue.dequeue() for _ in range(3)] == entries
+    assert not queue
+
+def test_ready_queue_interface_is_abstract():
+    queue = ReadyQueue()
+    with pytest.raises(NotImplementedError):
+        queue.enqueue(ProcessTableEntry(1, "PR_READY", 0))
+    with pytest.raises(NotImplementedError):
+        queue.dequeue()
+
+def test_heap_ready_queue_orders_by_key_with_lazy_updates():
+    keys = {1: 30, 2: 10, 3: 20}
+    queue = HeapReadyQueue(key=lambda entry: keys[entry.process_id])
+    entries = {pid: ProcessTableEntry(pid, "PR_READY", 0) for pid in keys}
+    for entry in entries.values():
+        queue.enqueue(entry)
+    assert queue.peek().process_id == 2
+    # Re-key process 2 so it is no longer the shortest; its old item goes stale.
+    keys[2] = 40
+    queue.update(entries[2])
+    assert len(queue) == 3
+    assert [queue.dequeue().process_id for _ in range(3)] == [3, 1, 2]
+    assert not queue
+
+def test_heap_ready_queue_remove():
+    queue = HeapReadyQueue(key=lambda entry: entry.process_id)
+    entries = [ProcessTableEntry(pid, "PR_READY", 0) for pid in range(3)]
+    for entry in entries:
+        queue.enqueue(entry)
+    queue.remove(entries[0])
+    assert list(sorted(e.process_id for e in queue)) == [1, 2]
+    assert queue.dequeue() is entries[1]
+
+def test_multi_level_ready_queue_serves_highest_level_first():
+    queue = MultiLevelReadyQueue(num_levels=3)
+    entries = [ProcessTableEntry(pid, "PR_READY", 0) for pid in range(4)]
+    queue.set_level(entries[0], 2)
+    queue.set_level(entries[1], 1)
+    queue.set_level(entries[3], 5)  # clamped to the lowest level
+    for entry in entries:
+        queue.enqueue(entry)
+    assert queue.level_of(entries[3]) == 2
+    assert [queue.dequeue().process_id for _ in range(4)] == [2, 1, 0, 3]
+    assert not queue
+    with pytest.raises(IndexError):
+        queue.dequeue()
+
+def test_multi_level_ready_queue_boost():
+    queue = MultiLevelReadyQueue(num_levels=3)
+    entries = [ProcessTableEntry(pid, "PR_READY", 0) for pid in range(3)]
+    for level, entry in zip([2, 1, 0], entries):
+        queue.set_level(entry, level)
+        queue.enqueue(entry)
+    queue.boost()
+    assert all(queue.level_of(entry) == 0 for entry in entries)
+    assert len(queue) == 3
+    assert queue.peek() is entries[2]
+
+def test_fair_ready_queue_picks_smallest_vruntime():
+    queue = FairReadyQueue()
+    entries = [ProcessTableEntry(pid, "PR_READY", 0, weight=w) for pid, w in [(1, 1024), (2, 2048), (3, 512)]]
+    for entry, vruntime in zip(entries, [30, 10, 20]):
+        entry.vruntime = vruntime
+        queue.enqueue(entry)
+    assert queue.total_weight == 1024 + 2048 + 512
+    assert queue.peek() is entries[1]
+    assert queue.dequeue() is entries[1]
+    assert queue.min_vruntime == 10
+    assert queue.total_weight == 1024 + 512
+    # A newly queued entry starts no earlier than min_vruntime.
+    newcomer = ProcessTableEntry(4, "PR_READY", 0)
+    queue.enqueue(newcomer)
+    assert newcomer.vruntime == 10
+    assert [queue.dequeue().process_id for _ in range(3)] == [4, 3, 1]
@@ -0,0 +1,48 @@
+import os
+import time
+import numpy as np
+from utils.result_cache import ResultCache, code_version
+
+def test_put_get_and_keys(tmp_path):
+    cache = ResultCache(str(tmp_path), version='v1')
+    params = dict(cpu_probability=0.5, quantum=100, seed=3)
+    assert cache.get(params) is None
+    cache.put(params, {'total_time': 42})
+    assert cache.get(params) == {'total_time': 42}
+    assert (cache.hits, cache.misses) == (1, 1)
+    # NumPy scalars and key order do not change the key
+    assert cache.key(dict(seed=3, quantum=np.int64(100), cpu_probability=np.float64(0.5))) == cache.key(params)
+    assert cache.key(dict(params, quantum=200)) != cache.key(params)
+    # A new code version does not see old results
+    assert ResultCache(str(tmp_path), version='v2').get(params) is None
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+
+def test_lru_eviction(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=10 ** 9, version='v1')
+    payload = b'x' * 1000
+    for i in range(3):
+        cache.put({'i': i}, payload)
+    entry_size = cache.size() // 3
+    # Make entry 0 the most recently used
+    paths = sorted(os.listdir(tmp_path))
+    past = time.time() - 100
+    for name in paths:
+        os.utime(os.path.join(tmp_path, name), (past, past))
+    assert cache.get({'i': 0}) == payload
+    cache.max_bytes = 2 * entry_size
+    cache.put({'i': 3}, payload)
+    assert len(cache) == 2
+    assert cache.get({'i': 0}) == payload
+    assert cache.get({'i': 3}) == payload
+    assert cache.get({'i': 1}) is None and cache.get({'i': 2}) is None
+
+def test_code_version_tracks_sources(tmp_path):
+    module = tmp_path / 'sim.py'
+    module.write_text('x = 1\n')
+    version = code_version(root=str(tmp_path), sources=('sim.py',))
+    assert version == code_version(root=str(tmp_path), sources=('sim.py',))
+    assert version != code_version(root=str(tmp_path), sources=('sim.py',), extra=['def f(): pass'])
+    module.write_text('x = 2\n')
+    assert version != code_version(root=str(tmp_path), sources=('sim.py',))
@@ -1,6 +1,10 @@
-from models.scheduler import fcfs_scheduler, round_robin_scheduler
+import random
+import pytest
+from models.scheduler import fcfs_scheduler, round_robin_scheduler, sjf_scheduler, srtf_scheduler, mlfq_scheduler, cfs_scheduler, round_robin_batch
 from models.operating_system import OperatingSystemModel
-from models.process import Process
+from models.process import Process, CompactProcess, RunLengthProcess
+from models.ready_queue import FIFOReadyQueue
+from models.device import Device
 
 def test_fcfs_scheduler():
     # Create an OS model and two dummy processes:
@@ -86,4 +90,348 @@ def test_round_robin_scheduler_multiple_processes():
             assert entry.end_time == 54
             assert entry.process_state == "PR_DONE"
 
-    assert os_model.current_time == 54 
\ No newline at end of file
+    assert os_model.current_time == 54
+
+def _run_round_robin(instruction_lists, quantum, engine, compact):
+    os_model = OperatingSystemModel(quantum=quantum)
+    processes = {}
+    for pid, instructions in enumerate(instruction_lists, start=1):
+        if compact:
+            processes[pid] = CompactProcess.from_instructions(pid, instructions)
+        else:
+            processes[pid] = Process(pid, instructions)
+        os_model.add_process(pid, "PR_READY", os_model.current_time)
+    round_robin_scheduler(os_model, processes, engine=engine)
+    return os_model
+
+def test_round_robin_fast_engine_matches_step_engine():
+    # Includes zero-cost unknown instructions to exercise exact quantum boundaries.
+    rng = random.Random(7)
+    names = ["LOAD", "STORE", "ADD", "SUB", "MUL", "DIV", "NOP"]
+    instruction_lists = [[rng.choice(names) for _ in range(rng.randint(0, 300))] for _ in range(6)]
+    for quantum in [20, 21, 37, 100, 500]:
+        expected = _run_round_robin(instruction_lists, quantum, 'step', compact=False)
+        actual = _run_round_robin(instruction_lists, quantum, 'fast', compact=True)
+        assert actual.current_time == expected.current_time
+        for got, want in zip(actual.process_table, expected.process_table):
+            assert got.cpu_time == want.cpu_time
+            assert got.end_time == want.end_time
+            assert got.process_state == "PR_DONE"
+
+def test_execute_slice_stops_when_budget_is_exhausted():
+    # Stepping stops as soon as the quantum is used up, even before zero-cost instructions.
+    instructions = ["ADD", "NOP", "LOAD", "NOP", "NOP", "ADD"]
+    for budget in range(0, 15):
+        stepped = Process(1, instructions)
+        compact = CompactProcess.from_instructions(1, instructions)
+        assert compact.execute_slice(budget) == stepped.execute_slice(budget)
+        assert compact.pc == stepped.pc
+
+def test_fcfs_fast_engine_matches_step_engine():
+    instruction_lists = [["LOAD", "ADD", "STORE"], [], ["MUL", "FOO", "DIV", "STORE"]]
+    results = []
+    for engine, cls in [('step', Process), ('fast', CompactProcess.from_instructions)]:
+        os_model = OperatingSystemModel()
+        processes = {pid: cls(pid, instrs) for pid, instrs in enumerate(instruction_lists, start=1)}
+        for pid in processes:
+            os_model.add_process(pid, "PR_READY", os_model.current_time)
+        fcfs_scheduler(os_model, processes, engine=engine)
+        results.append([(e.cpu_time, e.end_time, e.process_state) for e in os_model.process_table] + [os_model.current_time])
+    assert results[0] == results[1]
+
+def test_schedulers_reject_unknown_engine():
+    os_model = OperatingSystemModel()
+    with pytest.raises(ValueError):
+        fcfs_scheduler(os_model, {}, engine='FAST')
+    with pytest.raises(ValueError):
+        round_robin_scheduler(os_model, {}, engine='slow')
+
+def test_fcfs_fast_engine_scales_to_many_processes():
+    # 100k processes: the closed form must not depend on per-instruction work.
+    os_model = OperatingSystemModel(context_switch_penalty=20)
+    processes = {}
+    for pid in range(1, 100001):
+        processes[pid] = CompactProcess(pid, [0, 2])  # LOAD + ADD = 11 ns
+        os_model.add_process(pid, "PR_READY", 0)
+    fcfs_scheduler(os_model, processes, engine='fast')
+    assert os_model.current_time == 100000 * 11 + 99999 * 20
+    last = os_model.process_table[-1]
+    assert last.end_time == os_model.current_time
+    assert last.cpu_time == 11
+    assert all(proc.is_finished() for proc in processes.values())
+
+def test_round_robin_dispatches_through_ready_queue():
+    class RecordingQueue(FIFOReadyQueue):
+        def __init__(self):
+            super().__init__()
+            self.dispatched = []
+
+        def dequeue(self):
+            entry = super().dequeue()
+            self.dispatched.append(entry.process_id)
+            return entry
+
+    queue = RecordingQueue()
+    os_model = OperatingSystemModel(quantum=20, context_switch_penalty=0, ready_queue=queue)
+    processes = {1: Process(1, ["LOAD", "LOAD", "LOAD"]), 2: Process(2, ["STORE"])}
+    for pid in processes:
+        os_model.add_process(pid, "PR_READY", 0)
+    round_robin_scheduler(os_model, processes)
+    assert queue.dispatched == [1, 2, 1]
+    assert not os_model.ready_queue
+
+def test_sjf_scheduler_runs_shortest_job_first():
+    os_model = OperatingSystemModel(context_switch_penalty=0)
+    # Costs: 1 -> 30 ns, 2 -> 1 ns, 3 -> 10 ns
+    processes = {1: Process(1, ["STORE", "LOAD"]), 2: Process(2, ["ADD"]), 3: Process(3, ["LOAD"])}
+    for pid in processes:
+        os_model.add_process(pid, "PR_READY", 0)
+    sjf_scheduler(os_model, processes)
+    end_times = {entry.process_id: entry.end_time for entry in os_model.process_table}
+    assert end_times == {2: 1, 3: 11, 1: 41}
+    assert os_model.current_time == 41
+
+def test_srtf_scheduler_preempts_on_shorter_arrival():
+    os_model = OperatingSystemModel(context_switch_penalty=5)
+    # Process 1 costs 100 ns; process 2 (cost 10 ns) arrives at t=25.
+    processes = {1: CompactProcess.from_instructions(1, ["LOAD"] * 10), 2: Process(2, ["LOAD"])}
+    os_model.add_process(1, "PR_READY", 0)
+    os_model.add_process(2, "PR_READY", 25)
+    srtf_scheduler(os_model, processes, engine='fast')
+    entries = {entry.process_id: entry for entry in os_model.process_table}
+    # Process 1 runs to t=30 (the LOAD in flight at t=25 completes), then
+    # process 2 runs 35-45 after a switch, then process 1 resumes at 50.
+    assert entries[2].end_time == 45
+    assert entries[1].end_time == 50 + 70
+    assert entries[1].cpu_time == 100
+    # Non-preemptive SJF lets process 1 finish first.
+    for proc in processes.values():
+        proc.pc = 0
+    os_model = OperatingSystemModel(context_switch_penalty=5)
+    os_model.add_process(1, "PR_READY", 0)
+    os_model.add_process(2, "PR_READY", 25)
+    sjf_scheduler(os_model, processes, engine='fast')
+    assert [entry.end_time for entry in os_model.process_table] == [100, 115]
+
+def test_sjf_and_srtf_engines_agree():
+    rng = random.Random(3)
+    names = ["LOAD", "STORE", "ADD", "MUL"]
+    instruction_lists = [[rng.choice(names) for _ in range(rng.randint(1, 200))] for _ in range(8)]
+    for scheduler in (sjf_scheduler, srtf_scheduler):
+        results = []
+        for engine, cls in [('step', Process), ('fast', CompactProcess.from_instructions)]:
+            os_model = OperatingSystemModel()
+            processes = {pid: cls(pid, instrs) for pid, instrs in enumerate(instruction_lists, start=1)}
+            for pid in processes:
+                os_model.add_process(pid, "PR_READY", pid * 97)
+            scheduler(os_model, processes, engine=engine)
+            results.append([(e.cpu_time, e.end_time) for e in os_model.process_table])
+        assert results[0] == results[1]
+
+def test_mlfq_scheduler_demotes_long_running_processes():
+    os_model = OperatingSystemModel(quantum=20, context_switch_penalty=0)
+    # Process 1 needs 100 ns; process 2 needs 10 ns.
+    processes = {1: Process(1, ["LOAD"] * 10), 2: Process(2, ["LOAD"])}
+    for pid in processes:
+        os_model.add_process(pid, "PR_READY", 0)
+    mlfq_scheduler(os_model, processes, num_levels=3)
+    entries = {entry.process_id: entry for entry in os_model.process_table}
+    # Slices: P1 20 (level 0), P2 10 (done), P1 40 (level 1), P1 40 (level 2, done)
+    assert entries[2].end_time == 30
+    assert entries[1].end_time == 110
+    assert entries[1].cpu_time == 100
+    assert os_model.current_time == 110
+
+def test_mlfq_engines_agree_and_boost():
+    rng = random.Random(5)
+    names = ["LOAD", "STORE", "ADD", "MUL"]
+    instruction_lists = [[rng.choice(names) for _ in range(rng.randint(1, 400))] for _ in range(6)]
+    results = []
+    for engine, cls in [('step', Process), ('fast', CompactProcess.from_instructions)]:
+        os_model = OperatingSystemModel(quantum=50)
+        processes = {pid: cls(pid, instrs) for pid, instrs in enumerate(instruction_lists, start=1)}
+        for pid in processes:
+            os_model.add_process(pid, "PR_READY", 0)
+        mlfq_scheduler(os_model, processes, engine=engine, boost_interval=300)
+        results.append([(e.cpu_time, e.end_time, e.process_state) for e in os_model.process_table])
+    assert results[0] == results[1]
+    assert all(state == "PR_DONE" for _, _, state in results[0])
+
+def test_cfs_scheduler_shares_cpu_by_weight():
+    os_model = OperatingSystemModel(context_switch_penalty=0)
+    # Two identical CPU-bound processes; process 2 has twice the weight.
+    processes = {pid: CompactProcess.from_instructions(pid, ["ADD"] * 6000) for pid in (1, 2)}
+    os_model.add_process(1, "PR_READY", 0)
+    os_model.add_process(2, "PR_READY", 0, weight=2048)
+    cfs_scheduler(os_model, processes, engine='fast', target_latency=600, min_granularity=100)
+    entries = {entry.process_id: entry for entry in os_model.process_table}
+    # Process 2 gets 400 ns of every 600 ns period, so it finishes first, at
+    # 6000 / 400 * 600 = 9000 ns; process 1 then finishes at 12000 ns.
+    assert entries[2].end_time == 9000
+    assert entries[1].end_time == 12000
+    assert entries[1].vruntime == 6000
+    assert entries[2].vruntime == 3000
+
+def test_cfs_engines_agree():
+    rng = random.Random(9)
+    names = ["LOAD", "STORE", "ADD", "MUL"]
+    instruction_lists = [[rng.choice(names) for _ in range(rng.randint(1, 600))] for _ in range(12)]
+    results = []
+    for engine, cls in [('step', Process), ('fast', CompactProcess.from_instructions)]:
+        os_model = OperatingSystemModel()
+        processes = {pid: cls(pid, instrs) for pid, instrs in enumerate(instruction_lists, start=1)}
+        for pid in processes:
+            os_model.add_process(pid, "PR_READY", 0, weight=512 * (1 + pid % 3))
+        cfs_scheduler(os_model, processes, engine=engine)
+        results.append([(e.cpu_time, e.end_time, e.process_state) for e in os_model.process_table])
+    assert results[0] == results[1]
+    assert all(state == "PR_DONE" for _, _, state in results[0])
+
+def test_round_robin_scheduler_skips_idle_gap_until_arrival():
+    os_model = OperatingSystemModel(quantum=100, context_switch_penalty=5)
+    processes = {1: Process(1, ["LOAD", "ADD"]), 2: Process(2, ["STORE"])}
+    os_model.add_process(1, "PR_READY", 0)
+    os_model.add_process(2, "PR_READY", 1000)
+    round_robin_scheduler(os_model, processes)
+    entries = {entry.process_id: entry for entry in os_model.process_table}
+    assert entries[1].end_time == 11
+    # The CPU idles from 11 until process 2 arrives; then a switch and 20 ns of work
+    assert entries[2].end_time == 1000 + 5 + 20
+    assert entries[2].end_time - entries[2].start_time - entries[2].cpu_time == 5
+    assert os_model.current_time == 1025
+    assert not os_model.calendar
+
+def test_arrival_joins_round_robin_queue_behind_running_process():
+    os_model = OperatingSystemModel(quantum=20, context_switch_penalty=0)
+    processes = {1: Process(1, ["LOAD"] * 4), 2: Process(2, ["LOAD"])}
+    os_model.add_process(1, "PR_READY", 0)
+    os_model.add_process(2, "PR_READY", 10)
+    round_robin_scheduler(os_model, processes)
+    entries = {entry.process_id: entry for entry in os_model.process_table}
+    # Process 2 arrives during process 1's first slice and runs when it expires
+    assert entries[2].end_time == 30
+    assert entries[1].end_time == 50
+
+@pytest.mark.parametrize("scheduler", [fcfs_scheduler, round_robin_scheduler, mlfq_scheduler, cfs_scheduler])
+def test_schedulers_with_arrivals_engines_agree(scheduler):
+    rng = random.Random(11)
+    names = ["LOAD", "STORE", "ADD", "MUL"]
+    instruction_lists = [[rng.choice(names) for _ in range(rng.randint(1, 100))] for _ in range(8)]
+    results = []
+    for engine, cls in [('step', Process), ('fast', CompactProcess.from_instructions)]:
+        os_model = OperatingSystemModel(quantum=50)
+        processes = {pid: cls(pid, instrs) for pid, instrs in enumerate(instruction_lists, start=1)}
+        for pid in processes:
+            os_model.add_process(pid, "PR_READY", pid * 300)
+        scheduler(os_model, processes, engine=engine)
+        results.append([(e.cpu_time, e.end_time) for e in os_model.process_table])
+    assert results[0] == results[1]
+    assert all(end_time is not None for _, end_time in results[0])
+
+def test_cpu_runs_other_process_during_io():
+    os_model = OperatingSystemModel(quantum=500, context_switch_penalty=0)
+    os_model.add_device(Device('disk', {'LOAD': 100}))
+    # Process 1 computes, blocks on a LOAD for 100 ns, then computes again
+    processes = {1: Process(1, ["MUL", "LOAD", "ADD"]), 2: Process(2, ["MUL"] * 10)}
+    os_model.add_process(1, "PR_READY", 0)
+    os_model.add_process(2, "PR_READY", 0)
+    round_robin_scheduler(os_model, processes)
+    entries = {entry.process_id: entry for entry in os_model.process_table}
+    # Process 2 runs 5-55 while the LOAD is served 5-105; process 1 resumes at 105
+    assert entries[2].end_time == 55
+    assert entries[1].end_time == 106
+    assert entries[1].cpu_time == 6
+    assert entries[1].io_time == 100
+    metrics = os_model.metrics()
+    assert metrics['cpu_utilization'] == 56 / 106
+    assert metrics['device_utilization'] == {'disk': 100 / 106}
+
+def test_process_ending_with_io_finishes_at_io_completion():
+    os_model = OperatingSystemModel(context_switch_penalty=0)
+    os_model.add_device(Device('disk', {'STORE': 50}))
+    processes = {1: Process(1, ["ADD", "STORE"])}
+    os_model.add_process(1, "PR_READY", 0)
+    fcfs_scheduler(os_model, processes, engine='fast')
+    entry = os_model.process_table[0]
+    assert entry.end_time == 51
+    assert entry.process_state == "PR_DONE"
+
+@pytest.mark.parametrize("scheduler", [fcfs_scheduler, round_robin_scheduler, sjf_scheduler, srtf_scheduler,
+                                       mlfq_scheduler, cfs_scheduler])
+def test_schedulers_with_io_engines_agree(scheduler):
+    rng = random.Random(5)
+    names = ["LOAD", "STORE", "ADD", "MUL", "NOP"]
+    instruction_lists = [[rng.choice(names) for _ in range(rng.randint(1, 100))] for _ in range(6)]
+    results = []
+    for engine, cls in [('step', Process), ('fast', CompactProcess.from_instructions)]:
+        os_model = OperatingSystemModel(quantum=30)
+        os_model.add_device(Device('disk', {'STORE': 70}))
+        processes = {pid: cls(pid, instrs) for pid, instrs in enumerate(instruction_lists, start=1)}
+        for pid in processes:
+            os_model.add_process(pid, "PR_READY", pid * 50)
+        scheduler(os_model, processes, engine=engine)
+        results.append([(e.cpu_time, e.io_time, e.end_time) for e in os_model.process_table])
+    assert results[0] == results[1]
+    assert all(e.process_state == "PR_DONE" for e in os_model.process_table)
+
+@pytest.mark.parametrize("scheduler", [fcfs_scheduler, round_robin_scheduler, mlfq_scheduler, cfs_scheduler])
+@pytest.mark.parametrize("engine", ['step', 'fast'])
+def test_run_length_processes_with_io_match_plain_processes(scheduler, engine):
+    rng = random.Random(9)
+    names = ["LOAD", "STORE", "ADD", "MUL"]
+    # Long runs, so I/O requests fall inside runs as well as at their boundaries
+    instruction_lists = [[name for _ in range(rng.randint(1, 8)) for name in [rng.choice(names)] * rng.randint(1, 6)]
+                         for _ in range(5)]
+    results = []
+    for cls in (Process, RunLengthProcess.from_instructions):
+        os_model = OperatingSystemModel(quantum=40)
+        os_model.add_device(Device('disk', {'LOAD': 60, 'STORE': 90}))
+        processes = {pid: cls(pid, instrs) for pid, instrs in enumerate(instruction_lists, start=1)}
+        for pid in processes:
+            os_model.add_process(pid, "PR_READY", 0)
+        scheduler(os_model, processes, engine=engine)
+        results.append([(e.cpu_time, e.io_time, e.end_time) for e in os_model.process_table])
+    assert results[0] == results[1]
+
+def test_round_robin_batch_matches_round_robin_scheduler():
+    rng = random.Random(5)
+    names = ["LOAD", "STORE", "ADD", "SUB", "MUL", "DIV", "NOP"]
+    instruction_lists = [[rng.choice(names) for _ in range(rng.randint(0, 60))] for _ in range(5)]
+    instruction_lists.append(["ADD"] * 40 + ["NOP"] * 3)  # exact-budget slices with zero-cost tails
+    processes = {pid: CompactProcess.from_instructions(pid, instrs)
+                 for pid, instrs in enumerate(instruction_lists, start=1)}
+    quanta = [20, 25, 40, 100, 1000]
+    order = [3, 1, 6, 2, 5, 4]
+    models = []
+    for quantum in quanta:
+        os_model = OperatingSystemModel(quantum=quantum)
+        for pid in order:
+            os_model.add_process(pid, "PR_READY", 0)
+        models.append(os_model)
+    round_robin_batch(models, processes)
+    for quantum, os_model in zip(quanta, models):
+        expected = OperatingSystemModel(quantum=quantum)
+        for pid in order:
+            expected.add_process(pid, "PR_READY", 0)
+        round_robin_scheduler(expected, {pid: Process(pid, instrs)
+                                         for pid, instrs in enumerate(instruction_lists, start=1)})
+        assert os_model.current_time == expected.current_time
+        assert os_model.busy_time == expected.busy_time
+        assert [(e.process_id, e.end_time, e.cpu_time, e.process_state) for e in os_model.process_table] == \
+               [(e.process_id, e.end_time, e.cpu_time, e.process_state) for e in expected.process_table]
+    assert all(proc.pc == 0 for proc in processes.values())
+
+def test_round_robin_batch_rejects_unsupported_models():
+    processes = {1: CompactProcess.from_instructions(1, ["STORE", "ADD"])}
+    os_model = OperatingSystemModel(quantum=10)
+    os_model.add_process(1, "PR_READY", 0)
+    with pytest.raises(ValueError):
+        round_robin_batch([os_model], processes)  # STORE never fits in a 10 ns slice
+    os_model = OperatingSystemModel(quantum=100)
+    os_model.add_process(1, "PR_READY", 50)
+    with pytest.raises(ValueError):
+        round_robin_batch([os_model], processes)
+    os_model = OperatingSystemModel(quantum=100)
+    os_model.add_device(Device('io', {'LOAD': 100}))
+    with pytest.raises(ValueError):
+        round_robin_batch([os_model], processes)
@@ -0,0 +1,44 @@
+import numpy as np
+from utils.metrics import MetricsAccumulator
+from utils.sweep_results import SweepResultsFile, point_key
+from models.process_table_entry import ProcessTableEntry
+
+def make_metrics(total_time):
+    accumulator = MetricsAccumulator()
+    accumulator.add_process(ProcessTableEntry(1, "PR_DONE", 0, end_time=total_time, cpu_time=total_time // 2))
+    return {'total_time': total_time, 'accumulator': accumulator, 'device_utilization': {'io': 0.5}}
+
+def test_append_and_load_round_trip(tmp_path):
+    results_file = SweepResultsFile(str(tmp_path / 'out' / 'sweep.jsonl'))
+    assert results_file.entries() == []
+    point = dict(cpu_probability=np.float64(0.30000000000000004), quantum=np.int64(300), scheduler_type='rr')
+    results_file.append(point, make_metrics(1000))
+    results_file.append(dict(point, quantum=400), make_metrics(900))
+    loaded = results_file.load()
+    assert list(loaded) == [point_key(point), point_key(dict(point, quantum=400))]
+    assert loaded[point_key(point)] == make_metrics(1000)
+    results_file.reset()
+    assert results_file.load() == {}
+
+def test_truncated_and_repeated_lines(tmp_path):
+    path = tmp_path / 'sweep.jsonl'
+    results_file = SweepResultsFile(str(path))
+    point = dict(cpu_probability=0.5, quantum=100, scheduler_type='rr')
+    results_file.append(point, make_metrics(1000))
+    results_file.append(point, make_metrics(1200))
+    with open(path, 'a') as f:
+        f.write('{"point": {"cpu_probability": 0.6, "qua')
+    entries = results_file.entries()
+    assert len(entries) == 1
+    assert entries[0][1]['total_time'] == 1200
+
+def test_append_after_truncated_line(tmp_path):
+    path = tmp_path / 'sweep.jsonl'
+    results_file = SweepResultsFile(str(path))
+    points = [dict(cpu_probability=0.5, quantum=q, scheduler_type='rr') for q in (100, 200, 300)]
+    results_file.append(points[0], make_metrics(1000))
+    with open(path, 'a') as f:
+        f.write('{"point": {"cpu_probability": 0.5, "qua')
+    results_file.append(points[1], make_metrics(1100))
+    results_file.append(points[2], make_metrics(1200))
+    assert [metrics['total_time'] for _, metrics in results_file.entries()] == [1000, 1100, 1200]
@@ -0,0 +1,52 @@
+import mmap
+import pytest
+import numpy as np
+from main import load_process
+from models.process import MappedProcess, OPCODES, UNKNOWN_OPCODE
+from utils.trace_file import write_trace, convert_text_trace, read_trace_header, load_trace
+
+def test_convert_text_trace_round_trip(tmp_path):
+    text_path = tmp_path / "process.txt"
+    text_path.write_text("LOAD\n\nADD\nSTORE\nNOP\nMUL\n")
+    trace_path = tmp_path / "process.trace"
+    header = convert_text_trace(str(text_path), str(trace_path), block_size=2)
+    assert header.num_instructions == 5
+    assert header.total_cost == 10 + 1 + 20 + 5
+    assert header.opcode_counts['LOAD'] == 1
+    assert header.opcode_counts['UNKNOWN'] == 1
+    assert read_trace_header(str(trace_path)) == header
+
+    proc = load_trace(str(trace_path), 7)
+    assert isinstance(proc, MappedProcess)
+    assert proc.process_id == 7
+    assert proc.instructions == ["LOAD", "ADD", "STORE", "UNKNOWN", "MUL"]
+    assert proc.remaining_cost() == header.total_cost
+
+def test_load_trace_is_zero_copy(tmp_path):
+    trace_path = str(tmp_path / "p.trace")
+    write_trace(trace_path, np.full(10000, OPCODES['ADD'], dtype=np.uint8), block_size=64)
+    proc = load_trace(trace_path, 1)
+    assert not proc.opcodes.flags.owndata
+    base = proc.opcodes.base
+    while isinstance(base, (np.ndarray, memoryview)):
+        base = base.obj if isinstance(base, memoryview) else base.base
+    assert isinstance(base, mmap.mmap)
+    assert not proc.opcodes.flags.writeable
+    assert proc.execute_slice(500) == 500
+    assert proc.pc == 500
+
+def test_convert_matches_load_process(tmp_path):
+    trace_path = str(tmp_path / "process_c.trace")
+    convert_text_trace("data/process_c.txt", trace_path, block_size=4)
+    text_proc = load_process("data/process_c.txt", 1, compact=True)
+    trace_proc = load_process(trace_path, 1)
+    assert isinstance(trace_proc, MappedProcess)
+    assert np.array_equal(trace_proc.opcodes, text_proc.opcodes)
+
+def test_invalid_trace_files_are_rejected(tmp_path):
+    bad_path = tmp_path / "bad.trace"
+    bad_path.write_bytes(b"LOAD\nADD\n" * 20)
+    with pytest.raises(ValueError):
+        load_trace(str(bad_path), 1)
+    with pytest.raises(ValueError):
+        write_trace(str(tmp_path / "out.trace"), [0, UNKNOWN_OPCODE + 1])
@@ -0,0 +1,404 @@
+import math
+import numpy as np
+
+# Per-process metrics tracked by a MetricsAccumulator
+PROCESS_METRICS = ('turnaround_time', 'cpu_time', 'io_time', 'waiting_time')
+# Quantiles reported by MetricsAccumulator.summary
+SUMMARY_QUANTILES = (0.5, 0.95, 0.99)
+# Default relative error of QuantileSketch estimates
+DEFAULT_RELATIVE_ACCURACY = 0.01
+# Default confidence level of confidence intervals
+DEFAULT_CONFIDENCE = 0.95
+
+def _t_central_probability(t, df):
+    # P(|T| < t) for Student's t with an integer number of degrees of freedom,
+    # from the closed-form finite series in theta = atan(t / sqrt(df))
+    theta = math.atan(t / math.sqrt(df))
+    cos2 = math.cos(theta) ** 2
+    if df % 2:
+        term, total = math.cos(theta), 0.0
+        for k in range(1, (df - 1) // 2 + 1):
+            total += term
+            term *= cos2 * (2 * k) / (2 * k + 1)
+        return 2 / math.pi * (theta + math.sin(theta) * total) if df > 1 else 2 / math.pi * theta
+    term, total = 1.0, 0.0
+    for k in range(1, df // 2 + 1):
+        total += term
+        term *= cos2 * (2 * k - 1) / (2 * k)
+    return math.sin(theta) * total
+
+def t_critical_value(confidence, df):
+    """
+    Two-sided critical value of Student's t distribution.
+
+    Args:
+        confidence: Confidence level between 0 and 1 (e.g. 0.95)
+        df: Degrees of freedom (a positive integer)
+
+    Returns:
+        t such that P(|T| < t) = confidence
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    if df < 1:
+        raise ValueError("df must be at least 1")
+    low, high = 0.0, 1.0
+    while _t_central_probability(high, df) < confidence:
+        high *= 2
+    for _ in range(100):
+        mid = (low + high) / 2
+        if _t_central_probability(mid, df) < confidence:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+def confidence_interval(values, confidence=DEFAULT_CONFIDENCE):
+    """
+    Student's t confidence interval of the mean of independent samples.
+
+    Args:
+        values: Sequence of samples (e.g. one value per seeded replicate)
+        confidence: Confidence level (default: DEFAULT_CONFIDENCE)
+
+    Returns:
+        Tuple (mean, half_width); the half width is infinite for fewer than
+        two samples
+    """
+    stats = RunningStats()
+    stats.add_array(values)
+    return stats.mean, stats.half_width(confidence)
+
+class RunningStats:
+    def __init__(self):
+        """Initialize streaming count, mean, variance, min and max.
+
+        Note:
+            Values are folded in with Welford's update and partial results are
+            combined with Chan's parallel formula, so the accumulator never
+            stores the values themselves and two accumulators can be merged
+            in O(1).
+        """
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # Sum of squared deviations from the mean
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        """Fold a single value into the statistics.
+
+        Args:
+            value: Number to add
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def add_array(self, values):
+        """Fold an array of values into the statistics in one step.
+
+        Args:
+            values: Array-like of numbers
+        """
+        values = np.asarray(values)
+        if values.size == 0:
+            return
+        other = RunningStats()
+        other.count = int(values.size)
+        other.mean = float(values.mean())
+        other._m2 = float(((values - other.mean) ** 2).sum())
+        other.min = values.min().item()
+        other.max = values.max().item()
+        self.merge(other)
+
+    def merge(self, other):
+        """Fold another RunningStats into this one.
+
+        Args:
+            other: RunningStats computed over a disjoint set of values
+
+        Returns:
+            self
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+            self.min, self.max = other.min, other.max
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1) of the values, 0.0 for fewer than two."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        """Sample standard deviation of the values."""
+        return math.sqrt(self.variance)
+
+    def half_width(self, confidence=DEFAULT_CONFIDENCE):
+        """Half width of the t confidence interval of the mean (infinite for fewer than two values)."""
+        if self.count < 2:
+            return math.inf
+        return t_critical_value(confidence, self.count - 1) * self.std / math.sqrt(self.count)
+
+    def to_dict(self):
+        """Return the state as a JSON-serializable dictionary."""
+        return {'count': self.count, 'mean': self.mean, 'm2': self._m2, 'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, state):
+        """Rebuild a RunningStats from to_dict output."""
+        stats = cls()
+        stats.count, stats.mean, stats._m2 = state['count'], state['mean'], state['m2']
+        stats.min, stats.max = state['min'], state['max']
+        return stats
+
+    def __eq__(self, other):
+        return isinstance(other, RunningStats) and self.to_dict() == other.to_dict()
+
+class QuantileSketch:
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        """Initialize a mergeable quantile sketch for non-negative values.
+
+        Args:
+            relative_accuracy: Maximum relative error of quantile estimates
+                               (default: DEFAULT_RELATIVE_ACCURACY)
+
+        Note:
+            Values are counted in logarithmic buckets whose bounds grow by a
+            factor gamma = (1 + a) / (1 - a), as in DDSketch. Every value in a
+            bucket is within a relative error a of the bucket's estimate, the
+            memory grows with the logarithm of the value range rather than
+            with the number of values, and merging two sketches just adds
+            their bucket counts.
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets = {}  # Bucket index -> count
+        self.zero_count = 0
+        self.count = 0
+
+    def _index(self, value):
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value):
+        """Count a single value.
+
+        Args:
+            value: Non-negative number
+        """
+        if value < 0:
+            raise ValueError("QuantileSketch only accepts non-negative values")
+        self.count += 1
+        if value == 0:
+            self.zero_count += 1
+            return
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def add_array(self, values):
+        """Count an array of values in one step.
+
+        Args:
+            values: Array-like of non-negative numbers
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.size and values.min() < 0:
+            raise ValueError("QuantileSketch only accepts non-negative values")
+        positive = values[values > 0]
+        self.count += int(values.size)
+        self.zero_count += int(values.size - positive.size)
+        indices, counts = np.unique(np.ceil(np.log(positive) / self._log_gamma).astype(np.int64),
+                                    return_counts=True)
+        for index, count in zip(indices.tolist(), counts.tolist()):
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def merge(self, other):
+        """Add the counts of another sketch with the same accuracy.
+
+        Args:
+            other: QuantileSketch built with the same relative_accuracy
+
+        Returns:
+            self
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracies")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        """Estimate the q-quantile of the counted values.
+
+        Args:
+            q: Quantile between 0 and 1 (e.g. 0.99 for p99)
+
+        Returns:
+            The estimate, within relative_accuracy of the exact value of the
+            same rank, or None if the sketch is empty
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return 2 * self._gamma ** index / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+    def to_dict(self):
+        """Return the state as a JSON-serializable dictionary."""
+        return {'relative_accuracy': self.relative_accuracy, 'zero_count': self.zero_count,
+                'buckets': [[index, count] for index, count in sorted(self.buckets.items())]}
+
+    @classmethod
+    def from_dict(cls, state):
+        """Rebuild a QuantileSketch from to_dict output."""
+        sketch = cls(state['relative_accuracy'])
+        sketch.buckets = {index: count for index, count in state['buckets']}
+        sketch.zero_count = state['zero_count']
+        sketch.count = sketch.zero_count + sum(sketch.buckets.values())
+        return sketch
+
+    def __eq__(self, other):
+        return isinstance(other, QuantileSketch) and self.to_dict() == other.to_dict()
+
+class MetricsAccumulator:
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        """Initialize streaming summaries of the per-process metrics.
+
+        Args:
+            relative_accuracy: Relative error of the quantile estimates
+                               (default: DEFAULT_RELATIVE_ACCURACY)
+
+        Note:
+            For each name in PROCESS_METRICS the accumulator keeps a
+            RunningStats and a QuantileSketch. Its memory does not grow with
+            the number of processes, and accumulators filled by different
+            simulations (e.g. in sweep workers) can be merged.
+        """
+        self.relative_accuracy = relative_accuracy
+        self.stats = {name: RunningStats() for name in PROCESS_METRICS}
+        self.sketches = {name: QuantileSketch(relative_accuracy) for name in PROCESS_METRICS}
+
+    def add_process(self, entry):
+        """Record a finished process.
+
+        Args:
+            entry: ProcessTableEntry (or ProcessTable row) with end_time set
+        """
+        turnaround_time = entry.end_time - entry.start_time
+        values = {
+            'turnaround_time': turnaround_time,
+            'cpu_time': entry.cpu_time,
+            'io_time': entry.io_time,
+            'waiting_time': turnaround_time - entry.cpu_time - entry.io_time,
+        }
+        for name, value in values.items():
+            self.stats[name].add(value)
+            self.sketches[name].add(value)
+
+    def add_columns(self, columns):
+        """Record many processes at once.
+
+        Args:
+            columns: Dictionary mapping metric names to equally long arrays,
+                     such as the output of process_time_columns
+        """
+        for name in PROCESS_METRICS:
+            self.stats[name].add_array(columns[name])
+            self.sketches[name].add_array(columns[name])
+
+    def merge(self, other):
+        """Fold another accumulator into this one.
+
+        Args:
+            other: MetricsAccumulator with the same relative_accuracy
+
+        Returns:
+            self
+        """
+        for name in PROCESS_METRICS:
+            self.stats[name].merge(other.stats[name])
+            self.sketches[name].merge(other.sketches[name])
+        return self
+
+    @classmethod
+    def merged(cls, accumulators, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        """Return a new accumulator combining several accumulators.
+
+        Args:
+            accumulators: Iterable of MetricsAccumulator instances
+            relative_accuracy: Accuracy of the result; it must match the inputs
+        """
+        result = cls(relative_accuracy)
+        for accumulator in accumulators:
+            result.merge(accumulator)
+        return result
+
+    @property
+    def count(self):
+        """Number of processes recorded."""
+        return self.stats[PROCESS_METRICS[0]].count
+
+    def summary(self):
+        """Return count, mean, variance, min, max, p50, p95 and p99 per metric.
+
+        Returns:
+            Dictionary mapping each metric name to a dictionary of statistics
+        """
+        summary = {}
+        for name in PROCESS_METRICS:
+            stats, sketch = self.stats[name], self.sketches[name]
+            summary[name] = {'count': stats.count, 'mean': stats.mean, 'variance': stats.variance,
+                             'min': stats.min, 'max': stats.max}
+            for q in SUMMARY_QUANTILES:
+                estimate = sketch.quantile(q)
+                if estimate is not None:
+                    # The exact quantile always lies within [min, max]
+                    estimate = min(max(estimate, stats.min), stats.max)
+                summary[name][f'p{round(q * 100)}'] = estimate
+        return summary
+
+    def to_dict(self):
+        """Return the state as a JSON-serializable dictionary."""
+        return {'relative_accuracy': self.relative_accuracy,
+                'stats': {name: self.stats[name].to_dict() for name in PROCESS_METRICS},
+                'sketches': {name: self.sketches[name].to_dict() for name in PROCESS_METRICS}}
+
+    @classmethod
+    def from_dict(cls, state):
+        """Rebuild a MetricsAccumulator from to_dict output."""
+        accumulator = cls(state['relative_accuracy'])
+        for name in PROCESS_METRICS:
+            accumulator.stats[name] = RunningStats.from_dict(state['stats'][name])
+            accumulator.sketches[name] = QuantileSketch.from_dict(state['sketches'][name])
+        return accumulator
+
+    def __eq__(self, other):
+        return isinstance(other, MetricsAccumulator) and self.to_dict() == other.to_dict()
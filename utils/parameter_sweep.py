@@ -1,14 +1,65 @@
+import inspect
+import contextlib
+import hashlib
+import json
+import math
 import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
+import matplotlib
+# Charts are only ever saved to files, so render without a display
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from models.operating_system import OperatingSystemModel
-from utils.process_generator import create_process
-from models.scheduler import fcfs_scheduler, round_robin_scheduler
+from models.multicore import MultiCoreOperatingSystemModel
+from models.device import Device
+from models.process_table import process_time_columns
+from utils.process_generator import create_processes, generate_arrival_times, SharedWorkload
+from utils.metrics import MetricsAccumulator, confidence_interval, DEFAULT_CONFIDENCE
+from utils.result_cache import ResultCache, code_version, DEFAULT_CACHE_BYTES
+from utils.sweep_results import SweepResultsFile, point_key
+from models.scheduler import SCHEDULERS, multicore_scheduler, round_robin_batch
 
-def perform_parameter_sweep():
+# Chart output settings, and the file recording the data hash each chart was last rendered from
+DEFAULT_CHART_DPI = 300
+DEFAULT_CHART_FORMAT = 'png'
+CHART_MANIFEST = '.chart_hashes.json'
+# Values reported with a confidence interval for replicated grid points
+REPLICATE_METRICS = ('total_time', 'turnaround_time', 'waiting_time')
+# Replicates a point may get at most when a precision target is set
+DEFAULT_MAX_REPLICATES = 20
+
+def perform_parameter_sweep(engine='step', jobs=1, seed=0, cache_dir=None, cache_bytes=DEFAULT_CACHE_BYTES,
+                            results_file=None, resume=False, replicates=1, max_replicates=None, precision=None,
+                            chart_dpi=DEFAULT_CHART_DPI, chart_format=DEFAULT_CHART_FORMAT):
     """
     Perform parameter sweeps for CPU probability and quantum.
     Generate and save charts of the results.
+
+    Args:
+        engine: Simulation engine passed to run_simulation ('step' or 'fast')
+        jobs: Number of worker processes used to run the grid points
+        seed: Base seed; each grid point gets its own seed derived from it, so
+              the results do not depend on the number of workers (None for
+              unseeded runs)
+        cache_dir: Directory of a persistent ResultCache; points simulated
+                   before with the same parameters and simulator code are
+                   loaded from it instead of rerun (None disables caching)
+        cache_bytes: Size bound of the cache in bytes
+        results_file: Path of a JSON Lines file every finished grid point is
+                      appended to (None: results are only kept in memory)
+        resume: Keep the points already in results_file and only simulate
+                the missing ones, instead of starting a new file
+        replicates: Seeded replicates per grid point (see run_replicated);
+                    with more than one, the charts show confidence bands
+        max_replicates: Upper bound on replicates per point when precision is
+                        set (default: DEFAULT_MAX_REPLICATES)
+        precision: Stop adding replicates to a point once the confidence
+                   interval of its mean turnaround time is within this
+                   fraction of the mean (None: exactly `replicates` runs)
+        chart_dpi: Resolution of the charts
+        chart_format: File format of the charts ('png', 'svg', 'pdf', ...)
     """
     # Ensure output directory exists
     os.makedirs('output', exist_ok=True)
@@ -19,31 +70,374 @@ def perform_parameter_sweep():
     num_processes = 16
     num_instructions = 32000 
     
-    # Data structures to store results
-    fcfs_results = []
-    rr_results = {quantum: [] for quantum in quanta}
-    
-    # Run FCFS simulations for different CPU probabilities
-    print("Running FCFS simulations...")
+    # Build the grid points: all FCFS runs first, then RR by quantum
+    points = []
     for cpu_prob in cpu_probabilities:
-        print(f"[FCFS] Starting simulation for cpu_probability = {cpu_prob:.1f}")
-        metrics = run_simulation(cpu_prob, 500, scheduler_type='fcfs', num_processes=num_processes, num_instructions=num_instructions)  # Quantum doesn't matter for FCFS
-        print(f"[FCFS] Finished simulation for cpu_probability = {cpu_prob:.1f}; Total time: {metrics['total_time']} ns")
-        fcfs_results.append(metrics)
-    
-    # Run RR simulations for different CPU probabilities and quanta
-    print("Running Round Robin simulations...")
+        # Quantum doesn't matter for FCFS
+        points.append(dict(cpu_probability=cpu_prob, quantum=500, scheduler_type='fcfs'))
     for quantum in quanta:
         for cpu_prob in cpu_probabilities:
-            print(f"[RR] Starting simulation for quantum = {quantum} ns, cpu_probability = {cpu_prob:.1f}")
-            metrics = run_simulation(cpu_prob, quantum, scheduler_type='rr', num_processes=num_processes, num_instructions=num_instructions)
-            print(f"[RR] Finished simulation for quantum = {quantum} ns, cpu_probability = {cpu_prob:.1f}; Total time: {metrics['total_time']} ns")
-            rr_results[quantum].append(metrics)
+            points.append(dict(cpu_probability=cpu_prob, quantum=quantum, scheduler_type='rr'))
+    # One seed per CPU probability: FCFS and every quantum simulate the same
+    # workload, so the quanta are compared without sampling noise between them
+    probability_seeds = dict(zip(cpu_probabilities, _derive_seeds(seed, len(cpu_probabilities))))
+    for point in points:
+        point.update(num_processes=num_processes, num_instructions=num_instructions, engine=engine,
+                     seed=probability_seeds[point['cpu_probability']], per_process=False)
+    
+    cache = None
+    if cache_dir is not None and seed is not None:
+        # Unseeded runs are not reproducible, so they are never cached
+        cache = ResultCache(cache_dir, max_bytes=cache_bytes, version=simulator_version())
+    
+    sweep_file = None
+    if results_file is not None:
+        sweep_file = SweepResultsFile(results_file)
+        if not resume:
+            sweep_file.reset()
+    
+    print(f"Running {len(points)} simulations with {jobs} worker(s)...")
+    if replicates > 1 or precision is not None:
+        results = run_replicated(points, min_replicates=replicates, max_replicates=max_replicates,
+                                 precision=precision, jobs=jobs, cache=cache, results_file=sweep_file,
+                                 share_workloads=True)
+        counts = [result['replicates'] for result in results]
+        print(f"Replicates per point: {min(counts)} to {max(counts)} ({sum(counts)} runs)")
+    else:
+        results = run_simulations(points, jobs=jobs, cache=cache, results_file=sweep_file, share_workloads=True)
+    if cache is not None:
+        print(f"Result cache: {cache.hits} hit(s), {cache.misses} miss(es)")
+    
+    # Split the results back into FCFS and per-quantum RR series
+    fcfs_results = results[:len(cpu_probabilities)]
+    rr_results = {}
+    for i, quantum in enumerate(quanta):
+        start = len(cpu_probabilities) * (i + 1)
+        rr_results[quantum] = results[start:start + len(cpu_probabilities)]
+    _print_summary('FCFS', fcfs_results)
+    _print_summary('RR', [result for quantum in quanta for result in rr_results[quantum]])
     
     # Generate charts
-    generate_charts(cpu_probabilities, quanta, fcfs_results, rr_results)
+    generate_charts(cpu_probabilities, quanta, fcfs_results, rr_results, dpi=chart_dpi, fmt=chart_format, jobs=jobs)
+
+def _print_summary(label, results):
+    """Print turnaround percentiles over all processes of several runs."""
+    summary = MetricsAccumulator.merged(result['accumulator'] for result in results
+                                        if 'accumulator' in result).summary()
+    turnaround = summary['turnaround_time']
+    if turnaround['count']:
+        print(f"[{label}] {turnaround['count']} processes: turnaround mean = {turnaround['mean']:.0f} ns, "
+              f"p50 = {turnaround['p50']:.0f} ns, p95 = {turnaround['p95']:.0f} ns, "
+              f"p99 = {turnaround['p99']:.0f} ns")
+
+def simulator_version():
+    """
+    Code version of the simulator for ResultCache keys, including the
+    functions of this module that run simulations and collect their metrics.
+    """
+    return code_version(extra=[inspect.getsource(function)
+                               for function in (run_simulation, run_simulation_batch, _collect_metrics)])
+
+def _derive_seeds(seed, count):
+    """Derive one independent seed per grid point from a base seed."""
+    if seed is None:
+        return [None] * count
+    return np.random.SeedSequence(seed).generate_state(count).tolist()
+
+def _describe_point(point):
+    if point['scheduler_type'] == 'fcfs':
+        return f"[FCFS] cpu_probability = {point['cpu_probability']:.1f}"
+    return f"[RR] quantum = {point['quantum']} ns, cpu_probability = {point['cpu_probability']:.1f}"
+
+def _run_task(task_points, workload=None):
+    """Run one point, or several RR points on the same workload with run_simulation_batch."""
+    if len(task_points) == 1:
+        return [run_simulation(**task_points[0], workload=workload)]
+    return run_simulation_batch(workload, [point['quantum'] for point in task_points],
+                                columnar=task_points[0].get('columnar', False),
+                                per_process=task_points[0].get('per_process', True))
+
+def run_simulations(points, jobs=1, cache=None, results_file=None, share_workloads=False):
+    """
+    Run a list of simulations, optionally across a process pool.
+    
+    Args:
+        points: List of keyword-argument dicts for run_simulation
+        jobs: Number of worker processes (1 runs everything in this process)
+        cache: Optional ResultCache; cached points are not rerun and new
+               results are stored in it
+        results_file: Optional SweepResultsFile; points already recorded in it
+                      are not rerun, and every other point is appended to it
+                      as soon as its result is available
+        share_workloads: Generate the workload of each distinct seeded
+                         (cpu_probability, num_processes, num_instructions,
+                         seed) combination only once, into a memory-mapped
+                         file that every point and worker using it shares,
+                         and run the Round Robin points of one workload for
+                         all their quanta at once (run_simulation_batch); the
+                         results are the same as without sharing
+    
+    Returns:
+        List of metrics dictionaries in the same order as points
+    """
+    recorded = results_file.load() if results_file is not None else {}
+    results = [None] * len(points)
+    pending = []
+    for i, point in enumerate(points):
+        if point_key(point) in recorded:
+            results[i] = recorded[point_key(point)]
+            print(f"{_describe_point(point)}: resumed; Total time: {results[i]['total_time']} ns")
+            continue
+        cached = cache.get(point) if cache is not None else None
+        if cached is None:
+            pending.append(i)
+            continue
+        print(f"{_describe_point(point)}: cached; Total time: {cached['total_time']} ns")
+        if results_file is not None:
+            results_file.append(point, cached)
+        results[i] = cached
+    
+    workload_context = (tempfile.TemporaryDirectory(prefix='sweep_workloads_') if share_workloads
+                        else contextlib.nullcontext())
+    with workload_context as workload_dir:
+        workloads = _share_workloads(points, pending, workload_dir) if share_workloads else {}
+        for i, metrics in _run_pending(points, pending, jobs, workloads):
+            print(f"{_describe_point(points[i])}: finished; Total time: {metrics['total_time']} ns")
+            if cache is not None:
+                cache.put(points[i], metrics)
+            if results_file is not None:
+                results_file.append(points[i], metrics)
+            results[i] = metrics
+    return results
+
+def _workload_key(point):
+    """Parameters that determine the generated workload of a point, or None if it cannot be shared."""
+    if point.get('seed') is None or point.get('lazy'):
+        return None
+    return (point['cpu_probability'], point.get('num_processes', 4), point.get('num_instructions', 20),
+            point['seed'])
+
+def _share_workloads(points, pending, directory):
+    """Write one SharedWorkload per distinct workload of the pending points; return index -> workload."""
+    by_key = {}
+    workloads = {}
+    for i in pending:
+        key = _workload_key(points[i])
+        if key is None:
+            continue
+        if key not in by_key:
+            cpu_probability, num_processes, num_instructions, seed = key
+            by_key[key] = SharedWorkload.create(directory, num_processes, num_instructions, cpu_probability,
+                                                rng=seed)
+        workloads[i] = by_key[key]
+    return workloads
+
+def _batch_key(point):
+    """Options a point's RR batch must agree on, or None if it cannot run in a batch."""
+    if (point.get('scheduler_type', 'rr') != 'rr' or point.get('num_cores', 1) > 1
+            or point.get('mean_interarrival') is not None or point.get('io_service_times') is not None):
+        return None
+    return (_workload_key(point), point.get('columnar', False), point.get('per_process', True))
+
+def _tasks(points, pending, workloads):
+    """Group the pending indices into tasks: RR points sharing a workload form one batch."""
+    tasks = []
+    batches = {}
+    for i in pending:
+        key = _batch_key(points[i]) if i in workloads else None
+        if key is None:
+            tasks.append([i])
+        elif key in batches:
+            batches[key].append(i)
+        else:
+            batches[key] = [i]
+            tasks.append(batches[key])
+    return tasks
+
+def _run_pending(points, pending, jobs, workloads):
+    """Yield (index, metrics) for the points at the pending indices as they finish."""
+    tasks = _tasks(points, pending, workloads)
+    if jobs <= 1:
+        for task in tasks:
+            for i in task:
+                print(f"{_describe_point(points[i])}: starting")
+            yield from zip(task, _run_task([points[i] for i in task], workloads.get(task[0])))
+        return
+    
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(_run_task, [points[i] for i in task], workloads.get(task[0])): task
+                   for task in tasks}
+        for future in as_completed(futures):
+            yield from zip(futures[future], future.result())
+
+def replicate_seed(seed, replicate):
+    """
+    Seed of one replicate of a seeded point. Replicate 0 keeps the point's
+    seed, so a single replicate reproduces the unreplicated run, and points
+    sharing a seed (the quanta of one CPU probability) share every replicate's
+    workload too.
+    """
+    if seed is None or replicate == 0:
+        return seed
+    return np.random.SeedSequence([seed, replicate]).generate_state(1)[0].item()
+
+def _replicate_value(metrics, metric):
+    if metric == 'total_time':
+        return float(metrics['total_time'])
+    return metrics['accumulator'].stats[metric].mean
+
+def combine_replicates(runs, confidence=DEFAULT_CONFIDENCE):
+    """
+    Combine the metrics of several replicates of one grid point.
+    
+    Args:
+        runs: Metrics dictionaries of run_simulation, one per replicate
+        confidence: Confidence level of the intervals
+    
+    Returns:
+        Dictionary with 'replicates' (the number of runs), the mean
+        'total_time', 'makespan', 'throughput' and 'cpu_utilization' over the
+        replicates, an 'accumulator' merging all their processes, and 'ci'
+        mapping each of REPLICATE_METRICS to the 'mean' and 'half_width' of
+        the t confidence interval of its per-replicate value
+    """
+    combined = {
+        'replicates': len(runs),
+        'total_time': float(np.mean([metrics['total_time'] for metrics in runs])),
+        'accumulator': MetricsAccumulator.merged(metrics['accumulator'] for metrics in runs),
+    }
+    for name in ('makespan', 'throughput', 'cpu_utilization'):
+        if all(name in metrics for metrics in runs):
+            combined[name] = float(np.mean([metrics[name] for metrics in runs]))
+    combined['ci'] = {}
+    for metric in REPLICATE_METRICS:
+        mean, half_width = confidence_interval([_replicate_value(metrics, metric) for metrics in runs], confidence)
+        combined['ci'][metric] = {'mean': mean, 'half_width': half_width}
+    return combined
 
-def run_simulation(cpu_probability, quantum, num_processes=4, num_instructions=20, scheduler_type='rr'):
+def run_replicated(points, min_replicates=3, max_replicates=None, precision=None, metric='turnaround_time',
+                   confidence=DEFAULT_CONFIDENCE, **kwargs):
+    """
+    Run every point several times with derived seeds and combine the replicates.
+    Points start with min_replicates runs. While the confidence interval of a
+    point's metric is wider than the target, it gets more replicates, as many
+    as the current spread suggests are needed, up to max_replicates, so
+    compute is spent only on the noisy points. Each round of replicates runs
+    through run_simulations, so caching, results files and shared workloads
+    apply to every replicate.
+    
+    Args:
+        points: List of keyword-argument dicts for run_simulation
+        min_replicates: Replicates every point gets
+        max_replicates: Upper bound on replicates per point (default:
+                        DEFAULT_MAX_REPLICATES with precision, otherwise
+                        min_replicates)
+        precision: Target half width of the confidence interval relative to
+                   the mean (e.g. 0.02 for +-2%); None runs max_replicates
+        metric: Per-replicate value the interval is computed for
+                ('total_time' or a per-process metric averaged over processes)
+        confidence: Confidence level of the intervals
+        **kwargs: Passed to run_simulations (jobs, cache, results_file,
+                  share_workloads)
+    
+    Returns:
+        List of combine_replicates dictionaries in the same order as points
+    """
+    if min_replicates < 1:
+        raise ValueError("min_replicates must be at least 1")
+    if max_replicates is None:
+        max_replicates = DEFAULT_MAX_REPLICATES if precision is not None else min_replicates
+    max_replicates = max(max_replicates, min_replicates)
+    if precision is None:
+        min_replicates = max_replicates
+    runs = [[] for _ in points]
+    targets = [min_replicates] * len(points)
+    active = list(range(len(points)))
+    while active:
+        batch = [(i, replicate) for i in active for replicate in range(len(runs[i]), targets[i])]
+        replicate_points = [dict(points[i], seed=replicate_seed(points[i].get('seed'), replicate))
+                            for i, replicate in batch]
+        for (i, _), metrics in zip(batch, run_simulations(replicate_points, **kwargs)):
+            runs[i].append(metrics)
+        still_active = []
+        for i in active:
+            count = len(runs[i])
+            if precision is None or count >= max_replicates:
+                continue
+            mean, half_width = confidence_interval([_replicate_value(metrics, metric) for metrics in runs[i]],
+                                                   confidence)
+            target = precision * abs(mean)
+            if half_width <= target:
+                continue
+            if target <= 0:
+                needed = max_replicates
+            elif not math.isfinite(half_width):
+                # A single replicate says nothing about the spread yet
+                needed = count + 1
+            else:
+                # The half width shrinks with the square root of the replicates
+                needed = math.ceil(count * (half_width / target) ** 2)
+            targets[i] = min(max_replicates, max(count + 1, needed))
+            still_active.append(i)
+        active = still_active
+    return [combine_replicates(point_runs, confidence) for point_runs in runs]
+
+def group_results(points, results):
+    """
+    Arrange sweep results into the series expected by generate_charts.
+    
+    Args:
+        points: Keyword-argument dicts of run_simulation ('fcfs' and 'rr' points)
+        results: Metrics dictionaries, one per point
+    
+    Returns:
+        Tuple (cpu_probabilities, quanta, fcfs_results, rr_results); points
+        recorded several times (replicates) are merged with combine_replicates
+    
+    Raises:
+        ValueError: If a (cpu_probability, quantum) combination of the grid
+                    has no result
+    """
+    fcfs, rr = {}, {}
+    for point, metrics in zip(points, results):
+        if point['scheduler_type'] == 'fcfs':
+            fcfs.setdefault(point['cpu_probability'], []).append(metrics)
+        else:
+            rr.setdefault((point['quantum'], point['cpu_probability']), []).append(metrics)
+    # Replicates of a point (same parameters, different seeds) are combined
+    for series in (fcfs, rr):
+        for key, runs in series.items():
+            series[key] = runs[0] if len(runs) == 1 else combine_replicates(runs)
+    cpu_probabilities = np.array(sorted(set(fcfs) | {p for _, p in rr}))
+    quanta = np.array(sorted({q for q, _ in rr}))
+    try:
+        fcfs_results = [fcfs[p] for p in cpu_probabilities.tolist()]
+        rr_results = {quantum: [rr[(quantum, p)] for p in cpu_probabilities.tolist()]
+                      for quantum in quanta.tolist()}
+    except KeyError as e:
+        raise ValueError(f"The sweep results have no grid point for {e.args[0]!r}") from None
+    return cpu_probabilities, quanta, fcfs_results, rr_results
+
+def generate_charts_from_file(results_file, dpi=DEFAULT_CHART_DPI, fmt=DEFAULT_CHART_FORMAT, jobs=1):
+    """
+    Regenerate the sweep charts from a results file, without simulating.
+    
+    Args:
+        results_file: Path of a JSON Lines file written by perform_parameter_sweep
+        dpi: Resolution of the charts
+        fmt: File format of the charts
+        jobs: Number of worker processes rendering charts
+    """
+    entries = SweepResultsFile(results_file).entries()
+    if not entries:
+        raise ValueError(f"No sweep results found in {results_file}")
+    points, results = zip(*entries)
+    os.makedirs('output', exist_ok=True)
+    generate_charts(*group_results(points, results), dpi=dpi, fmt=fmt, jobs=jobs)
+
+def run_simulation(cpu_probability, quantum, num_processes=4, num_instructions=20, scheduler_type='rr', engine='step', seed=None,
+                   num_cores=1, work_stealing=False, mean_interarrival=None, io_service_times=None, lazy=False,
+                   columnar=False, per_process=True, workload=None):
     """
     Run a single simulation with the given parameters.
     
@@ -52,177 +446,307 @@ def run_simulation(cpu_probability, quantum, num_processes=4, num_instructions=2
         quantum: Time quantum for Round Robin scheduling (ignored for FCFS)
         num_processes: Number of processes to simulate
         num_instructions: Number of instructions per process
-        scheduler_type: 'fcfs' or 'rr' for the scheduler algorithm
+        scheduler_type: Scheduler algorithm, a key of SCHEDULERS ('fcfs', 'rr', 'sjf',
+                        'srtf', 'mlfq' or 'cfs')
+        engine: 'step' to execute one instruction at a time, or 'fast' to run
+                compact processes with slice-level fast-forwarding
+        seed: Seed for the workload generator (None for an unseeded run)
+        num_cores: Number of CPU cores; more than 1 requires 'fcfs' or 'rr'
+        work_stealing: Let idle cores steal work (multi-core only)
+        mean_interarrival: Mean time between process arrivals in ns for an open
+                           workload (None: every process arrives at time 0;
+                           single-core only)
+        io_service_times: Dictionary mapping blocking instructions (e.g. 'LOAD')
+                          to device service times in ns; they are then served
+                          by one simulated I/O device (None: all instructions
+                          are CPU time; single-core only)
+        lazy: Generate each process's instructions block by block on demand
+              from its own seed (LazyProcess) instead of up front
+        columnar: Keep the process table in NumPy columns (ProcessTable)
+        per_process: Include one metrics dictionary per process under
+                     'processes'; with False only the streaming summaries
+                     under 'accumulator' are returned
+        workload: Optional SharedWorkload to simulate instead of generating
+                  processes; it must have been created from the same
+                  cpu_probability, num_processes, num_instructions and seed
     
     Returns:
-        Dictionary with performance metrics
+        Dictionary with performance metrics, including 'makespan',
+        'throughput' and 'accumulator' (a MetricsAccumulator filled as the
+        processes finished). Single-core runs also report 'cpu_utilization'
+        and 'device_utilization'; multi-core runs report 'core_utilization'.
     """
+    if scheduler_type not in SCHEDULERS:
+        raise ValueError(f"Unknown scheduler type {scheduler_type!r}; expected one of {list(SCHEDULERS)}")
+    if mean_interarrival is not None and num_cores > 1:
+        raise ValueError("Arrival times are only supported with a single core")
+    if io_service_times is not None and num_cores > 1:
+        raise ValueError("Blocking I/O is only supported with a single core")
+
     # Initialize the OS model with the specified quantum
-    os_model = OperatingSystemModel(quantum=quantum)
+    accumulator = MetricsAccumulator()
+    if num_cores > 1:
+        os_model = MultiCoreOperatingSystemModel(num_cores=num_cores, quantum=quantum, work_stealing=work_stealing,
+                                                 columnar=columnar, accumulator=accumulator)
+    else:
+        os_model = OperatingSystemModel(quantum=quantum, columnar=columnar, accumulator=accumulator)
+        if io_service_times is not None:
+            os_model.add_device(Device('io', io_service_times))
     
     # Create processes
-    processes = {}
-    for i in range(1, num_processes + 1):
-        proc = create_process(i, num_instructions, cpu_probability)
-        processes[i] = proc
-        os_model.add_process(i, "PR_READY", os_model.current_time)
+    if workload is not None:
+        processes = workload.processes()
+    else:
+        processes = create_processes(num_processes, num_instructions, cpu_probability,
+                                     compact=(engine == 'fast'), rng=seed, lazy=lazy)
+    if mean_interarrival is None:
+        start_times = [os_model.current_time] * num_processes
+    else:
+        # Separate stream from the instruction generator, derived from the same seed
+        arrival_seed = None if seed is None else [seed, 1]
+        start_times = (os_model.current_time
+                       + generate_arrival_times(num_processes, mean_interarrival, rng=arrival_seed)).tolist()
+    for i, start_time in zip(processes, start_times):
+        os_model.add_process(i, "PR_READY", start_time)
     
     # Run the appropriate scheduler
-    if scheduler_type == 'fcfs':
-        fcfs_scheduler(os_model, processes)
+    if num_cores > 1:
+        multicore_scheduler(os_model, processes, policy=scheduler_type, engine=engine)
     else:
-        round_robin_scheduler(os_model, processes)
+        SCHEDULERS[scheduler_type](os_model, processes, engine=engine)
     
-    # Collect metrics
+    return _collect_metrics(os_model, accumulator, per_process)
+
+def _collect_metrics(os_model, accumulator, per_process):
+    """Build the run_simulation metrics dictionary of a finished OS model."""
     metrics = {
         'total_time': os_model.current_time,
-        'processes': []
+        'accumulator': accumulator
     }
     
-    for entry in os_model.process_table:
-        turnaround_time = entry.end_time - entry.start_time
-        waiting_time = turnaround_time - entry.cpu_time
-        metrics['processes'].append({
-            'process_id': entry.process_id,
-            'turnaround_time': turnaround_time,
-            'cpu_time': entry.cpu_time,
-            'waiting_time': waiting_time
-        })
+    if per_process:
+        metrics['processes'] = []
+        columns = process_time_columns(os_model.process_table)
+        names = list(columns)
+        for values in zip(*(columns[name].tolist() for name in names)):
+            metrics['processes'].append(dict(zip(names, values)))
+    metrics.update(os_model.metrics())
     
     return metrics
 
-def generate_charts(cpu_probabilities, quanta, fcfs_results, rr_results):
+def run_simulation_batch(workload, quanta, columnar=False, per_process=True):
     """
-    Generate and save charts of the simulation results.
+    Run Round Robin on one workload for several quanta in a single pass.
+    
+    Args:
+        workload: SharedWorkload, or a dict mapping process_id to a
+                  CompactProcess, to simulate; it is not modified
+        quanta: Sequence of Round Robin quanta in ns
+        columnar: Keep the process tables in NumPy columns (ProcessTable)
+        per_process: Include the per-process metrics dictionaries
+    
+    Returns:
+        List with one metrics dictionary per quantum, equal to what
+        run_simulation returns for the same workload with scheduler_type='rr'
+    """
+    processes = workload.processes() if isinstance(workload, SharedWorkload) else workload
+    runs = []
+    for quantum in quanta:
+        accumulator = MetricsAccumulator()
+        os_model = OperatingSystemModel(quantum=quantum, columnar=columnar, accumulator=accumulator)
+        for process_id in processes:
+            os_model.add_process(process_id, "PR_READY", os_model.current_time)
+        runs.append((os_model, accumulator))
+    round_robin_batch([os_model for os_model, _ in runs], processes)
+    return [_collect_metrics(os_model, accumulator, per_process) for os_model, accumulator in runs]
+
+def _mean_metric(result, name):
+    """Average of a per-process metric, from the streaming summary when available."""
+    if 'accumulator' in result:
+        return result['accumulator'].stats[name].mean
+    return np.mean([p[name] for p in result['processes']])
+
+def _chart_value(result, metric):
+    if metric == 'total_time':
+        return float(result['total_time'])
+    return float(_mean_metric(result, metric))
+
+def _series(label, x, values, results, name):
+    """Describe one chart series, with confidence half widths when its points are replicated."""
+    series = {'label': label, 'x': [float(v) for v in x], 'y': [float(v) for v in values], 'half_width': None}
+    if results and all('ci' in result for result in results):
+        series['half_width'] = [float(result['ci'][name]['half_width']) for result in results]
+    return series
+
+def _line_chart(xlabel, ylabel, title, series):
+    return {'kind': 'line', 'xlabel': xlabel, 'ylabel': ylabel, 'title': title, 'series': series}
+
+def chart_specs(cpu_probabilities, quanta, fcfs_results, rr_results):
+    """
+    Extract the data of every sweep chart.
     
     Args:
         cpu_probabilities: List of CPU probability values
         quanta: List of quantum values for RR
         fcfs_results: List of FCFS simulation results
         rr_results: Dictionary mapping quantum values to lists of RR simulation results
-    """
-    # --- CPU Probability Impact Charts ---
-    
-    # 1. Total Simulation Time vs CPU Probability for all schedulers
-    plt.figure(figsize=(10, 6))
-    
-    # Plot FCFS
-    fcfs_total_times = [result['total_time'] for result in fcfs_results]
-    plt.plot(cpu_probabilities, fcfs_total_times, 'o-', label='FCFS')
-    
-    # Plot RR with different quanta
-    for quantum in quanta:
-        rr_total_times = [result['total_time'] for result in rr_results[quantum]]
-        plt.plot(cpu_probabilities, rr_total_times, 'o-', label=f'RR (Q={quantum})')
     
-    plt.xlabel('CPU Instruction Probability')
-    plt.ylabel('Total Simulation Time (ns)')
-    plt.title('Impact of CPU Instruction Probability on Total Simulation Time')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig('output/total_time_vs_cpu_prob.png', dpi=300, bbox_inches='tight')
-    
-    # 2. Average Turnaround Time vs CPU Probability
-    plt.figure(figsize=(10, 6))
-    
-    # Plot FCFS
-    fcfs_avg_turnaround = [np.mean([p['turnaround_time'] for p in result['processes']]) for result in fcfs_results]
-    plt.plot(cpu_probabilities, fcfs_avg_turnaround, 'o-', label='FCFS')
-    
-    # Plot RR with different quanta
-    for quantum in quanta:
-        rr_avg_turnaround = [np.mean([p['turnaround_time'] for p in result['processes']]) for result in rr_results[quantum]]
-        plt.plot(cpu_probabilities, rr_avg_turnaround, 'o-', label=f'RR (Q={quantum})')
-    
-    plt.xlabel('CPU Instruction Probability')
-    plt.ylabel('Average Turnaround Time (ns)')
-    plt.title('Impact of CPU Instruction Probability on Average Turnaround Time')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig('output/avg_turnaround_vs_cpu_prob.png', dpi=300, bbox_inches='tight')
-    
-    # 3. Average Waiting Time vs CPU Probability
-    plt.figure(figsize=(10, 6))
-    
-    # Plot FCFS
-    fcfs_avg_waiting = [np.mean([p['waiting_time'] for p in result['processes']]) for result in fcfs_results]
-    plt.plot(cpu_probabilities, fcfs_avg_waiting, 'o-', label='FCFS')
-    
-    # Plot RR with different quanta
-    for quantum in quanta:
-        rr_avg_waiting = [np.mean([p['waiting_time'] for p in result['processes']]) for result in rr_results[quantum]]
-        plt.plot(cpu_probabilities, rr_avg_waiting, 'o-', label=f'RR (Q={quantum})')
+    Returns:
+        Dictionary mapping each chart's file name (without extension) to a
+        JSON-serializable description of it, as rendered by render_chart
+    """
+    charts = {}
     
-    plt.xlabel('CPU Instruction Probability')
-    plt.ylabel('Average Waiting Time (ns)')
-    plt.title('Impact of CPU Instruction Probability on Average Waiting Time')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig('output/avg_waiting_vs_cpu_prob.png', dpi=300, bbox_inches='tight')
+    # --- CPU Probability Impact Charts ---
+    for name, metric, ylabel in (('total_time_vs_cpu_prob', 'total_time', 'Total Simulation Time'),
+                                 ('avg_turnaround_vs_cpu_prob', 'turnaround_time', 'Average Turnaround Time'),
+                                 ('avg_waiting_vs_cpu_prob', 'waiting_time', 'Average Waiting Time')):
+        series = [_series('FCFS', cpu_probabilities, [_chart_value(result, metric) for result in fcfs_results],
+                          fcfs_results, metric)]
+        # RR with different quanta
+        for quantum in quanta:
+            series.append(_series(f'RR (Q={quantum})', cpu_probabilities,
+                                  [_chart_value(result, metric) for result in rr_results[quantum]],
+                                  rr_results[quantum], metric))
+        charts[name] = _line_chart('CPU Instruction Probability', f'{ylabel} (ns)',
+                                   f'Impact of CPU Instruction Probability on {ylabel}', series)
     
     # --- Quantum Impact Charts (for RR only) ---
+    for name, metric, ylabel in (('total_time_vs_quantum', 'total_time', 'Total Simulation Time'),
+                                 ('avg_turnaround_vs_quantum', 'turnaround_time', 'Average Turnaround Time'),
+                                 ('avg_waiting_vs_quantum', 'waiting_time', 'Average Waiting Time')):
+        series = []
+        for i, cpu_prob in enumerate(cpu_probabilities):
+            results = [rr_results[quantum][i] for quantum in quanta]
+            series.append(_series(f'CPU Prob={cpu_prob:.1f}', quanta,
+                                  [_chart_value(result, metric) for result in results], results, metric))
+        charts[name] = _line_chart('Round Robin Quantum (ns)', f'{ylabel} (ns)',
+                                   f'Impact of Round Robin Quantum on {ylabel}', series)
+    
+    # Heatmap of avg turnaround time for RR
+    charts['turnaround_heatmap'] = {
+        'kind': 'heatmap',
+        'data': [[_chart_value(rr_results[quantum][i], 'turnaround_time') for quantum in quanta]
+                 for i in range(len(cpu_probabilities))],
+        'xticklabels': [f'{q}' for q in quanta],
+        'yticklabels': [f'{p:.1f}' for p in cpu_probabilities],
+        'colorbar': 'Average Turnaround Time (ns)',
+        'xlabel': 'Round Robin Quantum (ns)',
+        'ylabel': 'CPU Instruction Probability',
+        'title': 'Heatmap of Average Turnaround Time',
+    }
+    return charts
+
+def render_chart(chart, path, dpi=DEFAULT_CHART_DPI):
+    """
+    Draw one chart described by chart_specs and save it.
+    The figure is closed afterwards, so rendering many charts does not
+    accumulate figure memory.
     
-    # 4. Total Simulation Time vs Quantum for different CPU probabilities
-    plt.figure(figsize=(10, 6))
-    
-    for i, cpu_prob in enumerate(cpu_probabilities):
-        total_times = [rr_results[quantum][i]['total_time'] for quantum in quanta]
-        plt.plot(quanta, total_times, 'o-', label=f'CPU Prob={cpu_prob:.1f}')
-    
-    plt.xlabel('Round Robin Quantum (ns)')
-    plt.ylabel('Total Simulation Time (ns)')
-    plt.title('Impact of Round Robin Quantum on Total Simulation Time')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig('output/total_time_vs_quantum.png', dpi=300, bbox_inches='tight')
-    
-    # 5. Average Turnaround Time vs Quantum
-    plt.figure(figsize=(10, 6))
-    
-    for i, cpu_prob in enumerate(cpu_probabilities):
-        avg_turnaround = [np.mean([p['turnaround_time'] for p in rr_results[quantum][i]['processes']]) for quantum in quanta]
-        plt.plot(quanta, avg_turnaround, 'o-', label=f'CPU Prob={cpu_prob:.1f}')
-    
-    plt.xlabel('Round Robin Quantum (ns)')
-    plt.ylabel('Average Turnaround Time (ns)')
-    plt.title('Impact of Round Robin Quantum on Average Turnaround Time')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig('output/avg_turnaround_vs_quantum.png', dpi=300, bbox_inches='tight')
-    
-    # 6. Average Waiting Time vs Quantum
-    plt.figure(figsize=(10, 6))
-    
-    for i, cpu_prob in enumerate(cpu_probabilities):
-        avg_waiting = [np.mean([p['waiting_time'] for p in rr_results[quantum][i]['processes']]) for quantum in quanta]
-        plt.plot(quanta, avg_waiting, 'o-', label=f'CPU Prob={cpu_prob:.1f}')
-    
-    plt.xlabel('Round Robin Quantum (ns)')
-    plt.ylabel('Average Waiting Time (ns)')
-    plt.title('Impact of Round Robin Quantum on Average Waiting Time')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig('output/avg_waiting_vs_quantum.png', dpi=300, bbox_inches='tight')
-    
-    # Create a heatmap of avg turnaround time for RR
+    Args:
+        chart: Chart description from chart_specs
+        path: File the chart is saved to; its extension selects the format
+        dpi: Resolution of raster formats
+    """
     plt.figure(figsize=(10, 6))
-    heatmap_data = np.zeros((len(cpu_probabilities), len(quanta)))
-    
-    for i, cpu_prob in enumerate(cpu_probabilities):
-        for j, quantum in enumerate(quanta):
-            avg_turnaround = np.mean([p['turnaround_time'] for p in rr_results[quantum][i]['processes']])
-            heatmap_data[i, j] = avg_turnaround
-    
-    plt.imshow(heatmap_data, cmap='hot', aspect='auto', origin='lower')
-    plt.colorbar(label='Average Turnaround Time (ns)')
-    
-    # Set x and y tick labels
-    plt.xticks(np.arange(len(quanta)), [f'{q}' for q in quanta])
-    plt.yticks(np.arange(len(cpu_probabilities)), [f'{p:.1f}' for p in cpu_probabilities])
+    try:
+        if chart['kind'] == 'heatmap':
+            plt.imshow(np.array(chart['data']), cmap='hot', aspect='auto', origin='lower')
+            plt.colorbar(label=chart['colorbar'])
+            plt.xticks(np.arange(len(chart['xticklabels'])), chart['xticklabels'])
+            plt.yticks(np.arange(len(chart['yticklabels'])), chart['yticklabels'])
+        else:
+            for series in chart['series']:
+                lines = plt.plot(series['x'], series['y'], 'o-', label=series['label'])
+                if series['half_width'] is not None:
+                    # Shaded confidence band of replicated points
+                    values = np.array(series['y'])
+                    half_widths = np.array(series['half_width'])
+                    half_widths[~np.isfinite(half_widths)] = np.nan
+                    plt.fill_between(series['x'], values - half_widths, values + half_widths,
+                                     color=lines[0].get_color(), alpha=0.2)
+            plt.legend()
+            plt.grid(True)
+        plt.xlabel(chart['xlabel'])
+        plt.ylabel(chart['ylabel'])
+        plt.title(chart['title'])
+        plt.savefig(path, dpi=dpi, bbox_inches='tight')
+    finally:
+        plt.close()
+
+def chart_hash(chart, dpi=DEFAULT_CHART_DPI, fmt=DEFAULT_CHART_FORMAT):
+    """Hash of a chart's data, its output settings and the rendering code."""
+    payload = json.dumps({'chart': chart, 'dpi': dpi, 'format': fmt, 'renderer': inspect.getsource(render_chart)},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _load_chart_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def generate_charts(cpu_probabilities, quanta, fcfs_results, rr_results, output_dir='output', dpi=DEFAULT_CHART_DPI,
+                    fmt=DEFAULT_CHART_FORMAT, jobs=1):
+    """
+    Generate and save charts of the simulation results.
+    A chart whose data and settings hash to the value recorded in
+    CHART_MANIFEST at its last rendering, and whose file still exists, is
+    not rendered again.
     
-    plt.xlabel('Round Robin Quantum (ns)')
-    plt.ylabel('CPU Instruction Probability')
-    plt.title('Heatmap of Average Turnaround Time')
-    plt.savefig('output/turnaround_heatmap.png', dpi=300, bbox_inches='tight')
+    Args:
+        cpu_probabilities: List of CPU probability values
+        quanta: List of quantum values for RR
+        fcfs_results: List of FCFS simulation results
+        rr_results: Dictionary mapping quantum values to lists of RR simulation results
+        output_dir: Directory the charts are saved to
+        dpi: Resolution of raster formats
+        fmt: File format and extension ('png', 'svg', 'pdf', ...)
+        jobs: Number of worker processes rendering charts in parallel
     
-    print("Charts have been generated and saved to the 'output' directory.") 
\ No newline at end of file
+    Returns:
+        List of the paths of the charts that were rendered
+    """
+    manifest_path = os.path.join(output_dir, CHART_MANIFEST)
+    manifest = _load_chart_manifest(manifest_path)
+    charts = chart_specs(cpu_probabilities, quanta, fcfs_results, rr_results)
+    pending = {}
+    for name, chart in charts.items():
+        path = os.path.join(output_dir, f'{name}.{fmt}')
+        digest = chart_hash(chart, dpi, fmt)
+        if manifest.get(path) == digest and os.path.exists(path):
+            continue
+        pending[path] = (chart, digest)
+    
+    stamps = {path: _file_stamp(path) for path in pending}
+    # More workers than cores only adds process start-up time
+    workers = min(jobs, len(pending), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(render_chart, chart, path, dpi) for path, (chart, _) in pending.items()]
+            for future in futures:
+                future.result()
+    else:
+        for path, (chart, _) in pending.items():
+            render_chart(chart, path, dpi)
+    
+    # Only charts whose file was actually written are recorded as up to date
+    written = {path: digest for path, (_, digest) in pending.items()
+               if _file_stamp(path) not in (None, stamps[path])}
+    if written:
+        manifest.update(written)
+        os.makedirs(output_dir, exist_ok=True)
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+    skipped = len(charts) - len(pending)
+    note = f" ({skipped} unchanged chart(s) skipped)" if skipped else ""
+    print(f"Charts have been generated and saved to the '{output_dir}' directory{note}.")
+    return list(pending) 
\ No newline at end of file
@@ -1,36 +1,178 @@
-import random
-from models.process import Process, INSTRUCTION_COSTS
+import os
+import numpy as np
+from models.process import Process, CompactProcess, MappedProcess, ChunkedProcess, INSTRUCTION_COSTS, OPCODES, OPCODE_COSTS, decode_opcodes
 
-def generate_instructions(num_instructions, cpu_probability):
+# Instructions generated per block by a LazyProcess
+LAZY_BLOCK_SIZE = 4096
+# Placeholder for block costs a LazyProcess has not generated yet; being the
+# largest int64, it keeps the cost index sorted for binary search
+_UNKNOWN_COST = np.iinfo(np.int64).max
+
+# Define CPU and memory instruction types
+CPU_INSTRUCTIONS = ['ADD', 'SUB', 'MUL', 'DIV']
+MEMORY_INSTRUCTIONS = ['LOAD', 'STORE']
+CPU_OPCODES = np.array([OPCODES[instr] for instr in CPU_INSTRUCTIONS], dtype=np.uint8)
+MEMORY_OPCODES = np.array([OPCODES[instr] for instr in MEMORY_INSTRUCTIONS], dtype=np.uint8)
+
+def generate_opcode_batch(num_processes, num_instructions, cpu_probability, rng=None):
+    """
+    Generate the opcodes for a whole batch of processes in a few array operations.
+    
+    Args:
+        num_processes: Number of processes in the batch
+        num_instructions: Number of instructions per process
+        cpu_probability: Probability of generating a CPU instruction (0.0 to 1.0)
+                         Higher values mean more CPU-intensive workload
+        rng: Seed or numpy.random.Generator (None for an unseeded generator)
+    
+    Returns:
+        A uint8 array of shape (num_processes, num_instructions)
+    """
+    rng = np.random.default_rng(rng)
+    shape = (num_processes, num_instructions)
+    # Decide whether to generate a CPU or memory instruction
+    is_cpu = rng.random(shape) < cpu_probability
+    # One uniform draw over the 4 CPU instructions; its low bit is a uniform
+    # draw over the 2 memory instructions.
+    choice = rng.integers(0, len(CPU_INSTRUCTIONS), size=shape, dtype=np.uint8)
+    return np.where(is_cpu, CPU_OPCODES[choice], MEMORY_OPCODES[choice & 1])
+
+def generate_opcodes(num_instructions, cpu_probability, rng=None):
+    """
+    Generate the opcodes for a single process.
+    
+    Args:
+        num_instructions: Number of instructions to generate
+        cpu_probability: Probability of generating a CPU instruction (0.0 to 1.0)
+        rng: Seed or numpy.random.Generator (None for an unseeded generator)
+    
+    Returns:
+        A uint8 opcode array
+    """
+    return generate_opcode_batch(1, num_instructions, cpu_probability, rng=rng)[0]
+
+def generate_instructions(num_instructions, cpu_probability, rng=None):
     """
     Generate a list of instructions based on the probability of CPU vs memory instructions.
+    String-output compatibility shim around generate_opcodes.
     
     Args:
         num_instructions: Number of instructions to generate
         cpu_probability: Probability of generating a CPU instruction (0.0 to 1.0)
                          Higher values mean more CPU-intensive workload
+        rng: Seed or numpy.random.Generator (None for an unseeded generator)
     
     Returns:
         A list of instructions as strings
     """
-    instructions = []
+    return decode_opcodes(generate_opcodes(num_instructions, cpu_probability, rng=rng))
+
+def generate_arrival_times(num_processes, mean_interarrival, rng=None):
+    """
+    Generate the arrival times of an open workload as a Poisson process.
     
-    # Define CPU and memory instruction types
-    cpu_instructions = ['ADD', 'SUB', 'MUL', 'DIV']
-    memory_instructions = ['LOAD', 'STORE']
+    Args:
+        num_processes: Number of arrival times to generate
+        mean_interarrival: Mean time between consecutive arrivals in nanoseconds
+        rng: Seed or numpy.random.Generator (None for an unseeded generator)
     
-    for _ in range(num_instructions):
-        # Decide whether to generate a CPU or memory instruction
-        if random.random() < cpu_probability:
-            # Generate a CPU instruction
-            instructions.append(random.choice(cpu_instructions))
-        else:
-            # Generate a memory instruction
-            instructions.append(random.choice(memory_instructions))
+    Returns:
+        A non-decreasing int64 array of arrival times; the first one is 0
+    """
+    rng = np.random.default_rng(rng)
+    gaps = rng.exponential(mean_interarrival, size=num_processes)
+    gaps[:1] = 0
+    return np.cumsum(gaps).astype(np.int64)
+
+def block_generator(seed, block):
+    """
+    Return the counter-based generator for one block of a lazy process.
+    Philox maps (key, counter) to random numbers directly, so any block can
+    be generated on its own: the seed is the key, and the block number
+    selects a disjoint 2**64-wide range of the counter.
+    
+    Args:
+        seed: Process seed (0 <= seed < 2**64)
+        block: Block number
     
-    return instructions
+    Returns:
+        A numpy.random.Generator
+    """
+    return np.random.Generator(np.random.Philox(key=seed, counter=[0, block, 0, 0]))
+
+class LazyProcess(ChunkedProcess):
+    def __init__(self, process_id, seed, cpu_probability, num_instructions, block_size=LAZY_BLOCK_SIZE):
+        """Initialize a process defined by (seed, cpu_probability, num_instructions).
+        
+        Instructions are generated block by block with block_generator, on
+        demand as the program counter advances, so no instruction list is
+        ever materialized. Block costs are only computed as far as the
+        scheduler looks ahead. The same arguments always give the same
+        instructions (see materialize).
+        
+        Args:
+            process_id: Unique ID for the process
+            seed: Seed of the process (0 <= seed < 2**64)
+            cpu_probability: Probability of generating a CPU instruction (0.0 to 1.0)
+            num_instructions: Number of instructions
+            block_size: Number of instructions generated per block
+        """
+        num_blocks = -(-num_instructions // block_size)
+        block_costs = np.full(num_blocks + 1, _UNKNOWN_COST, dtype=np.int64)
+        block_costs[0] = 0
+        super().__init__(process_id, num_instructions, block_costs, block_size)
+        self.seed = seed
+        self.cpu_probability = cpu_probability
+        self._known_blocks = 0  # block_costs[:_known_blocks + 1] are known
+
+    @property
+    def indexed_blocks(self):
+        """Number of leading blocks whose cost has been computed."""
+        return self._known_blocks
+
+    def _read_chunk(self, block):
+        start = block * self.block_size
+        length = min(self.block_size, self.num_instructions - start)
+        return generate_opcodes(length, self.cpu_probability, rng=block_generator(self.seed, block))
+
+    def _extend_index(self, limit=None, block=None):
+        # Compute block costs until one exceeds limit or block is covered
+        num_blocks = len(self.block_costs) - 1
+        while self._known_blocks < num_blocks and (
+                (limit is not None and self.block_costs[self._known_blocks] <= limit)
+                or (block is not None and self._known_blocks < block)):
+            known = self._known_blocks
+            cost = int(OPCODE_COSTS[self._block_opcodes(known)].sum())
+            self.block_costs[known + 1] = self.block_costs[known] + cost
+            self._known_blocks += 1
+
+    def _prefix_cost(self, index):
+        self._extend_index(block=index // self.block_size)
+        return super()._prefix_cost(index)
+
+    def execute_slice(self, budget):
+        """
+        Execute instructions while the next one fits in the remaining budget,
+        generating the cost index only as far as the budget reaches.
+        :param budget: Time available in nanoseconds.
+        :return: Total cost of the executed instructions.
+        """
+        if budget <= 0 or self.is_finished():
+            return 0
+        self._extend_index(limit=self._prefix_cost(self.pc) + budget)
+        return super().execute_slice(budget)
+
+    def materialize(self):
+        """
+        Reconstruct the whole process as a CompactProcess, for debugging.
+        
+        Returns:
+            A CompactProcess with the same ID and instructions
+        """
+        return CompactProcess(self.process_id, np.concatenate([opcodes for _, opcodes in self._all_chunks()]
+                                                              or [np.zeros(0, dtype=np.uint8)]))
 
-def create_process(process_id, num_instructions, cpu_probability):
+def create_process(process_id, num_instructions, cpu_probability, compact=False, rng=None):
     """
     Create a process with instructions generated based on the given CPU probability.
     
@@ -38,9 +180,100 @@ def create_process(process_id, num_instructions, cpu_probability):
         process_id: Unique ID for the process
         num_instructions: Number of instructions to generate
         cpu_probability: Probability of generating CPU instructions (0.0 to 1.0)
+        compact: If True, return a CompactProcess instead of a string-based Process
+        rng: Seed or numpy.random.Generator used to generate the instructions
     
     Returns:
         A Process instance with the generated instructions
     """
-    instructions = generate_instructions(num_instructions, cpu_probability)
-    return Process(process_id, instructions) 
\ No newline at end of file
+    opcodes = generate_opcodes(num_instructions, cpu_probability, rng=rng)
+    if compact:
+        return CompactProcess(process_id, opcodes)
+    return Process(process_id, decode_opcodes(opcodes))
+
+def create_processes(num_processes, num_instructions, cpu_probability, compact=False, rng=None, lazy=False):
+    """
+    Create a batch of processes with IDs 1..num_processes, drawing all
+    opcodes in a single generate_opcode_batch call.
+    
+    Args:
+        num_processes: Number of processes to create
+        num_instructions: Number of instructions per process
+        cpu_probability: Probability of generating CPU instructions (0.0 to 1.0)
+        compact: If True, create CompactProcess instances (views into the batch)
+        rng: Seed or numpy.random.Generator used to generate the instructions
+        lazy: If True, create LazyProcess instances instead, each with its
+              own seed drawn from rng, and generate no instructions up front
+    
+    Returns:
+        A dict mapping process_id to a Process instance
+    """
+    if lazy:
+        seeds = np.random.default_rng(rng).integers(0, 2**63, size=num_processes).tolist()
+        return {process_id: LazyProcess(process_id, seed, cpu_probability, num_instructions)
+                for process_id, seed in enumerate(seeds, start=1)}
+    batch = generate_opcode_batch(num_processes, num_instructions, cpu_probability, rng=rng)
+    processes = {}
+    for process_id, opcodes in enumerate(batch, start=1):
+        if compact:
+            processes[process_id] = CompactProcess(process_id, opcodes)
+        else:
+            processes[process_id] = Process(process_id, decode_opcodes(opcodes))
+    return processes
+
+class SharedWorkload:
+    def __init__(self, path, num_processes, num_instructions, cpu_probability):
+        """
+        Describe a workload stored once in a memory-mapped opcode file.
+        The description is small and picklable; it is what gets sent to
+        worker processes, which map the file instead of generating or
+        receiving the opcodes.
+        
+        Args:
+            path: Path of the .npy file holding a uint8 array of shape
+                  (num_processes, num_instructions)
+            num_processes: Number of processes in the workload
+            num_instructions: Number of instructions per process
+            cpu_probability: CPU instruction probability the workload was generated with
+        """
+        self.path = path
+        self.num_processes = num_processes
+        self.num_instructions = num_instructions
+        self.cpu_probability = cpu_probability
+    
+    @classmethod
+    def create(cls, directory, num_processes, num_instructions, cpu_probability, rng=None):
+        """
+        Generate a workload and write it to a new file in directory.
+        The opcodes are the same as create_processes draws for the same rng.
+        
+        Args:
+            directory: Directory for the opcode file (e.g. a temporary directory)
+            num_processes: Number of processes to generate
+            num_instructions: Number of instructions per process
+            cpu_probability: Probability of generating CPU instructions (0.0 to 1.0)
+            rng: Seed or numpy.random.Generator used to generate the instructions
+        
+        Returns:
+            A SharedWorkload describing the file
+        """
+        batch = generate_opcode_batch(num_processes, num_instructions, cpu_probability, rng=rng)
+        path = os.path.join(directory, f"workload_{len(os.listdir(directory))}.npy")
+        np.save(path, batch)
+        return cls(path, num_processes, num_instructions, cpu_probability)
+    
+    def opcodes(self):
+        """Return the read-only memory-mapped opcode array, without copying it."""
+        return np.load(self.path, mmap_mode='r')
+    
+    def processes(self):
+        """
+        Create the workload's processes with IDs 1..num_processes.
+        
+        Returns:
+            A dict mapping process_id to a MappedProcess whose opcodes are a
+            view of one row of the mapped file; every process (and every
+            worker) mapping the same file shares its pages
+        """
+        return {process_id: MappedProcess(process_id, opcodes)
+                for process_id, opcodes in enumerate(self.opcodes(), start=1)}
@@ -0,0 +1,214 @@
+import math
+import os
+import tempfile
+from collections import namedtuple
+import numpy as np
+import matplotlib.pyplot as plt
+from utils.parameter_sweep import run_simulation, run_simulation_batch, DEFAULT_CHART_DPI, DEFAULT_CHART_FORMAT
+from utils.process_generator import SharedWorkload
+
+# Search methods accepted by find_best_quantum
+SEARCH_METHODS = ('golden', 'grid')
+# Quantities that can be minimized: per-process metrics (summarized by the
+# accumulator) and the total simulation time. CPU time is left out because it
+# does not depend on the quantum.
+OBJECTIVES = ('turnaround_time', 'waiting_time', 'total_time')
+# Quanta evaluated per refinement step of the grid method
+GRID_POINTS = 5
+_INVERSE_GOLDEN_RATIO = (math.sqrt(5) - 1) / 2
+
+QuantumSearchResult = namedtuple('QuantumSearchResult', ['best_quantum', 'best_value', 'trace'])
+QuantumSearchResult.__doc__ = """Outcome of find_best_quantum.
+
+best_quantum: Quantum with the lowest objective value found
+best_value: Objective value at best_quantum
+trace: List of (quantum, value) pairs in evaluation order, one per simulation run
+"""
+
+def objective_value(metrics, objective='turnaround_time', statistic='mean'):
+    """
+    Extract the value to minimize from run_simulation metrics.
+
+    Args:
+        metrics: Metrics dictionary returned by run_simulation
+        objective: One of OBJECTIVES
+        statistic: Summary statistic of a per-process objective ('mean',
+                   'p50', 'p95' or 'p99'); ignored for 'total_time'
+
+    Returns:
+        The objective value as a float
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective!r}; expected one of {OBJECTIVES}")
+    if objective == 'total_time':
+        return float(metrics['total_time'])
+    return float(metrics['accumulator'].summary()[objective][statistic])
+
+class _Evaluator:
+    # Memoized objective over integer quanta, recording every new evaluation
+    def __init__(self, evaluate_many, objective, statistic):
+        self.evaluate_many = evaluate_many
+        self.objective = objective
+        self.statistic = statistic
+        self.values = {}
+        self.trace = []
+
+    def __call__(self, *quanta):
+        missing = sorted({quantum for quantum in quanta if quantum not in self.values})
+        if missing:
+            for quantum, metrics in zip(missing, self.evaluate_many(missing)):
+                value = objective_value(metrics, self.objective, self.statistic)
+                self.values[quantum] = value
+                self.trace.append((quantum, value))
+        values = [self.values[quantum] for quantum in quanta]
+        return values[0] if len(values) == 1 else values
+
+    def best(self):
+        quantum = min(self.values, key=lambda q: (self.values[q], q))
+        return quantum, self.values[quantum]
+
+def _golden_section(evaluate, lower, upper, tolerance):
+    # Shrink [lower, upper] by the golden ratio, reusing one interior point per step
+    a, b = lower, upper
+    c = round(b - _INVERSE_GOLDEN_RATIO * (b - a))
+    d = round(a + _INVERSE_GOLDEN_RATIO * (b - a))
+    while b - a > tolerance and c < d:
+        if evaluate(c) <= evaluate(d):
+            b, d = d, c
+            c = round(b - _INVERSE_GOLDEN_RATIO * (b - a))
+        else:
+            a, c = c, d
+            d = round(a + _INVERSE_GOLDEN_RATIO * (b - a))
+    # Settle the final bracket
+    evaluate(*sorted({a, c, d, b}))
+
+def _grid_refinement(evaluate, lower, upper, tolerance, grid_points):
+    # Evaluate a coarse grid, then zoom in around its best point
+    a, b = lower, upper
+    while True:
+        grid = sorted({int(round(q)) for q in np.linspace(a, b, grid_points)})
+        values = evaluate(*grid) if len(grid) > 1 else [evaluate(*grid)]
+        step = (b - a) / (grid_points - 1)
+        if step <= tolerance or len(grid) < grid_points:
+            return
+        best = grid[int(np.argmin(values))]
+        a, b = max(lower, round(best - step)), min(upper, round(best + step))
+
+def find_best_quantum(cpu_probability, lower=100, upper=1000, tolerance=10, objective='turnaround_time',
+                      statistic='mean', method='golden', num_processes=16, num_instructions=32000, seed=0,
+                      engine='fast', grid_points=GRID_POINTS):
+    """
+    Search for the Round Robin quantum that minimizes an objective.
+    Every evaluation simulates the same workload, generated once from seed,
+    so differences between quanta are not sampling noise.
+
+    Args:
+        cpu_probability: Probability of generating CPU instructions
+        lower: Smallest quantum considered in ns
+        upper: Largest quantum considered in ns
+        tolerance: Stop once the remaining interval (golden) or grid spacing
+                   (grid) is at most this many ns
+        objective: Quantity to minimize, one of OBJECTIVES
+        statistic: Summary statistic of per-process objectives ('mean',
+                   'p50', 'p95' or 'p99')
+        method: 'golden' for golden-section search, which assumes a
+                unimodal objective and needs about log(range / tolerance) / 0.21
+                runs, or 'grid' for successive grid refinement, which is
+                more robust to local minima
+        num_processes: Number of processes in the workload
+        num_instructions: Number of instructions per process
+        seed: Seed of the workload
+        engine: Simulation engine ('step' or 'fast'); the grid method runs
+                each grid through run_simulation_batch instead
+        grid_points: Quanta per grid refinement step (at least 3)
+
+    Returns:
+        A QuantumSearchResult with the best quantum, its objective value and
+        the evaluation trace
+    """
+    if method not in SEARCH_METHODS:
+        raise ValueError(f"Unknown search method {method!r}; expected one of {SEARCH_METHODS}")
+    if not 0 < lower <= upper:
+        raise ValueError("The search interval must satisfy 0 < lower <= upper")
+    if grid_points < 3:
+        raise ValueError("grid_points must be at least 3")
+    tolerance = max(tolerance, 1)
+    with tempfile.TemporaryDirectory(prefix='quantum_search_') as directory:
+        workload = SharedWorkload.create(directory, num_processes, num_instructions, cpu_probability, rng=seed)
+
+        def evaluate_many(quanta):
+            if len(quanta) > 1:
+                return run_simulation_batch(workload, quanta, per_process=False)
+            return [run_simulation(cpu_probability, quanta[0], num_processes=num_processes,
+                                   num_instructions=num_instructions, scheduler_type='rr', engine=engine,
+                                   seed=seed, per_process=False, workload=workload)]
+
+        evaluate = _Evaluator(evaluate_many, objective, statistic)
+        if method == 'golden':
+            _golden_section(evaluate, int(lower), int(upper), tolerance)
+        else:
+            _grid_refinement(evaluate, int(lower), int(upper), tolerance, grid_points)
+    best_quantum, best_value = evaluate.best()
+    return QuantumSearchResult(best_quantum, best_value, evaluate.trace)
+
+def plot_quantum_search(results, objective='turnaround_time', path=None, dpi=DEFAULT_CHART_DPI,
+                        fmt=DEFAULT_CHART_FORMAT):
+    """
+    Plot the evaluation traces of several quantum searches.
+
+    Args:
+        results: Dictionary mapping a label (e.g. the CPU probability) to a
+                 QuantumSearchResult
+        objective: Name of the minimized objective, for the axis label
+        path: File the chart is saved to (default: output/quantum_search.<fmt>)
+        dpi: Resolution of raster formats
+        fmt: File format, used for the default path
+
+    Returns:
+        The path of the saved chart
+    """
+    if path is None:
+        path = os.path.join('output', f'quantum_search.{fmt}')
+    plt.figure(figsize=(10, 6))
+    for label, result in results.items():
+        quanta, values = zip(*sorted(result.trace))
+        lines = plt.plot(quanta, values, 'o-', label=str(label))
+        plt.plot([result.best_quantum], [result.best_value], '*', markersize=14, color=lines[0].get_color())
+    plt.xlabel('Round Robin Quantum (ns)')
+    plt.ylabel(objective.replace('_', ' ').title() + ' (ns)')
+    plt.title('Adaptive Quantum Search (stars mark the best quantum)')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+    return path
+
+def perform_quantum_search(objective='turnaround_time', method='golden', tolerance=10, seed=0, engine='fast',
+                           chart_dpi=DEFAULT_CHART_DPI, chart_format=DEFAULT_CHART_FORMAT):
+    """
+    Find the best Round Robin quantum for each CPU probability of the
+    parameter sweep, print it and plot the evaluation traces.
+
+    Args:
+        objective: Quantity to minimize, one of OBJECTIVES
+        method: Search method, one of SEARCH_METHODS
+        tolerance: Resolution of the search in ns
+        seed: Seed of the workloads
+        engine: Simulation engine for single evaluations
+        chart_dpi: Resolution of the trace chart
+        chart_format: File format of the trace chart
+
+    Returns:
+        Dictionary mapping each CPU probability to its QuantumSearchResult
+    """
+    os.makedirs('output', exist_ok=True)
+    results = {}
+    for cpu_probability in np.arange(0, 1, 0.1).round(1).tolist():
+        result = find_best_quantum(cpu_probability, tolerance=tolerance, objective=objective, method=method,
+                                   seed=seed, engine=engine)
+        print(f"[RR] cpu_probability = {cpu_probability:.1f}: best quantum = {result.best_quantum} ns "
+              f"({objective} = {result.best_value:.0f} ns, {len(result.trace)} runs)")
+        results[cpu_probability] = result
+    path = plot_quantum_search(results, objective, dpi=chart_dpi, fmt=chart_format)
+    print(f"The search traces have been saved to '{path}'.")
+    return results
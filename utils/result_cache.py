@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import numpy as np
+
+# Default location and size bound of the sweep result cache
+DEFAULT_CACHE_DIR = '.sweep_cache'
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+CACHE_EXTENSION = '.pkl'
+# Source trees whose contents determine simulation results; chart code is
+# deliberately left out so re-plotting does not invalidate the cache
+SIMULATOR_SOURCES = ('models', 'utils/process_generator.py', 'utils/metrics.py', 'utils/trace_file.py')
+
+def code_version(root=None, sources=SIMULATOR_SOURCES, extra=()):
+    """
+    Hash the simulator source code.
+
+    Args:
+        root: Repository root the sources are relative to (default: the parent
+              of this file's directory)
+        sources: Python files or directories (searched recursively) to hash
+        extra: Additional strings to include, such as the source of the
+               function that drives a simulation
+
+    Returns:
+        A hex SHA-256 digest that changes whenever any hashed file changes
+    """
+    if root is None:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths = []
+    for source in sources:
+        path = os.path.join(root, source)
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(d for d in dirnames if d != '__pycache__')
+                paths.extend(os.path.join(dirpath, name) for name in sorted(filenames) if name.endswith('.py'))
+        elif os.path.exists(path):
+            paths.append(path)
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.relpath(path, root).encode())
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    for text in extra:
+        digest.update(text.encode())
+    return digest.hexdigest()
+
+def canonical_params(value):
+    """
+    Convert simulation parameters to plain JSON-compatible values, so equal
+    values serialize (and hash) equally whether they are Python or NumPy scalars.
+    """
+    if isinstance(value, dict):
+        return {str(key): canonical_params(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [canonical_params(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+class ResultCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_BYTES, version=None):
+        """Initialize an on-disk cache of simulation results.
+
+        Args:
+            directory: Directory holding one file per cached result
+                       (default: DEFAULT_CACHE_DIR)
+            max_bytes: Total size above which the least recently used
+                       results are evicted (default: DEFAULT_CACHE_BYTES)
+            version: Simulator code version mixed into every key
+                     (default: code_version())
+
+        Note:
+            Results are content-addressed: the file name is a hash of the
+            simulation parameters and the code version, so editing the
+            simulator makes old entries unreachable instead of stale, and the
+            LRU eviction removes them over time. A hit refreshes the file's
+            modification time, which is the recency used for eviction.
+            Writes go through a temporary file and os.replace, so concurrent
+            writers never leave a partial result behind.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = code_version() if version is None else version
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, params):
+        """Return the cache key of a parameter dictionary.
+
+        Args:
+            params: Keyword arguments of the simulation (e.g. for run_simulation)
+        """
+        payload = json.dumps({'version': self.version, 'params': canonical_params(params)}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + CACHE_EXTENSION)
+
+    def get(self, params):
+        """Return the cached result for params, or None on a miss.
+
+        Args:
+            params: Keyword arguments of the simulation
+        """
+        path = self._path(self.key(params))
+        try:
+            with open(path, 'rb') as f:
+                result = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return result
+
+    def put(self, params, result):
+        """Store the result for params, then evict down to max_bytes.
+
+        Args:
+            params: Keyword arguments of the simulation
+            result: Picklable simulation result
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(self.key(params)))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if item.name.endswith(CACHE_EXTENSION):
+                    stat = item.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, item.path))
+        return entries
+
+    def size(self):
+        """Total size in bytes of the cached results."""
+        return sum(size for _, size, _ in self._entries())
+
+    def __len__(self):
+        return len(self._entries())
+
+    def evict(self):
+        """Remove least recently used results until the cache fits max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Remove every cached result."""
+        for _, _, path in self._entries():
+            os.remove(path)
@@ -0,0 +1,98 @@
+import json
+import os
+import numpy as np
+from utils.metrics import MetricsAccumulator
+from utils.result_cache import canonical_params
+
+# Default file the parameter sweep streams its finished grid points to
+DEFAULT_RESULTS_FILE = 'output/sweep_results.jsonl'
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def point_key(point):
+    """Return a string identifying a grid point by all of its parameters."""
+    return json.dumps(canonical_params(point), sort_keys=True)
+
+def encode_metrics(metrics):
+    """Return a JSON-serializable copy of a run_simulation metrics dictionary."""
+    encoded = dict(metrics)
+    if 'accumulator' in encoded:
+        encoded['accumulator'] = encoded['accumulator'].to_dict()
+    return encoded
+
+def decode_metrics(encoded):
+    """Rebuild a metrics dictionary written by encode_metrics."""
+    metrics = dict(encoded)
+    if 'accumulator' in metrics:
+        metrics['accumulator'] = MetricsAccumulator.from_dict(metrics['accumulator'])
+    return metrics
+
+class SweepResultsFile:
+    def __init__(self, path=DEFAULT_RESULTS_FILE):
+        """Initialize an append-only JSON Lines file of finished grid points.
+
+        Args:
+            path: Location of the file (default: DEFAULT_RESULTS_FILE)
+
+        Note:
+            Every line holds one grid point and its metrics, and is flushed to
+            disk as soon as the point finishes. A sweep that crashes loses at
+            most the points that were still running; a truncated last line
+            left by the crash is ignored when the file is read back.
+        """
+        self.path = path
+
+    def reset(self):
+        """Start a new, empty results file."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        open(self.path, 'w').close()
+
+    def append(self, point, metrics):
+        """Append a finished grid point.
+
+        Args:
+            point: Keyword-argument dict of run_simulation
+            metrics: Metrics dictionary returned by run_simulation
+        """
+        line = json.dumps({'point': canonical_params(point), 'metrics': encode_metrics(metrics)},
+                          default=_json_default)
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'ab+') as f:
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    # Terminate a line truncated by an interrupted run, so this
+                    # record is not glued onto it
+                    line = '\n' + line
+            f.write((line + '\n').encode())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def entries(self):
+        """Return the (point, metrics) pairs in the file, in the order written.
+
+        Missing files read as empty, lines that are not complete JSON records
+        are skipped, and a point recorded more than once keeps its last record.
+        """
+        if not os.path.exists(self.path):
+            return []
+        records = {}
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    point, metrics = record['point'], record['metrics']
+                except (ValueError, KeyError, TypeError):
+                    continue
+                records.pop(point_key(point), None)
+                records[point_key(point)] = (point, decode_metrics(metrics))
+        return list(records.values())
+
+    def load(self):
+        """Return a dictionary mapping point_key(point) to metrics."""
+        return {point_key(point): metrics for point, metrics in self.entries()}
@@ -0,0 +1,147 @@
+import mmap
+import struct
+import sys
+from collections import namedtuple
+from itertools import islice
+import numpy as np
+from models.process import MappedProcess, OPCODE_NAMES, BLOCK_SIZE, encode_instructions, block_prefix_costs
+
+# Binary trace layout (little endian):
+#   header | opcodes (one uint8 per instruction) | padding to 8 bytes | block cost index (int64)
+# The block cost index is block_prefix_costs(opcodes, block_size), so loading
+# a trace needs no pass over its instructions.
+TRACE_MAGIC = b'OSTRACE\0'
+TRACE_VERSION = 1
+TRACE_EXTENSION = '.trace'
+_HEADER = struct.Struct(f'<8sIIQQQ{len(OPCODE_NAMES)}Q')
+
+TraceHeader = namedtuple('TraceHeader', ['block_size', 'num_instructions', 'total_cost', 'index_offset',
+                                         'opcode_counts'])
+
+# Non-blank text lines encoded per batch by convert_text_trace (a multiple of BLOCK_SIZE)
+CONVERT_BATCH = BLOCK_SIZE * 64
+
+def _index_offset(num_instructions):
+    end = _HEADER.size + num_instructions
+    return end + (-end % 8)
+
+def _pack_header(block_size, num_instructions, total_cost, opcode_counts):
+    return _HEADER.pack(TRACE_MAGIC, TRACE_VERSION, block_size, num_instructions, total_cost,
+                        _index_offset(num_instructions), *opcode_counts)
+
+def write_trace(path, opcodes, block_size=BLOCK_SIZE):
+    """
+    Write an opcode array as a binary trace file.
+    
+    Args:
+        path: Output file path (conventionally ending in TRACE_EXTENSION)
+        opcodes: Sequence of opcodes (see models.process.OPCODES)
+        block_size: Instructions per block of the stored cost index
+    """
+    opcodes = np.asarray(opcodes)
+    if opcodes.size and (opcodes.min() < 0 or opcodes.max() >= len(OPCODE_NAMES)):
+        raise ValueError(f"Opcodes must be in the range 0..{len(OPCODE_NAMES) - 1}")
+    opcodes = opcodes.astype(np.uint8, copy=False)
+    block_costs = block_prefix_costs(opcodes, block_size)
+    counts = np.bincount(opcodes, minlength=len(OPCODE_NAMES))
+    with open(path, 'wb') as f:
+        f.write(_pack_header(block_size, len(opcodes), int(block_costs[-1]), counts.tolist()))
+        f.write(opcodes.tobytes())
+        f.write(b'\0' * (_index_offset(len(opcodes)) - f.tell()))
+        f.write(block_costs.astype('<i8').tobytes())
+
+def convert_text_trace(text_path, trace_path, block_size=BLOCK_SIZE):
+    """
+    Convert a text instruction file (one instruction per line, as in data/)
+    into a binary trace file, streaming it in batches so memory use does not
+    depend on the file size. Unrecognized instructions are stored as
+    UNKNOWN_OPCODE; their original text is not kept.
+    
+    Args:
+        text_path: Input text file path
+        trace_path: Output binary trace file path
+        block_size: Instructions per block of the stored cost index
+    
+    Returns:
+        The TraceHeader of the written trace
+    """
+    batch_size = max(CONVERT_BATCH // block_size, 1) * block_size
+    counts = np.zeros(len(OPCODE_NAMES), dtype=np.int64)
+    block_sums = [np.zeros(1, dtype=np.int64)]
+    num_instructions = 0
+    with open(text_path, 'r') as src, open(trace_path, 'wb') as dst:
+        dst.write(b'\0' * _HEADER.size)
+        lines = (line for line in src if line.strip())
+        while True:
+            batch = list(islice(lines, batch_size))
+            if not batch:
+                break
+            opcodes = encode_instructions(batch)
+            dst.write(opcodes.tobytes())
+            counts += np.bincount(opcodes, minlength=len(OPCODE_NAMES))
+            # Batches hold whole blocks, so the block sums line up
+            block_sums.append(np.diff(block_prefix_costs(opcodes, block_size)))
+            num_instructions += len(opcodes)
+        block_costs = np.cumsum(np.concatenate(block_sums))
+        dst.write(b'\0' * (_index_offset(num_instructions) - dst.tell()))
+        dst.write(block_costs.astype('<i8').tobytes())
+        dst.seek(0)
+        dst.write(_pack_header(block_size, num_instructions, int(block_costs[-1]), counts.tolist()))
+    return read_trace_header(trace_path)
+
+def _unpack_header(buffer):
+    if len(buffer) < _HEADER.size:
+        raise ValueError("Not a trace file: too short")
+    magic, version, block_size, num_instructions, total_cost, index_offset, *counts = \
+        _HEADER.unpack_from(buffer)
+    if magic != TRACE_MAGIC:
+        raise ValueError("Not a trace file: bad magic number")
+    if version != TRACE_VERSION:
+        raise ValueError(f"Unsupported trace version {version}; expected {TRACE_VERSION}")
+    return TraceHeader(block_size, num_instructions, total_cost, index_offset,
+                       dict(zip(OPCODE_NAMES, counts)))
+
+def read_trace_header(path):
+    """
+    Read the header of a binary trace file.
+    
+    Args:
+        path: Trace file path
+    
+    Returns:
+        A TraceHeader with the block size, instruction count, total cost,
+        index offset and per-instruction counts
+    """
+    with open(path, 'rb') as f:
+        return _unpack_header(f.read(_HEADER.size))
+
+def load_trace(path, process_id):
+    """
+    Load a binary trace file as a MappedProcess. The file is memory-mapped
+    read-only, and the opcodes and block cost index are zero-copy views of
+    the mapping, so processes loaded from the same file share pages.
+    
+    Args:
+        path: Trace file path
+        process_id: Unique ID for the process
+    
+    Returns:
+        A MappedProcess executing the trace
+    """
+    with open(path, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    header = _unpack_header(mapping)
+    num_blocks = -(-header.num_instructions // header.block_size)
+    if len(mapping) != header.index_offset + 8 * (num_blocks + 1):
+        raise ValueError("Trace file size does not match its header")
+    opcodes = np.frombuffer(mapping, dtype=np.uint8, count=header.num_instructions, offset=_HEADER.size)
+    block_costs = np.frombuffer(mapping, dtype='<i8', count=num_blocks + 1, offset=header.index_offset)
+    return MappedProcess(process_id, opcodes, block_costs=block_costs, block_size=header.block_size)
+
+if __name__ == "__main__":
+    # Convert text instruction files to binary traces next to them
+    for text_path in sys.argv[1:]:
+        trace_path = text_path.rsplit('.', 1)[0] + TRACE_EXTENSION
+        header = convert_text_trace(text_path, trace_path)
+        print(f"{text_path} -> {trace_path}: {header.num_instructions} instructions, "
+              f"total cost {header.total_cost} ns")